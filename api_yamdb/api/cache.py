@@ -0,0 +1,172 @@
+import hashlib
+import time
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F, Value
+from django.db.models.functions import Greatest
+from django.utils.cache import get_conditional_response, quote_etag
+from django.utils.http import http_date
+from rest_framework import status
+from rest_framework.response import Response
+
+from core.models import CatalogVersion
+
+CATALOG_VERSION_KEY = 'catalog:version'
+
+
+def read_catalog_version():
+    """Читает версию каталога из БД, заводя её при первом обращении."""
+    version = CatalogVersion.objects.filter(pk=1).values_list(
+        'version', flat=True
+    ).first()
+    if version is None:
+        version = CatalogVersion.objects.get_or_create(
+            pk=1, defaults={'version': time.time_ns()}
+        )[0].version
+    return version
+
+
+def get_catalog_version():
+    """
+    Возвращает текущую версию каталога произведений -
+    время последнего изменения в наносекундах. Версия из БД
+    кэшируется на CATALOG_VERSION_TIMEOUT секунд: на столько могут
+    опоздать изменения, сделанные другими процессами.
+    """
+    version = cache.get(CATALOG_VERSION_KEY)
+    if version is None:
+        version = read_catalog_version()
+        cache.add(
+            CATALOG_VERSION_KEY, version, settings.CATALOG_VERSION_TIMEOUT
+        )
+    return version
+
+
+def write_catalog_version():
+    """
+    Переводит версию каталога в БД на текущее время в наносекундах
+    одним UPDATE, не уменьшая её, и сбрасывает закэшированную.
+    """
+    now = time.time_ns()
+    if not CatalogVersion.objects.filter(pk=1).update(
+        version=Greatest(F('version') + 1, Value(now))
+    ):
+        CatalogVersion.objects.update_or_create(
+            pk=1, defaults={'version': now}
+        )
+    cache.delete(CATALOG_VERSION_KEY)
+
+
+def bump_catalog_version():
+    """
+    Делает недействительными все закэшированные ответы каталога
+    после фиксации текущей транзакции. Раньше фиксации нельзя:
+    параллельный запрос прочитал бы старые строки и закэшировал
+    их под новой версией. За транзакцию версия меняется один раз.
+    """
+    connection = transaction.get_connection()
+    if connection.in_atomic_block and any(
+        func is write_catalog_version
+        for _, func in connection.run_on_commit
+    ):
+        return
+    transaction.on_commit(write_catalog_version)
+
+
+def datetime_to_ns(value):
+    """Переводит datetime во время в наносекундах, как у версии каталога."""
+    return int(value.timestamp()) * 10 ** 9 + value.microsecond * 1000
+
+
+class CatalogCacheMixin:
+    """
+    Кэширует ответы list и retrieve по версии каталога.
+    Ключ строится из известных параметров фильтрации и пагинации,
+    прочие параметры запроса в ключ не попадают.
+    """
+
+    cache_timeout = settings.CATALOG_CACHE_TIMEOUT
+    cache_query_params = ('limit', 'offset', 'cursor', 'fields', 'omit')
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(
+            super().retrieve, request, *args, **kwargs
+        )
+
+    def get_cache_query_params(self):
+        return set(self.cache_query_params).union(
+            self.filterset_class.base_filters
+        )
+
+    def get_cache_key(self, request, **kwargs):
+        query = urlencode(sorted(
+            (param, value)
+            for param in self.get_cache_query_params()
+            for value in request.query_params.getlist(param)
+        ))
+        lookup = kwargs.get(self.lookup_url_kwarg or self.lookup_field, '')
+        raw_key = f'{request.get_host()}|{self.action}|{lookup}|{query}'
+        return 'catalog:{version}:{basename}:{digest}'.format(
+            version=get_catalog_version(),
+            basename=self.basename,
+            digest=hashlib.md5(raw_key.encode()).hexdigest()
+        )
+
+    def cached_response(self, handler, request, *args, **kwargs):
+        key = self.get_cache_key(request, **kwargs)
+        data = cache.get(key)
+        if data is not None:
+            return Response(data)
+        response = handler(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            cache.set(key, response.data, self.cache_timeout)
+        return response
+
+
+class ConditionalGetMixin:
+    """
+    Поддерживает ETag/If-None-Match и Last-Modified/If-Modified-Since
+    для list и retrieve. Штамп ресурса — время его последнего изменения,
+    которое get_resource_stamp() получает одним запросом по индексу,
+    поэтому ответ 304 отдаётся без сериализации.
+    """
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional_response(
+            super().list, request, *args, **kwargs
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional_response(
+            super().retrieve, request, *args, **kwargs
+        )
+
+    def get_resource_stamp(self):
+        """Возвращает время последнего изменения в наносекундах."""
+        raise NotImplementedError
+
+    def conditional_response(self, handler, request, *args, **kwargs):
+        stamp = self.get_resource_stamp()
+        raw_etag = '{stamp}|{path}|{format}'.format(
+            stamp=stamp,
+            path=request.get_full_path(),
+            format=request.accepted_renderer.format
+        )
+        etag = quote_etag(hashlib.md5(raw_etag.encode()).hexdigest())
+        last_modified = stamp // 10 ** 9
+        response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified
+        )
+        if response is not None:
+            return response
+        response = handler(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            response['ETag'] = etag
+            response['Last-Modified'] = http_date(last_modified)
+        return response
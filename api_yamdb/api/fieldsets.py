@@ -0,0 +1,105 @@
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework.permissions import SAFE_METHODS
+
+FIELDS_PARAM = 'fields'
+OMIT_PARAM = 'omit'
+
+
+def split_param(value):
+    return {name.strip() for name in value.split(',') if name.strip()}
+
+
+def get_sparse_fields(request, available):
+    """
+    Возвращает множество полей, запрошенных через ?fields= и ?omit=,
+    или None, если ответ нужен целиком. Неизвестные поля игнорируются.
+    """
+    if request is None or request.method not in SAFE_METHODS:
+        return None
+    fields = request.query_params.get(FIELDS_PARAM)
+    omit = request.query_params.get(OMIT_PARAM)
+    if fields is None and omit is None:
+        return None
+    requested = set(available)
+    if fields is not None:
+        requested &= split_param(fields)
+    if omit is not None:
+        requested -= split_param(omit)
+    return requested
+
+
+def flatten_select_related(selected, prefix=''):
+    for name, nested in selected.items():
+        if nested:
+            yield from flatten_select_related(nested, f'{prefix}{name}__')
+        else:
+            yield f'{prefix}{name}'
+
+
+def sparse_queryset(queryset, sources):
+    """
+    Оставляет в queryset только колонки и связи, нужные для
+    перечисленных источников полей сериализатора.
+    Если источник не является полем модели, queryset не меняется.
+    """
+    opts = queryset.model._meta
+    names = {source.split('.')[0] for source in sources}
+    columns = {opts.pk.name}
+    for name in names:
+        try:
+            field = opts.get_field(name)
+        except FieldDoesNotExist:
+            return queryset
+        if field in opts.concrete_fields:
+            columns.add(name)
+    selected = queryset.query.select_related
+    if isinstance(selected, dict):
+        lookups = [
+            lookup for lookup in flatten_select_related(selected)
+            if lookup.split('__')[0] in names
+        ]
+        queryset = queryset.select_related(None)
+        if lookups:
+            queryset = queryset.select_related(*lookups)
+    prefetched = queryset._prefetch_related_lookups
+    if prefetched:
+        queryset = queryset.prefetch_related(None).prefetch_related(*(
+            lookup for lookup in prefetched
+            if getattr(lookup, 'prefetch_through', lookup).split('__')[0]
+            in names
+        ))
+    return queryset.only(*columns)
+
+
+class SparseFieldsetSerializerMixin:
+    """
+    Отдаёт в ответе на чтение только поля из ?fields=
+    и без полей из ?omit=, например ?fields=id,name,rating.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        requested = get_sparse_fields(self.context.get('request'), self.fields)
+        if requested is None:
+            return
+        for name in set(self.fields) - requested:
+            self.fields.pop(name)
+
+
+class SparseFieldsetViewMixin:
+    """
+    Не загружает из БД колонки и связи, которые не попадут в ответ
+    при запросе с ?fields= или ?omit=.
+    """
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if not {FIELDS_PARAM, OMIT_PARAM} & set(self.request.query_params):
+            return queryset
+        fields = self.get_serializer_class()().fields
+        requested = get_sparse_fields(self.request, fields)
+        if requested is None:
+            return queryset
+        return sparse_queryset(
+            queryset, [fields[name].source for name in requested]
+        )
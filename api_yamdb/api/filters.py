@@ -1,10 +1,14 @@
 import django_filters
 
 from reviews.models import Title
+from reviews.search import search_titles
 
 
 class TitlesFilter(django_filters.FilterSet):
-    """Фильтрация произведений по жанру, категории, названию, году."""
+    """
+    Фильтрация произведений по жанру, категории, названию, году
+    и полнотекстовый поиск по названию и описанию.
+    """
 
     category = django_filters.CharFilter(
         field_name='category__slug'
@@ -12,6 +16,7 @@ class TitlesFilter(django_filters.FilterSet):
     genre = django_filters.CharFilter(
         field_name='genre__slug'
     )
+    search = django_filters.CharFilter(method='filter_search')
 
     class Meta:
         model = Title
@@ -19,5 +24,9 @@ class TitlesFilter(django_filters.FilterSet):
             'category',
             'genre',
             'name',
-            'year'
+            'year',
+            'search'
         )
+
+    def filter_search(self, queryset, name, value):
+        return search_titles(queryset, value)
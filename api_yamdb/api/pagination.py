@@ -0,0 +1,258 @@
+import base64
+import binascii
+import datetime
+import json
+from collections import OrderedDict
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import F, Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+
+class CursorEncoder(DjangoJSONEncoder):
+    """
+    Кодирует datetime с микросекундами: DjangoJSONEncoder обрезает
+    их до миллисекунд, и курсор попадал бы между строками
+    с одинаковыми миллисекундами.
+    """
+
+    def default(self, o):
+        if isinstance(o, datetime.datetime):
+            return o.isoformat()
+        return super().default(o)
+
+
+class KeysetPagination(BasePagination):
+    """
+    Пагинация по ключу сортировки (keyset).
+    Вместо OFFSET следующая страница выбирается условием WHERE
+    по значениям ключа последней строки, поэтому любая страница
+    стоит столько же, сколько первая, и COUNT(*) не выполняется.
+    Ключ ordering должен однозначно упорядочивать строки; поля,
+    которые могут быть NULL, перечисляются в nullable.
+    """
+
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'limit'
+    page_size = api_settings.PAGE_SIZE
+    max_page_size = 1000
+    ordering = ('id',)
+    nullable = ()
+    split_seek = False
+    invalid_cursor_message = 'Неверный курсор.'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        position, reverse = self.decode_cursor(request)
+        queryset = queryset.order_by(*(
+            self.invert(field) if reverse else field
+            for field in self.ordering
+        ))
+        if position is None:
+            results = list(queryset[:self.page_size + 1])
+        elif self.split_seek:
+            results = self.seek_by_levels(queryset, position, reverse)
+        else:
+            results = list(queryset.filter(
+                self.get_seek_filter(position, reverse)
+            )[:self.page_size + 1])
+        has_more = len(results) > self.page_size
+        self.page = results[:self.page_size]
+        if reverse:
+            self.page.reverse()
+            self.has_previous, self.has_next = has_more, True
+        else:
+            self.has_next, self.has_previous = has_more, position is not None
+        return self.page
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data)
+        ]))
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if page_size <= 0:
+            return self.page_size
+        return min(page_size, self.max_page_size)
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.get_position(self.page[-1]), False)
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        return self.encode_cursor(self.get_position(self.page[0]), True)
+
+    def get_position(self, instance):
+        if isinstance(instance, dict):
+            return [instance[field.lstrip('-')] for field in self.ordering]
+        return [
+            getattr(instance, field.lstrip('-')) for field in self.ordering
+        ]
+
+    def get_seek_filter(self, position, reverse):
+        """
+        Строит условие «строго после позиции» одним запросом:
+        a >= a0 AND (a > a0 OR (a = a0 AND b > b0) OR ...).
+        Избыточное a >= a0 даёт SQLite диапазон по первому полю индекса
+        ключа, а строки с тем же a просматриваются подряд. Годится,
+        когда у первого поля много разных значений (даты публикации).
+        """
+        name, lookup = self.get_seek_lookup(self.ordering[0], reverse)
+        condition = Q()
+        for seek in self.get_seek_levels(position, reverse):
+            condition |= seek
+        return Q(**{f'{name}__{lookup}e': position[0]}) & condition
+
+    def seek_by_levels(self, queryset, position, reverse):
+        """
+        Выбирает страницу несколькими запросами, по уровню ключа
+        на запрос, пока она не заполнится. Каждый уровень - равенство
+        по первым полям и диапазон по следующему, то есть непрерывный
+        отрезок индекса ключа, который читается с начала до LIMIT.
+        Нужно, когда у первых полей мало разных значений и одно
+        условие a >= a0 просматривало бы их целиком.
+        """
+        results = []
+        for seek in self.get_seek_levels(position, reverse):
+            results += queryset.filter(seek)[
+                :self.page_size + 1 - len(results)
+            ]
+            if len(results) > self.page_size:
+                break
+        return results
+
+    def get_seek_levels(self, position, reverse):
+        """
+        Условия «строго после позиции» по уровням составного ключа
+        в порядке выдачи: (a = a0 AND b = b0 AND c > c0),
+        (a = a0 AND b > b0), (a > a0).
+        """
+        prefix, levels = Q(), []
+        for field, value in zip(self.ordering, position):
+            name, lookup = self.get_seek_lookup(field, reverse)
+            levels.append([
+                prefix & seek
+                for seek in self.get_after(name, lookup, value)
+            ])
+            prefix &= (
+                Q(**{f'{name}__isnull': True}) if value is None
+                else Q(**{name: value})
+            )
+        return [seek for level in reversed(levels) for seek in level]
+
+    def get_after(self, name, lookup, value):
+        """
+        Условия «строго после value» по одному полю. SQLite считает
+        NULL меньше любого значения, поэтому по возрастанию NULL идут
+        первыми, а по убыванию - последними, отдельным условием.
+        """
+        if value is None:
+            if lookup == 'gt':
+                return [Q(**{f'{name}__isnull': False})]
+            return []
+        after = [Q(**{f'{name}__{lookup}': value})]
+        if lookup == 'lt' and name in self.nullable:
+            after.append(Q(**{f'{name}__isnull': True}))
+        return after
+
+    @staticmethod
+    def get_seek_lookup(field, reverse):
+        lookup = 'lt' if field.startswith('-') != reverse else 'gt'
+        return field.lstrip('-'), lookup
+
+    @staticmethod
+    def invert(field):
+        return field[1:] if field.startswith('-') else f'-{field}'
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, False
+        try:
+            cursor = json.loads(base64.urlsafe_b64decode(encoded.encode()))
+            position, reverse = cursor['p'], bool(cursor['r'])
+        except (TypeError, ValueError, KeyError, binascii.Error):
+            raise NotFound(self.invalid_cursor_message)
+        if not isinstance(position, list) or (
+            len(position) != len(self.ordering)
+        ):
+            raise NotFound(self.invalid_cursor_message)
+        return position, reverse
+
+    def encode_cursor(self, position, reverse):
+        cursor = json.dumps(
+            {'p': position, 'r': int(reverse)},
+            cls=CursorEncoder,
+            separators=(',', ':')
+        )
+        return replace_query_param(
+            self.request.build_absolute_uri(),
+            self.cursor_query_param,
+            base64.urlsafe_b64encode(cursor.encode()).decode()
+        )
+
+
+class TitleKeysetPagination(KeysetPagination):
+    """
+    Курсорная пагинация каталога произведений по ключу индекса
+    title_category_rating_idx: категория, рейтинг по убыванию, id.
+    Категорий и оценок мало, поэтому страница выбирается по уровням
+    ключа, и каждый запрос читает отрезок индекса без сортировки.
+    Произведения без категории идут первыми, без рейтинга -
+    последними в своей категории.
+    """
+
+    ordering = ('cursor_category', '-cursor_rating', 'id')
+    nullable = ('cursor_category', 'cursor_rating')
+    split_seek = True
+
+    def paginate_queryset(self, queryset, request, view=None):
+        return super().paginate_queryset(
+            queryset.annotate(
+                cursor_category=F('category_id'),
+                cursor_rating=F('rating')
+            ),
+            request,
+            view
+        )
+
+
+class PubDateKeysetPagination(KeysetPagination):
+    """
+    Курсорная пагинация отзывов и комментариев по дате публикации;
+    id упорядочивает записи с одинаковой датой.
+    """
+
+    ordering = ('pub_date', 'id')
+
+
+class CursorPaginationMixin:
+    """
+    С параметром ?cursor= включает курсорную пагинацию
+    cursor_pagination_class, иначе используется пагинация по умолчанию.
+    """
+
+    cursor_pagination_class = None
+
+    @property
+    def paginator(self):
+        cursor_param = self.cursor_pagination_class.cursor_query_param
+        if cursor_param not in self.request.query_params:
+            return super().paginator
+        if not hasattr(self, '_paginator'):
+            self._paginator = self.cursor_pagination_class()
+        return self._paginator
@@ -1,10 +1,15 @@
+from django.conf import settings
 from django.contrib.auth.tokens import default_token_generator
 from django.contrib.auth.validators import UnicodeUsernameValidator
-from django.db import IntegrityError
+from django.db import IntegrityError, connection, transaction
+from django.db.models import Q
 from django.forms import ValidationError
 from django.shortcuts import get_object_or_404
 from rest_framework import serializers
+from rest_framework.settings import api_settings
 
+from .cache import bump_catalog_version
+from .fieldsets import SparseFieldsetSerializerMixin
 from reviews.models import Category, Comment, Genre, Review, Title
 from users.constants import (
     MAX_LENGTH_EMAIL,
@@ -25,12 +30,39 @@ class SignUpSerializer(serializers.Serializer):
         max_length=MAX_LENGTH_EMAIL
     )
 
+    CONFLICT_MESSAGES = {
+        'username': 'Пользователь с таким username зарегистрирован '
+                    'с другим email.',
+        'email': 'Пользователь с таким email зарегистрирован '
+                 'с другим username.',
+    }
+
     def create(self, validated_data):
-        try:
-            user, _ = User.objects.get_or_create(**validated_data)
-            return user
-        except IntegrityError as e:
-            raise serializers.ValidationError({'detail': str(e)})
+        """
+        Идемпотентный upsert: INSERT ... ON CONFLICT DO NOTHING и одно
+        чтение. Одинаковые запросы, в том числе параллельные, получают
+        одного и того же пользователя; username или email, занятые
+        другим пользователем, дают ошибку валидации.
+        """
+        User.objects.bulk_create(
+            [User(**validated_data)], ignore_conflicts=True
+        )
+        users = User.objects.filter(
+            Q(username=validated_data['username'])
+            | Q(email=validated_data['email'])
+        )[:2]
+        errors = {}
+        for user in users:
+            matches = [
+                field for field in self.CONFLICT_MESSAGES
+                if getattr(user, field) == validated_data[field]
+            ]
+            if len(matches) == len(self.CONFLICT_MESSAGES):
+                return user
+            errors.update(
+                (field, [self.CONFLICT_MESSAGES[field]]) for field in matches
+            )
+        raise serializers.ValidationError(errors)
 
 
 class TokenSerializer(serializers.Serializer):
@@ -47,10 +79,13 @@ class TokenSerializer(serializers.Serializer):
         confirmation_code = data['confirmation_code']
         if not default_token_generator.check_token(user, confirmation_code):
             raise ValidationError('Неверный код подтверждения')
+        data['user'] = user
         return data
 
 
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(
+    SparseFieldsetSerializerMixin, serializers.ModelSerializer
+):
     """Сериализатор для модели класса User."""
 
     class Meta:
@@ -60,7 +95,9 @@ class UserSerializer(serializers.ModelSerializer):
         )
 
 
-class CategorySerializer(serializers.ModelSerializer):
+class CategorySerializer(
+    SparseFieldsetSerializerMixin, serializers.ModelSerializer
+):
     """Сериализатор для запросов по категориям."""
 
     class Meta:
@@ -71,7 +108,9 @@ class CategorySerializer(serializers.ModelSerializer):
         )
 
 
-class GenreSerializer(serializers.ModelSerializer):
+class GenreSerializer(
+    SparseFieldsetSerializerMixin, serializers.ModelSerializer
+):
     """Сериализатор для запросов по жанрам."""
 
     class Meta:
@@ -82,15 +121,21 @@ class GenreSerializer(serializers.ModelSerializer):
         )
 
 
-class TitleReadSerializer(serializers.ModelSerializer):
+class TitleReadSerializer(
+    SparseFieldsetSerializerMixin, serializers.ModelSerializer
+):
     """
     Сериализатор только для чтения данных.
     Возвращает JSON-данные всех полей модели Title
     для эндпоинта api/v1/titles/.
-    Добавляет новое поле rating.
+    Рейтинг и количество отзывов берутся из хранимых полей
+    rating и score_count модели Title.
     """
 
     rating = serializers.IntegerField(read_only=True)
+    reviews_count = serializers.IntegerField(
+        source='score_count', read_only=True
+    )
     category = CategorySerializer(read_only=True)
     genre = GenreSerializer(read_only=True, many=True)
 
@@ -102,11 +147,81 @@ class TitleReadSerializer(serializers.ModelSerializer):
             'description',
             'genre',
             'category',
-            'rating'
+            'rating',
+            'reviews_count'
         )
         model = Title
 
 
+class TitleRowsSerializer:
+    """
+    Быстрый сериализатор произведений только для чтения.
+    Строит ответ из строк values() и одного запроса жанров
+    для всей страницы, минуя поля DRF и экземпляры моделей.
+    Результат совпадает с TitleReadSerializer.
+    """
+
+    columns = {
+        'id': ('id',),
+        'name': ('name',),
+        'year': ('year',),
+        'description': ('description',),
+        'genre': ('id',),
+        'category': ('category_id', 'category__name', 'category__slug'),
+        'rating': ('rating',),
+        'reviews_count': ('score_count',),
+    }
+
+    def __init__(self, fields=None):
+        self.fields = [
+            name for name in TitleReadSerializer.Meta.fields
+            if fields is None or name in fields
+        ]
+
+    def get_queryset(self, queryset):
+        """Превращает queryset произведений в queryset строк-словарей."""
+        return queryset.select_related(None).prefetch_related(None).values(
+            *{
+                column for name in self.fields
+                for column in self.columns[name]
+            }
+        )
+
+    def get_genres(self, rows):
+        if 'genre' not in self.fields:
+            return {}
+        genres = {row['id']: [] for row in rows}
+        for title_id, name, slug in Title.genre.through.objects.filter(
+            title_id__in=genres
+        ).order_by('genre__name', 'genre_id').values_list(
+            'title_id', 'genre__name', 'genre__slug'
+        ):
+            genres[title_id].append({'name': name, 'slug': slug})
+        return genres
+
+    @staticmethod
+    def get_category(row):
+        if row['category_id'] is None:
+            return None
+        return {'name': row['category__name'], 'slug': row['category__slug']}
+
+    def to_representation(self, rows):
+        rows = list(rows)
+        genres = self.get_genres(rows)
+        data = []
+        for row in rows:
+            item = {}
+            for name in self.fields:
+                if name == 'genre':
+                    item[name] = genres[row['id']]
+                elif name == 'category':
+                    item[name] = self.get_category(row)
+                else:
+                    item[name] = row[self.columns[name][0]]
+            data.append(item)
+        return data
+
+
 class TitleWriteSerializer(serializers.ModelSerializer):
     """
     Сериализатор только для записи данных.
@@ -136,12 +251,126 @@ class TitleWriteSerializer(serializers.ModelSerializer):
         model = Title
 
 
-class ReviewSerializer(serializers.ModelSerializer):
+def collect_slugs(items, field):
+    """Строковые слаги поля field из всех элементов списка."""
+    slugs = set()
+    for item in items:
+        value = item.get(field) if isinstance(item, dict) else None
+        values = value if isinstance(value, list) else [value]
+        slugs.update(slug for slug in values if isinstance(slug, str))
+    return slugs
+
+
+class TitleBulkListSerializer(serializers.ListSerializer):
+    """
+    Создаёт список произведений для эндпоинта api/v1/titles/bulk/.
+    Слаги категорий и жанров всех элементов разрешаются двумя
+    запросами, произведения и их связи с жанрами вставляются через
+    bulk_create в одной транзакции.
+    """
+
+    default_error_messages = {
+        'max_length': 'Не больше {limit} произведений за один запрос.'
+    }
+
+    def to_internal_value(self, data):
+        if isinstance(data, list):
+            limit = settings.TITLES_BULK_CREATE_LIMIT
+            if len(data) > limit:
+                raise serializers.ValidationError({
+                    'non_field_errors': [
+                        self.error_messages['max_length'].format(
+                            limit=limit
+                        )
+                    ]
+                })
+            self.child.categories = Category.objects.in_bulk(
+                collect_slugs(data, 'category'), field_name='slug'
+            )
+            self.child.genres = Genre.objects.in_bulk(
+                collect_slugs(data, 'genre'), field_name='slug'
+            )
+        return super().to_internal_value(data)
+
+    def create(self, validated_data):
+        with transaction.atomic():
+            titles = Title.objects.bulk_create(
+                Title(**{
+                    field: value for field, value in item.items()
+                    if field != 'genre'
+                })
+                for item in validated_data
+            )
+            if not connection.features.can_return_rows_from_bulk_insert:
+                # SQLite не возвращает id из bulk_create. Первичный ключ
+                # с AUTOINCREMENT только растёт, а до конца транзакции
+                # писать в базу никто другой не может, поэтому последние
+                # len(titles) id принадлежат этим произведениям.
+                pks = Title.objects.order_by('-pk').values_list(
+                    'pk', flat=True
+                )[:len(titles)]
+                for title, pk in zip(titles, reversed(pks)):
+                    title.pk = pk
+            Title.genre.through.objects.bulk_create(
+                Title.genre.through(title_id=title.pk, genre_id=genre.pk)
+                for title, item in zip(titles, validated_data)
+                for genre in item['genre']
+            )
+        bump_catalog_version()
+        return titles
+
+
+class TitleBulkWriteSerializer(TitleWriteSerializer):
+    """
+    Элемент списка для эндпоинта api/v1/titles/bulk/. Слаги ищутся
+    в словарях, заранее собранных TitleBulkListSerializer.
+    """
+
+    category = serializers.SlugField()
+    genre = serializers.ListField(child=serializers.SlugField())
+
+    categories = {}
+    genres = {}
+
+    class Meta(TitleWriteSerializer.Meta):
+        list_serializer_class = TitleBulkListSerializer
+
+    @staticmethod
+    def missing_slug(slug):
+        return serializers.SlugRelatedField.default_error_messages[
+            'does_not_exist'
+        ].format(slug_name='slug', value=slug)
+
+    def validate(self, attrs):
+        errors = {}
+        category = self.categories.get(attrs['category'])
+        if category is None:
+            errors['category'] = [self.missing_slug(attrs['category'])]
+        missing = [slug for slug in attrs['genre'] if slug not in self.genres]
+        if missing:
+            errors['genre'] = [self.missing_slug(slug) for slug in missing]
+        if errors:
+            raise serializers.ValidationError(errors)
+        return {
+            **attrs,
+            'category': category,
+            'genre': [
+                self.genres[slug] for slug in dict.fromkeys(attrs['genre'])
+            ]
+        }
+
+
+class ReviewSerializer(
+    SparseFieldsetSerializerMixin, serializers.ModelSerializer
+):
     """
     Возвращает JSON-данные всех полей модели Reviews
     для эндпоинта api/v1/titles/{title_id}/reviews/.
     """
 
+    DUPLICATE_MESSAGE = 'Вы уже оставили отзыв на данное произведение.'
+    DUPLICATE_CONSTRAINT = 'author_title_connection'
+
     author = serializers.SlugRelatedField(
         read_only=True,
         slug_field='username'
@@ -153,28 +382,48 @@ class ReviewSerializer(serializers.ModelSerializer):
             'text',
             'author',
             'score',
-            'pub_date'
+            'pub_date',
+            'comments_count'
         )
         model = Review
 
-    def validate(self, data):
-        """Проверка невозможности дважды оставить отзыв на произведение."""
-
-        if self.context['request'].method != 'POST':
-            return data
-        title_id = self.context['request'].parser_context['kwargs']['title_id']
-        author = self.context['request'].user
-        if Review.objects.filter(
-            author=author,
-            title_id=title_id
-        ).exists():
-            raise serializers.ValidationError(
-                'Вы уже оставили отзыв на данное произведение.'
-            )
-        return data
+    def create(self, validated_data):
+        """
+        Повторный отзыв на произведение отсекает ограничение
+        author_title_connection: ошибку вставки превращаем
+        в ошибку валидации без отдельного запроса на проверку.
+        Остальные ошибки целостности пробрасываются дальше.
+        """
+        try:
+            return super().create(validated_data)
+        except IntegrityError as error:
+            if not self.is_duplicate(error):
+                raise
+            raise serializers.ValidationError({
+                api_settings.NON_FIELD_ERRORS_KEY: [self.DUPLICATE_MESSAGE]
+            })
+
+    def is_duplicate(self, error):
+        """
+        Проверяет, что ошибка вызвана ограничением DUPLICATE_CONSTRAINT.
+        PostgreSQL называет в ней ограничение, SQLite - его колонки.
+        """
+        constraint = next(
+            constraint for constraint in Review._meta.constraints
+            if constraint.name == self.DUPLICATE_CONSTRAINT
+        )
+        table = Review._meta.db_table
+        columns = ', '.join(
+            f'{table}.{Review._meta.get_field(name).column}'
+            for name in constraint.fields
+        )
+        message = str(error)
+        return constraint.name in message or columns in message
 
 
-class CommentSerializer(serializers.ModelSerializer):
+class CommentSerializer(
+    SparseFieldsetSerializerMixin, serializers.ModelSerializer
+):
     """
     Возаращает JSON-данные всех полей модели Comment
     для эндпоинта api/v1/titles/{title_id}/reviews/{review_id}/comments.
@@ -0,0 +1,36 @@
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_migrate,
+    post_save
+)
+from django.db import connections
+from django.dispatch import receiver
+
+from .cache import bump_catalog_version
+from core.models import CatalogVersion
+from reviews.models import Category, Genre, Review, Title
+
+
+@receiver((post_save, post_delete), sender=Title)
+@receiver((post_save, post_delete), sender=Genre)
+@receiver((post_save, post_delete), sender=Category)
+@receiver((post_save, post_delete), sender=Review)
+@receiver(m2m_changed, sender=Title.genre.through)
+def catalog_changed(**kwargs):
+    """
+    Сбрасывает кэш каталога при любой записи в связанные таблицы.
+    Версия меняется после фиксации транзакции записи.
+    """
+    bump_catalog_version()
+
+
+@receiver(post_migrate)
+def catalog_migrated(using, **kwargs):
+    """
+    Сбрасывает кэш каталога после migrate и flush,
+    если таблица версии каталога уже создана.
+    """
+    table_names = connections[using].introspection.table_names()
+    if CatalogVersion._meta.db_table in table_names:
+        bump_catalog_version()
@@ -0,0 +1,149 @@
+import hashlib
+import os
+import threading
+from contextlib import contextmanager
+
+from django.core.cache import DEFAULT_CACHE_ALIAS, caches
+from django.core.cache.backends.filebased import FileBasedCache
+from rest_framework.throttling import SimpleRateThrottle
+
+
+class TokenBucketThrottle(SimpleRateThrottle):
+    """
+    Ограничение частоты запросов по алгоритму token bucket.
+    Ставка '<n>/<период>' из DEFAULT_THROTTLE_RATES[scope] задаёт
+    ёмкость корзины n и пополнение n жетонов за период, поэтому
+    разрешён всплеск до n запросов, а дальше не чаще n за период.
+
+    Корзина хранится в кэше как (жетоны, время). Запрос проверяет
+    корзины всех ключей get_cache_keys() и тратит по жетону из каждой,
+    только если они все не пусты. Чтение и запись идут под блокировкой
+    процесса: этого достаточно для локального кэша (locmem), который
+    у каждого процесса свой. Файловый кэш общий для процессов, поэтому
+    с ним берётся ещё и flock на файл LOCK_FILE в каталоге кэша, если
+    платформа поддерживает fcntl; без него (Windows) остаётся только
+    блокировка процесса.
+    """
+
+    LOCK_FILE = 'throttle.lock'
+
+    cache_alias = DEFAULT_CACHE_ALIAS
+    lock = threading.Lock()
+
+    @property
+    def cache(self):
+        return caches[self.cache_alias]
+
+    @contextmanager
+    def bucket_lock(self):
+        """Блокировка корзин от других потоков и процессов."""
+        with self.lock:
+            cache = self.cache
+            if not isinstance(cache, FileBasedCache):
+                yield
+                return
+            try:
+                import fcntl
+            except ImportError:
+                yield
+                return
+            os.makedirs(cache._dir, exist_ok=True)
+            path = os.path.join(cache._dir, self.LOCK_FILE)
+            with open(path, 'a') as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def get_cache_keys(self, request, view):
+        raise NotImplementedError
+
+    def get_cache_key(self, request, view):
+        keys = self.get_cache_keys(request, view)
+        return keys[0] if keys else None
+
+    def make_key(self, ident):
+        return self.cache_format % {
+            'scope': self.scope,
+            'ident': hashlib.md5(str(ident).encode()).hexdigest()
+        }
+
+    def refill(self, bucket):
+        if bucket is None:
+            return self.num_requests
+        tokens, stamp = bucket
+        return min(
+            self.num_requests,
+            tokens + (self.now - stamp) * self.num_requests / self.duration
+        )
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+        keys = self.get_cache_keys(request, view)
+        if not keys:
+            return True
+        self.now = self.timer()
+        with self.bucket_lock():
+            buckets = self.cache.get_many(keys)
+            tokens = {key: self.refill(buckets.get(key)) for key in keys}
+            lowest = min(tokens.values())
+            if lowest < 1:
+                self.wait_time = (
+                    (1 - lowest) * self.duration / self.num_requests
+                )
+                return False
+            self.cache.set_many(
+                {key: (value - 1, self.now) for key, value in tokens.items()},
+                self.duration
+            )
+        return True
+
+    def wait(self):
+        return self.wait_time
+
+
+class IPTokenBucketThrottle(TokenBucketThrottle):
+    """Корзина на IP-адрес клиента."""
+
+    def get_cache_keys(self, request, view):
+        return [self.make_key(self.get_ident(request))]
+
+
+class IdentityTokenBucketThrottle(TokenBucketThrottle):
+    """
+    Корзины на каждое из полей identity_fields запроса, без учёта
+    регистра: перебор адресов при одном username и наоборот
+    упирается в общий лимит.
+    """
+
+    identity_fields = ('username', 'email')
+
+    def get_cache_keys(self, request, view):
+        if not hasattr(request.data, 'get'):
+            return []
+        values = {
+            field: str(request.data.get(field) or '').strip().lower()
+            for field in self.identity_fields
+        }
+        return [
+            self.make_key(f'{field}:{value}')
+            for field, value in values.items() if value
+        ]
+
+
+class SignUpIPThrottle(IPTokenBucketThrottle):
+    scope = 'signup_ip'
+
+
+class SignUpIdentityThrottle(IdentityTokenBucketThrottle):
+    scope = 'signup_identity'
+
+
+class TokenIPThrottle(IPTokenBucketThrottle):
+    scope = 'token_ip'
+
+
+class TokenIdentityThrottle(IdentityTokenBucketThrottle):
+    scope = 'token_identity'
@@ -33,4 +33,9 @@ auth_urls = [
 urlpatterns = [
     path(f'{API_VERSION}/', include(router.urls)),
     path(f'{API_VERSION}/auth/', include(auth_urls)),
+    path(
+        f'{API_VERSION}/export/<slug:name>/',
+        views.export_csv,
+        name='export_csv'
+    ),
 ]
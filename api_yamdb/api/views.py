@@ -1,11 +1,16 @@
 from django.conf import settings
 from django.contrib.auth.tokens import default_token_generator
-from django.core.mail import send_mail
-from django.db.models import Avg
+from django.db.models import Prefetch
+from django.http import Http404, StreamingHttpResponse
 from django_filters.rest_framework import DjangoFilterBackend
 from django.shortcuts import get_object_or_404
 from rest_framework import filters, mixins, status, viewsets
-from rest_framework.decorators import action, api_view
+from rest_framework.decorators import (
+    action,
+    api_view,
+    permission_classes,
+    throttle_classes
+)
 from rest_framework.filters import SearchFilter
 from rest_framework.pagination import PageNumberPagination
 from rest_framework.permissions import (
@@ -15,12 +20,27 @@ from rest_framework.permissions import (
 from rest_framework.response import Response
 from rest_framework_simplejwt.tokens import AccessToken
 
+from .cache import (
+    CatalogCacheMixin,
+    ConditionalGetMixin,
+    datetime_to_ns,
+    get_catalog_version
+)
+from core.export import EXPORT_FILES, stream_csv
+from core.outbox import queue_mail
+from .fieldsets import SparseFieldsetViewMixin, get_sparse_fields
 from .filters import TitlesFilter
+from .pagination import (
+    CursorPaginationMixin,
+    PubDateKeysetPagination,
+    TitleKeysetPagination
+)
 from .permissions import (
     IsAdmin,
     IsAdminOrReadOnly,
     IsAuthorOrModeratorOrAdmin
 )
+from reviews.constants import MAX_SCORE, MIN_SCORE
 from reviews.models import Category, Genre, Review, Title
 from .serializers import (
     CategorySerializer,
@@ -28,25 +48,35 @@ from .serializers import (
     GenreSerializer,
     ReviewSerializer,
     SignUpSerializer,
+    TitleBulkWriteSerializer,
     TitleReadSerializer,
+    TitleRowsSerializer,
     TitleWriteSerializer,
     TokenSerializer,
     UserSerializer
 )
+from .throttling import (
+    SignUpIdentityThrottle,
+    SignUpIPThrottle,
+    TokenIdentityThrottle,
+    TokenIPThrottle
+)
 from users.models import User
 
 
 @api_view(['POST'])
+@throttle_classes((SignUpIPThrottle, SignUpIdentityThrottle))
 def signup(request):
     """
     Позволяет получить код подтверждения на переданный email.
+    Письмо ставится в очередь и отправляется вне запроса.
     Обрабатывает запрос для эндпоинта api/v1/auth/signup.
     """
     serializer = SignUpSerializer(data=request.data)
     serializer.is_valid(raise_exception=True)
     user = serializer.save()
     confirmation_code = default_token_generator.make_token(user)
-    send_mail(
+    queue_mail(
         'Confirmation code',
         f'Code: {confirmation_code}',
         settings.EMAIL_HOST,
@@ -58,6 +88,7 @@ def signup(request):
 
 
 @api_view(['POST'])
+@throttle_classes((TokenIPThrottle, TokenIdentityThrottle))
 def get_token(request):
     """
     Позволяет получть JWT-токен в обмен на username и confirmation code.
@@ -65,15 +96,29 @@ def get_token(request):
     """
     serializer = TokenSerializer(data=request.data)
     serializer.is_valid(raise_exception=True)
-    user = get_object_or_404(
-        User,
-        username=serializer.validated_data['username']
-    )
+    user = serializer.validated_data['user']
     token = {'token': str(AccessToken.for_user(user))}
     return Response(token, status=status.HTTP_200_OK)
 
 
-class UserViewSet(viewsets.ModelViewSet):
+@api_view(['GET'])
+@permission_classes((IsAdmin,))
+def export_csv(request, name):
+    """
+    Отдаёт таблицу в формате csv-файлов csv_upload потоком, читая БД
+    пачками. Обрабатывает запрос для эндпоинта api/v1/export/{name}.
+    """
+    file = f'{name}.csv'
+    if file not in EXPORT_FILES:
+        raise Http404
+    response = StreamingHttpResponse(
+        stream_csv(file), content_type='text/csv; charset=utf-8'
+    )
+    response['Content-Disposition'] = f'attachment; filename="{file}"'
+    return response
+
+
+class UserViewSet(SparseFieldsetViewMixin, viewsets.ModelViewSet):
     """
     Обрабатывает все запросы для эндпоинта api/v1/users/.
     """
@@ -97,21 +142,25 @@ class UserViewSet(viewsets.ModelViewSet):
         """
         Позволяет получить и изменить данные своей учетной записи.
         Обрабатывает все запросы для эндпоинта api/v1/me/.
+        Аутентификация отдаёт снимок пользователя из кэша,
+        поэтому профиль целиком читается из БД одним запросом.
         """
-        serializer = UserSerializer(request.user)
+        user = User.objects.get(pk=request.user.pk)
+        serializer = UserSerializer(user)
         if request.method == 'PATCH':
             serializer = UserSerializer(
-                request.user,
+                user,
                 data=request.data,
                 partial=True
             )
             serializer.is_valid(raise_exception=True)
-            serializer.save(role=request.user.role)
+            serializer.save(role=user.role)
 
         return Response(serializer.data, status=status.HTTP_200_OK)
 
 
 class BaseCategoryGenreViewSet(
+    SparseFieldsetViewMixin,
     mixins.ListModelMixin,
     mixins.CreateModelMixin,
     mixins.DestroyModelMixin,
@@ -147,26 +196,120 @@ class GenreViewSet(BaseCategoryGenreViewSet):
     serializer_class = GenreSerializer
 
 
-class TitlesViewSet(viewsets.ModelViewSet):
+class TitleRowsReadMixin:
+    """
+    При включённой настройке TITLES_FAST_READ отдаёт list и retrieve
+    через TitleRowsSerializer вместо TitleReadSerializer.
+    """
+
+    def get_rows_serializer(self):
+        return TitleRowsSerializer(
+            get_sparse_fields(self.request, TitleReadSerializer.Meta.fields)
+        )
+
+    def list(self, request, *args, **kwargs):
+        if not settings.TITLES_FAST_READ:
+            return super().list(request, *args, **kwargs)
+        serializer = self.get_rows_serializer()
+        queryset = serializer.get_queryset(
+            self.filter_queryset(self.get_queryset())
+        )
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(
+                serializer.to_representation(page)
+            )
+        return Response(serializer.to_representation(queryset))
+
+    def retrieve(self, request, *args, **kwargs):
+        if not settings.TITLES_FAST_READ:
+            return super().retrieve(request, *args, **kwargs)
+        serializer = self.get_rows_serializer()
+        row = get_object_or_404(
+            serializer.get_queryset(self.filter_queryset(self.get_queryset())),
+            pk=self.kwargs[self.lookup_url_kwarg or self.lookup_field]
+        )
+        return Response(serializer.to_representation([row])[0])
+
+
+class TitlesViewSet(
+    CursorPaginationMixin,
+    ConditionalGetMixin,
+    CatalogCacheMixin,
+    TitleRowsReadMixin,
+    SparseFieldsetViewMixin,
+    viewsets.ModelViewSet
+):
     """Выполняет все операции с произведениями.
     Обрабатывает все запросы для эндпоинта api/v1/titles/.
     """
 
     permission_classes = (IsAdminOrReadOnly,)
-    queryset = Title.objects.annotate(
-        rating=Avg('reviews__score')
-    ).select_related('category').order_by('category__name', '-rating')
+    queryset = Title.objects.select_related('category').prefetch_related(
+        Prefetch('genre', queryset=Genre.objects.order_by('name', 'id'))
+    ).order_by('category__name', '-rating', 'id')
     filter_backends = (DjangoFilterBackend,)
     filterset_class = TitlesFilter
     http_method_names = ('get', 'post', 'patch', 'delete')
+    cursor_pagination_class = TitleKeysetPagination
+
+    def get_resource_stamp(self):
+        """
+        Версия каталога из БД: её копия в кэше живёт не дольше
+        CATALOG_VERSION_TIMEOUT, поэтому ETag, выданный до изменения
+        в другом процессе, перестаёт совпадать не позже этого срока.
+        """
+        return get_catalog_version()
 
     def get_serializer_class(self):
         if self.action in {'create', 'partial_update'}:
             return TitleWriteSerializer
         return TitleReadSerializer
 
+    @action(detail=True, url_path='score-distribution')
+    def score_distribution(self, request, pk=None):
+        """
+        Возвращает количество отзывов с каждой оценкой произведения
+        из таблицы счётчиков, не перебирая сами отзывы. Обрабатывает
+        запрос для эндпоинта api/v1/titles/{title_id}/score-distribution/.
+        """
+        title = get_object_or_404(Title.objects.only('pk'), pk=pk)
+        counts = dict(title.score_counts.values_list('score', 'count'))
+        return Response([
+            {'score': score, 'count': counts.get(score, 0)}
+            for score in range(MIN_SCORE, MAX_SCORE + 1)
+        ])
+
+    @action(detail=False, methods=['post'])
+    def bulk(self, request):
+        """
+        Создаёт список произведений одной транзакцией и возвращает их
+        в формате чтения. Ошибки валидации возвращаются списком,
+        по одному словарю на каждый элемент запроса.
+        Обрабатывает запрос для эндпоинта api/v1/titles/bulk/.
+        """
+        serializer = TitleBulkWriteSerializer(
+            data=request.data,
+            many=True,
+            context=self.get_serializer_context()
+        )
+        serializer.is_valid(raise_exception=True)
+        titles = serializer.save()
+        queryset = self.get_queryset().filter(
+            pk__in=[title.pk for title in titles]
+        ).order_by('id')
+        return Response(
+            self.get_serializer(queryset, many=True).data,
+            status=status.HTTP_201_CREATED
+        )
+
 
-class ReviewViewSet(viewsets.ModelViewSet):
+class ReviewViewSet(
+    CursorPaginationMixin,
+    ConditionalGetMixin,
+    SparseFieldsetViewMixin,
+    viewsets.ModelViewSet
+):
     """
     Выполняет все операции с отзывами.
     Обрабатывает запросы 'get', 'post', 'patch', 'delete'
@@ -179,19 +322,31 @@ class ReviewViewSet(viewsets.ModelViewSet):
     )
     serializer_class = ReviewSerializer
     http_method_names = ('get', 'post', 'patch', 'delete',)
+    cursor_pagination_class = PubDateKeysetPagination
 
     def get_title(self):
-        return get_object_or_404(Title, pk=self.kwargs['title_id'])
+        """Произведение из URL; загружается один раз за запрос."""
+        if not hasattr(self, '_title'):
+            self._title = get_object_or_404(Title, pk=self.kwargs['title_id'])
+        return self._title
+
+    def get_resource_stamp(self):
+        return datetime_to_ns(self.get_title().reviews_changed)
 
     def get_queryset(self):
         return self.get_title().reviews.select_related(
-            'author').order_by('pub_date')
+            'author').order_by('pub_date', 'id')
 
     def perform_create(self, serializer):
         serializer.save(author=self.request.user, title=self.get_title())
 
 
-class CommentViewSet(viewsets.ModelViewSet):
+class CommentViewSet(
+    CursorPaginationMixin,
+    ConditionalGetMixin,
+    SparseFieldsetViewMixin,
+    viewsets.ModelViewSet
+):
     """Выполняет все операции с комментариями.
     Обрабатывает запросы 'get', 'post', 'patch', 'delete' для
     эндпоинта api/v1/titles/{title_id}/reviews/{review_id}/comments.
@@ -202,14 +357,24 @@ class CommentViewSet(viewsets.ModelViewSet):
     )
     serializer_class = CommentSerializer
     http_method_names = ('get', 'post', 'patch', 'delete',)
+    cursor_pagination_class = PubDateKeysetPagination
 
     def get_review(self):
-        title_id = self.kwargs['title_id']
-        review_id = self.kwargs['review_id']
-        return get_object_or_404(Review, pk=review_id, title_id=title_id)
+        """Отзыв из URL; загружается один раз за запрос."""
+        if not hasattr(self, '_review'):
+            self._review = get_object_or_404(
+                Review,
+                pk=self.kwargs['review_id'],
+                title_id=self.kwargs['title_id']
+            )
+        return self._review
+
+    def get_resource_stamp(self):
+        return datetime_to_ns(self.get_review().comments_changed)
 
     def get_queryset(self):
-        return self.get_review().comments.order_by('pub_date')
+        return self.get_review().comments.select_related(
+            'author').order_by('pub_date', 'id')
 
     def perform_create(self, serializer):
         serializer.save(
@@ -73,10 +73,51 @@ WSGI_APPLICATION = 'api_yamdb.wsgi.application'
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+        'NAME': os.getenv('SQLITE_PATH', BASE_DIR / 'db.sqlite3'),
     }
 }
 
+# Продакшен-профиль SQLite (SQLITE_PROFILE=production): WAL, PRAGMA при
+# подключении и постоянные соединения с проверкой перед запросом.
+SQLITE_PRODUCTION_PROFILE = {
+    'ENGINE': 'core.db',
+    'CONN_MAX_AGE': 60 * 10,
+    'CONN_HEALTH_CHECKS': True,
+    'OPTIONS': {
+        'pragmas': {
+            'journal_mode': 'WAL',
+            'synchronous': 'NORMAL',
+            'mmap_size': 256 * 1024 * 1024,
+            'cache_size': -64 * 1024,
+            'busy_timeout': 20 * 1000,
+        },
+    },
+}
+
+if os.getenv('SQLITE_PROFILE') == 'production':
+    DATABASES['default'].update(SQLITE_PRODUCTION_PROFILE)
+
+
+# Cache
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+
+CATALOG_CACHE_TIMEOUT = 60 * 5
+
+# Сколько секунд процесс может не замечать изменения каталога,
+# сделанные другими процессами.
+CATALOG_VERSION_TIMEOUT = 5
+
+TITLES_FAST_READ = False
+
+TITLES_BULK_CREATE_LIMIT = 1000
+
+USER_CACHE_TIMEOUT = 60
+
 
 # Password validation
 
@@ -122,10 +163,17 @@ REST_FRAMEWORK = {
         'rest_framework.permissions.AllowAny',
     ],
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'users.authentication.CachedJWTAuthentication',
     ],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.LimitOffsetPagination',
     'PAGE_SIZE': 10,
+    # Token bucket: '<ёмкость>/<период пополнения>' для каждого эндпоинта.
+    'DEFAULT_THROTTLE_RATES': {
+        'signup_ip': '20/hour',
+        'signup_identity': '5/hour',
+        'token_ip': '60/hour',
+        'token_identity': '10/hour',
+    },
 }
 
 SIMPLE_JWT = {
@@ -136,3 +184,13 @@ SIMPLE_JWT = {
 EMAIL_HOST = 'admin@yamdb.ru'
 EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
 EMAIL_FILE_PATH = os.path.join(BASE_DIR, 'sent_emails')
+
+# Очередь писем: 'thread', 'command' (manage.py send_outbox --loop)
+# или 'inline'.
+EMAIL_OUTBOX_DELIVERY = os.getenv('EMAIL_OUTBOX_DELIVERY', 'thread')
+EMAIL_OUTBOX_BATCH_SIZE = 100
+EMAIL_OUTBOX_MAX_ATTEMPTS = 5
+EMAIL_OUTBOX_RETRY_DELAY = 60
+EMAIL_OUTBOX_LEASE = 60 * 5
+EMAIL_OUTBOX_POLL_INTERVAL = 30
+EMAIL_OUTBOX_KEEP_DONE = 60 * 60 * 24
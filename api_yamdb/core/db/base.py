@@ -0,0 +1,60 @@
+"""
+Бэкенд SQLite для продакшен-профиля (SQLITE_PROFILE=production).
+
+При каждом подключении выполняются PRAGMA из OPTIONS['pragmas']:
+WAL не даёт писателю блокировать читателей, а synchronous, mmap_size,
+cache_size и busy_timeout настраиваются для постоянных соединений
+с CONN_MAX_AGE. CONN_HEALTH_CHECKS переносит поведение Django 4.1:
+переиспользуемое соединение проверяется перед первым запросом
+к БД в каждом HTTP-запросе и при необходимости открывается заново.
+"""
+from django.db.backends.sqlite3 import base
+from django.db.backends.sqlite3.base import Database
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+
+    health_check_done = False
+    pragmas = {}
+
+    def get_connection_params(self):
+        params = super().get_connection_params()
+        self.pragmas = params.pop('pragmas', {})
+        return params
+
+    def get_new_connection(self, conn_params):
+        connection = super().get_new_connection(conn_params)
+        for name, value in self.pragmas.items():
+            connection.execute(f'PRAGMA {name} = {value}')
+        return connection
+
+    def connect(self):
+        super().connect()
+        self.health_check_done = True
+
+    def is_usable(self):
+        try:
+            self.connection.execute('SELECT 1')
+        except Database.Error:
+            return False
+        return True
+
+    def close_if_unusable_or_obsolete(self):
+        super().close_if_unusable_or_obsolete()
+        self.health_check_done = False
+
+    def close_if_health_check_failed(self):
+        if (
+            self.connection is None
+            or self.health_check_done
+            or self.in_atomic_block
+            or not self.settings_dict.get('CONN_HEALTH_CHECKS')
+        ):
+            return
+        if not self.is_usable():
+            self.close()
+        self.health_check_done = True
+
+    def _cursor(self, name=None):
+        self.close_if_health_check_failed()
+        return super()._cursor(name)
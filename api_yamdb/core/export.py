@@ -0,0 +1,66 @@
+"""
+Выгрузка таблиц в csv-файлы того же формата, что читает csv_upload.
+Строки читаются из БД пачками через iterator(chunk_size), поэтому
+память не зависит от размера таблицы.
+"""
+import csv
+import io
+from datetime import datetime
+
+from reviews.models import Category, Comment, Genre, Review, Title
+from users.models import User
+
+CHUNK_SIZE = 2000
+
+EXPORT_FILES = {
+    'users.csv': (
+        User,
+        ('id', 'username', 'email', 'role', 'bio', 'first_name', 'last_name')
+    ),
+    'category.csv': (Category, ('id', 'name', 'slug')),
+    'genre.csv': (Genre, ('id', 'name', 'slug')),
+    'titles.csv': (
+        Title, ('id', 'name', 'year', 'category', 'description')
+    ),
+    'genre_title.csv': (Title.genre.through, ('id', 'title_id', 'genre_id')),
+    'review.csv': (
+        Review, ('id', 'title_id', 'text', 'author', 'score', 'pub_date')
+    ),
+    'comments.csv': (
+        Comment, ('id', 'review_id', 'text', 'author', 'pub_date')
+    ),
+}
+
+
+def format_value(value):
+    if isinstance(value, datetime):
+        return value.isoformat().replace('+00:00', 'Z')
+    return value
+
+
+def export_rows(file, chunk_size=CHUNK_SIZE):
+    """Заголовок и строки csv-файла file в порядке первичного ключа."""
+    model, columns = EXPORT_FILES[file]
+    yield columns
+    for values in model.objects.order_by('pk').values_list(
+        *columns
+    ).iterator(chunk_size=chunk_size):
+        yield [format_value(value) for value in values]
+
+
+def write_csv(csv_file, rows):
+    writer = csv.writer(csv_file, lineterminator='\n')
+    writer.writerows(rows)
+
+
+def stream_csv(file, chunk_size=CHUNK_SIZE):
+    """Текст csv-файла file частями по chunk_size строк."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator='\n')
+    for number, row in enumerate(export_rows(file, chunk_size), 1):
+        writer.writerow(row)
+        if number % chunk_size == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
@@ -0,0 +1,148 @@
+import time
+from collections import defaultdict
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Count, Max, Min
+
+from api.cache import bump_catalog_version
+from core.management.pool import worker_pool
+from reviews.models import Comment, Review, ScoreCount, Title
+from reviews.signals import (
+    recalculate_comment_counts,
+    recalculate_title_scores
+)
+
+
+def title_drift(start, stop):
+    """
+    Пересчитывает по отзывам оценки произведений с id из [start, stop)
+    и возвращает id тех, у кого сумма, количество, рейтинг
+    или распределение оценок разошлись с хранимыми.
+    """
+    expected = defaultdict(dict)
+    for title_id, score, count in Review.objects.filter(
+        title_id__gte=start, title_id__lt=stop
+    ).order_by().values('title', 'score').annotate(
+        count=Count('pk')
+    ).values_list('title', 'score', 'count'):
+        expected[title_id][score] = count
+    stored = defaultdict(dict)
+    for title_id, score, count in ScoreCount.objects.filter(
+        title_id__gte=start, title_id__lt=stop, count__gt=0
+    ).values_list('title', 'score', 'count'):
+        stored[title_id][score] = count
+    drift = set()
+    for title_id, score_sum, score_count, rating in Title.objects.filter(
+        pk__gte=start, pk__lt=stop
+    ).values_list('pk', 'score_sum', 'score_count', 'rating'):
+        scores = expected.get(title_id, {})
+        count = sum(scores.values())
+        total = sum(score * number for score, number in scores.items())
+        if (
+            (score_sum, score_count) != (total, count)
+            or rating != (total // count if count else None)
+            or stored.get(title_id, {}) != scores
+        ):
+            drift.add(title_id)
+    return drift
+
+
+def review_drift(start, stop):
+    """
+    Пересчитывает комментарии к отзывам с id из [start, stop)
+    и возвращает id отзывов с разошедшимся comments_count.
+    """
+    expected = dict(Comment.objects.filter(
+        review_id__gte=start, review_id__lt=stop
+    ).order_by().values('review').annotate(
+        count=Count('pk')
+    ).values_list('review', 'count'))
+    return {
+        review_id
+        for review_id, count in Review.objects.filter(
+            pk__gte=start, pk__lt=stop
+        ).values_list('pk', 'comments_count')
+        if count != expected.get(review_id, 0)
+    }
+
+
+class Command(BaseCommand):
+    DRIFT_MESSAGE = (
+        '{model}: расхождений {count} из {total} за {seconds:.2f} с.'
+    )
+    CHUNK_SIZE = 10000
+    CHECKS = (
+        (Title, title_drift, recalculate_title_scores),
+        (Review, review_drift, recalculate_comment_counts),
+    )
+
+    help = (
+        'Пересчёт денормализованных счётчиков произведений и отзывов '
+        'по диапазонам id и исправление расхождений'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=self.CHUNK_SIZE,
+            help='Сколько id проверяется за одну задачу.'
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=0,
+            help='Число процессов для пересчёта; 0 - в текущем процессе.'
+        )
+        parser.add_argument(
+            '--check',
+            action='store_true',
+            help='Только найти расхождения, не исправляя их.'
+        )
+
+    @staticmethod
+    def chunk_starts(model, size):
+        bounds = model.objects.aggregate(first=Min('pk'), last=Max('pk'))
+        if bounds['first'] is None:
+            return []
+        return list(range(bounds['first'], bounds['last'] + 1, size))
+
+    def check_model(self, model, find_drift, repair, map_chunks, options):
+        """
+        Ищет расхождения по диапазонам id и, если не задан --check,
+        пересчитывает счётчики найденных объектов по мере поступления
+        результатов. Запись идёт только из текущего процесса.
+        """
+        started, count = time.perf_counter(), 0
+        starts = self.chunk_starts(model, options['chunk_size'])
+        stops = [start + options['chunk_size'] for start in starts]
+        for drift in map_chunks(find_drift, starts, stops):
+            count += len(drift)
+            if drift and not options['check']:
+                repair(model.objects.filter(pk__in=drift))
+        self.stdout.write(self.DRIFT_MESSAGE.format(
+            model=model._meta.model_name,
+            count=count,
+            total=model.objects.count(),
+            seconds=time.perf_counter() - started
+        ))
+        return count
+
+    def check_all(self, map_chunks, options):
+        return sum(
+            self.check_model(model, find_drift, repair, map_chunks, options)
+            for model, find_drift, repair in self.CHECKS
+        )
+
+    def handle(self, *args, **options):
+        if options['chunk_size'] <= 0:
+            raise CommandError('--chunk-size должен быть больше нуля.')
+        if options['workers'] < 0:
+            raise CommandError('--workers не может быть отрицательным.')
+        if not options['workers']:
+            drift = self.check_all(map, options)
+        else:
+            with worker_pool(options['workers']) as pool:
+                drift = self.check_all(pool.map, options)
+        if drift and not options['check']:
+            bump_catalog_version()
@@ -0,0 +1,58 @@
+import os
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.export import CHUNK_SIZE, EXPORT_FILES, export_rows, write_csv
+
+
+class Command(BaseCommand):
+    DONE_MESSAGE = (
+        'Таблица {model} выгружена в {path} '
+        'за {seconds:.2f} с.'
+    )
+
+    help = 'Выгрузка данных из БД в csv-файлы формата csv_upload'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'files',
+            nargs='*',
+            help='Файлы для выгрузки, по умолчанию все: {}.'.format(
+                ', '.join(EXPORT_FILES)
+            )
+        )
+        parser.add_argument(
+            '--data-dir',
+            required=True,
+            help=(
+                'Каталог для csv-файлов. Обязателен, чтобы выгрузка '
+                'не перезаписала файлы static/data.'
+            )
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=CHUNK_SIZE,
+            help='Сколько строк читать из БД за раз.'
+        )
+
+    def handle(self, *args, **options):
+        if options['chunk_size'] <= 0:
+            raise CommandError('--chunk-size должен быть больше нуля.')
+        unknown = set(options['files']) - set(EXPORT_FILES)
+        if unknown:
+            raise CommandError(
+                'Неизвестные файлы: {}.'.format(', '.join(sorted(unknown)))
+            )
+        os.makedirs(options['data_dir'], exist_ok=True)
+        for file in options['files'] or EXPORT_FILES:
+            started = time.perf_counter()
+            path = os.path.join(options['data_dir'], file)
+            with open(path, 'w', encoding='utf-8', newline='') as csv_file:
+                write_csv(csv_file, export_rows(file, options['chunk_size']))
+            self.stdout.write(self.DONE_MESSAGE.format(
+                model=EXPORT_FILES[file][0]._meta.model_name,
+                path=path,
+                seconds=time.perf_counter() - started
+            ))
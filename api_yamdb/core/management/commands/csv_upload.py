@@ -1,7 +1,19 @@
 import csv
+import hashlib
+import os
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from itertools import islice
 
+from django.apps import apps
 from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils import timezone
 
+from api.cache import bump_catalog_version
+from core.management.pool import worker_pool
+from core.models import CsvFile
 from reviews.models import (
     Title,
     Genre,
@@ -9,18 +21,132 @@ from reviews.models import (
     Review,
     Comment,
 )
+from reviews.signals import (
+    recalculate_comment_counts,
+    recalculate_title_scores
+)
 from users.models import User
 
 
+def parse_value(field, value):
+    """Приводит строковое значение из csv к типу поля модели."""
+    if value == '' and field.null:
+        value = None
+    return field.to_python(value)
+
+
+@contextmanager
+def csv_dates(model, columns):
+    """
+    Отключает auto_now_add у полей модели, которые есть в колонках
+    csv, чтобы загрузка сохраняла даты из файла, а не время импорта.
+    """
+    fields = [
+        field for field in model._meta.concrete_fields
+        if getattr(field, 'auto_now_add', False)
+        and (field.name in columns or field.attname in columns)
+    ]
+    for field in fields:
+        field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field in fields:
+            field.auto_now_add = True
+
+
+def parse_chunk(model_label, columns, chunk):
+    """
+    Разбирает пачку строк csv в кортежи значений всех колонок таблицы,
+    подготовленные для записи в БД так же, как это делает bulk_create.
+    Выполняется в процессах пула, поэтому модель передаётся меткой.
+    """
+    model = apps.get_model(model_label)
+    fields = [model._meta.get_field(name) for name in columns]
+    rows = []
+    with csv_dates(model, columns):
+        for values in chunk:
+            try:
+                obj = model(**{
+                    field.attname: parse_value(field, value)
+                    for field, value in zip(fields, values)
+                })
+                rows.append(tuple(
+                    field.get_db_prep_save(
+                        field.pre_save(obj, True), connection
+                    )
+                    for field in model._meta.concrete_fields
+                ))
+            except Exception as error:
+                raise CommandError(Command.ERROR_MESSAGE.format(
+                    error=error, row=dict(zip(columns, values))
+                ))
+    return rows
+
+
+class OffsetLines:
+    """
+    Итератор строк бинарного файла для csv.reader, который помнит
+    смещение в байтах после последней выданной строки и хеш всех
+    байт до него. csv.reader не читает вперёд, поэтому после каждой
+    записи смещение указывает на начало следующей.
+    """
+
+    def __init__(self, binary_file):
+        self.file = binary_file
+        self.offset = 0
+        self.digest = hashlib.sha256()
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        line = self.file.readline()
+        if not line:
+            raise StopIteration
+        self.offset += len(line)
+        self.digest.update(line)
+        return line.decode('utf-8')
+
+    def skip_to(self, offset, chunk_size):
+        """Пропускает байты до смещения offset, учитывая их в хеше."""
+        while self.offset < offset:
+            data = self.file.read(min(chunk_size, offset - self.offset))
+            if not data:
+                return
+            self.offset += len(data)
+            self.digest.update(data)
+
+
 class Command(BaseCommand):
     ERROR_MESSAGE = 'Ошибка - {error}, проблема в строке - {row}.'
+    MISSING_MESSAGE = 'нет объекта {model} с id={pk}'
     DONE_MESSAGE = 'Данные из {file} перенесены в таблицу {model}.'
+    RATE_MESSAGE = '{count} строк за {seconds:.2f} с ({rate:.0f} строк/с).'
+    SKIP_MESSAGE = 'Файл {file} не изменился с прошлой загрузки.'
+    UPSERT_MESSAGE = (
+        'Из {file}: добавлено {created}, изменено {updated}, '
+        'без изменений {unchanged}.'
+    )
+    DELETE_MESSAGE = 'Из таблицы {model} удалено строк: {count}.'
+    LOADED_MESSAGE = 'Файл {file} уже загружен.'
+    RESUME_MESSAGE = 'Файл {file}: загрузка продолжается со строки {row}.'
+    CHANGED_MESSAGE = (
+        'Файл {file} изменился после прошлой загрузки, '
+        'продолжить её нельзя.'
+    )
+    DATA_DIR = 'static/data'
+    BATCH_SIZE = 1000
+    HASH_CHUNK_SIZE = 1024 * 1024
+
+    data_dir = DATA_DIR
 
     MODELS_FILES = {
         User: 'users.csv',
         Category: 'category.csv',
         Genre: 'genre.csv',
         Title: 'titles.csv',
+        Title.genre.through: 'genre_title.csv',
         Review: 'review.csv',
         Comment: 'comments.csv',
     }
@@ -31,32 +157,628 @@ class Command(BaseCommand):
         Title: ['category', 'category_id'],
     }
 
+    DEPENDENCIES = {
+        Title: (Category,),
+        Title.genre.through: (Title, Genre),
+        Review: (User, Title),
+        Comment: (User, Review),
+    }
+
+    PARENT_FIELDS = {
+        Review: 'title_id',
+        Comment: 'review_id',
+    }
+
     help = 'Запись в БД данных из csv-файлов'
 
-    def handle(self, *args, **kwargs):
+    def add_arguments(self, parser):
+        mode = parser.add_mutually_exclusive_group()
+        mode.add_argument(
+            '--bulk',
+            action='store_true',
+            help=(
+                'Загружать файлы через bulk_create пачками, '
+                'одной транзакцией на пачку.'
+            )
+        )
+        mode.add_argument(
+            '--upsert',
+            action='store_true',
+            help=(
+                'Сверять файлы с БД по первичному ключу: добавлять, '
+                'изменять и удалять только отличающиеся строки. '
+                'Файлы, не изменившиеся с прошлой загрузки, пропускаются.'
+            )
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=self.BATCH_SIZE,
+            help='Размер пачки для --bulk, --workers и --upsert.'
+        )
+        parser.add_argument(
+            '--resume',
+            action='store_true',
+            help=(
+                'Продолжить прерванную загрузку --bulk или --workers '
+                'с последней записанной пачки. Без --workers включает --bulk.'
+            )
+        )
+        parser.add_argument(
+            '--data-dir',
+            default=self.DATA_DIR,
+            help='Каталог с csv-файлами.'
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=0,
+            help=(
+                'Разбирать файлы пачками в стольких процессах, '
+                'записывая в БД из одного. Включает --bulk.'
+            )
+        )
+
+    def file_path(self, file):
+        return os.path.join(self.data_dir, file)
+
+    def file_hash(self, file, size=None):
+        """Хеш первых size байт файла или всего файла."""
+        path = self.file_path(file)
+        with open(path, 'rb') as csv_file:
+            lines = OffsetLines(csv_file)
+            lines.skip_to(
+                os.path.getsize(path) if size is None else size,
+                self.HASH_CHUNK_SIZE
+            )
+        return lines.digest.hexdigest()
+
+    def columns(self, model, header):
+        """Переименовывает поля заголовка csv-файла под модель."""
+        renamed = (
+            dict([self.DIFFERENT_FIELDS[model]])
+            if model in self.DIFFERENT_FIELDS else {}
+        )
+        return [renamed.get(name, name) for name in header]
+
+    def file_dates(self, model, file):
+        """Сохраняет при загрузке файла даты auto_now_add из его колонок."""
+        with open(self.file_path(file), 'rt', encoding='utf-8') as csv_file:
+            header = next(csv.reader(csv_file), [])
+        return csv_dates(model, self.columns(model, header))
+
+    @staticmethod
+    def make_row(model, columns):
+        """
+        Возвращает функцию, собирающую из значений строки csv словарь
+        полей модели. Пустые значения полей с null=True становятся None.
+        """
+        nullable = {
+            name for name in columns if model._meta.get_field(name).null
+        }
+
+        def make(values):
+            return {
+                name: None if value == '' and name in nullable else value
+                for name, value in zip(columns, values)
+            }
+
+        return make
+
+    def read_rows(self, model, file):
+        """Построчно читает csv-файл, переименовывая поля под модель."""
+        with open(self.file_path(file), 'rt', encoding='utf-8') as csv_file:
+            csv_reader = csv.reader(csv_file)
+            make_row = self.make_row(
+                model, self.columns(model, next(csv_reader, []))
+            )
+            for values in csv_reader:
+                yield make_row(values)
+
+    def read_chunks(self, model, file, size, offset=0):
+        """
+        Читает csv-файл пачками по size строк, начиная со смещения
+        offset в байтах, и не загружает его целиком. Возвращает поля
+        модели, списки значений строк, смещение после пачки и хеш
+        файла до этого смещения.
+        """
+        with open(self.file_path(file), 'rb') as csv_file:
+            lines = OffsetLines(csv_file)
+            csv_reader = csv.reader(lines)
+            columns = self.columns(model, next(csv_reader, []))
+            lines.skip_to(offset, self.HASH_CHUNK_SIZE)
+            while True:
+                chunk = list(islice(csv_reader, size))
+                if not chunk:
+                    return
+                yield columns, chunk, lines.offset, lines.digest.hexdigest()
+
+    def start_file(self, file, resume):
+        """
+        Заводит контрольную точку загрузки файла и возвращает смещение
+        и число уже записанных строк, с которых её надо начать.
+        С resume продолжает прерванную загрузку, если записанная часть
+        файла не изменилась, или возвращает None, если файл уже
+        загружен полностью.
+        """
+        state = CsvFile.objects.filter(name=file).first()
+        if resume and state is not None:
+            if state.sha256 != self.file_hash(
+                file, None if state.finished else state.offset
+            ):
+                raise CommandError(self.CHANGED_MESSAGE.format(file=file))
+            if state.finished:
+                self.stdout.write(self.LOADED_MESSAGE.format(file=file))
+                return None
+            if state.rows:
+                self.stdout.write(self.RESUME_MESSAGE.format(
+                    file=file, row=state.rows + 1
+                ))
+            return state.offset, state.rows
+        CsvFile.objects.update_or_create(name=file, defaults={
+            'sha256': hashlib.sha256().hexdigest(),
+            'offset': 0,
+            'rows': 0,
+            'finished': False,
+        })
+        return 0, 0
+
+    def save_checkpoint(self, file, offset, rows, sha256, finished=False):
+        CsvFile.objects.filter(name=file).update(
+            offset=offset,
+            rows=rows,
+            sha256=sha256,
+            finished=finished,
+            loaded_at=timezone.now()
+        )
+
+    def finish_file(self, file, rows):
+        self.save_checkpoint(
+            file,
+            os.path.getsize(self.file_path(file)),
+            rows,
+            self.file_hash(file),
+            finished=True
+        )
+
+    def load_rows(self, model, file, start=(0, 0)):
+        """
+        Загружает файл построчно через create(), начиная с контрольной
+        точки start. Каждая строка записывается в своей транзакции
+        вместе с новой контрольной точкой, поэтому после ошибки
+        загрузку можно продолжить с --resume.
+        """
+        offset, rows = start
+        make_row = None
+        for columns, (values,), offset, sha256 in self.read_chunks(
+            model, file, 1, offset
+        ):
+            make_row = make_row or self.make_row(model, columns)
+            row = make_row(values)
+            try:
+                with transaction.atomic():
+                    model.objects.create(**row)
+                    rows += 1
+                    self.save_checkpoint(file, offset, rows, sha256)
+            except Exception as error:
+                raise CommandError(
+                    self.ERROR_MESSAGE.format(error=error, row=row)
+                )
+        return rows - start[1]
+
+    def insert_batch(self, model, batch):
+        """
+        Вставляет пачку одним запросом. Если пачка не вставилась,
+        повторяет вставку по одной строке, чтобы назвать ошибочную.
+        """
+        try:
+            with transaction.atomic():
+                model.objects.bulk_create(obj for _, obj in batch)
+            return
+        except Exception as error:
+            batch_error = error
+        for row, obj in batch:
+            try:
+                with transaction.atomic():
+                    model.objects.bulk_create([obj])
+            except Exception as error:
+                raise CommandError(
+                    self.ERROR_MESSAGE.format(error=error, row=row)
+                )
+        raise CommandError(
+            self.ERROR_MESSAGE.format(error=batch_error, row=batch[0][0])
+        )
+
+    def load_bulk(
+        self, model, file, batch_size, check_row=None, start=(0, 0)
+    ):
+        """
+        Загружает файл пачками, начиная с контрольной точки start.
+        Каждая пачка записывается в своей транзакции вместе с новой
+        контрольной точкой. Возвращает число записанных строк.
+        """
+        offset, rows = start
+        for columns, chunk, offset, sha256 in self.read_chunks(
+            model, file, batch_size, offset
+        ):
+            batch, make_row = [], self.make_row(model, columns)
+            for values in chunk:
+                row = make_row(values)
+                try:
+                    if check_row is not None:
+                        check_row(row)
+                    batch.append((row, model(**row)))
+                except Exception as error:
+                    raise CommandError(
+                        self.ERROR_MESSAGE.format(error=error, row=row)
+                    )
+            with transaction.atomic():
+                self.insert_batch(model, batch)
+                rows += len(batch)
+                self.save_checkpoint(file, offset, rows, sha256)
+        return rows - start[1]
+
+    def link_checker(self, model):
+        """
+        Возвращает проверку строки промежуточной модели многие-ко-многим.
+        Ссылки проверяются по множествам id, собранным одним запросом
+        на каждую связанную модель.
+        """
+        related = {
+            field.attname: field.related_model
+            for field in model._meta.concrete_fields
+            if field.is_relation
+        }
+        known_ids = {
+            attname: set(related_model.objects.values_list('pk', flat=True))
+            for attname, related_model in related.items()
+        }
+
+        def check_row(row):
+            for attname, related_model in related.items():
+                pk = int(row[attname])
+                if pk not in known_ids[attname]:
+                    raise ValueError(self.MISSING_MESSAGE.format(
+                        model=related_model._meta.model_name, pk=pk
+                    ))
+
+        return check_row
+
+    def load_links(self, model, file, batch_size, start=(0, 0)):
+        """
+        Загружает связи многие-ко-многим пачками bulk_create в
+        промежуточную модель.
+        """
+        return self.load_bulk(
+            model, file, batch_size, self.link_checker(model), start
+        )
+
+    @staticmethod
+    def parse_row(model, row):
+        """Приводит строковые значения из csv к типам полей модели."""
+        values = {}
+        for name, value in row.items():
+            field = model._meta.get_field(name)
+            values[field.attname] = parse_value(field, value)
+        return values
+
+    def upsert_batch(self, model, batch, touched):
+        """
+        Сверяет пачку строк с БД одним запросом по первичному ключу.
+        Поля auto_now не сравниваются: их значения при загрузке всё
+        равно задаёт модель. Даты auto_now_add из файла сверяются
+        как обычные поля.
+        """
+        pk_name = model._meta.pk.attname
+        fields = [
+            field.attname for field in map(model._meta.get_field, batch[0][1])
+            if not field.primary_key
+            and not getattr(field, 'auto_now', False)
+        ]
+        stored = {
+            values[0]: values[1:]
+            for values in model.objects.filter(
+                pk__in=[values[pk_name] for _, values in batch]
+            ).values_list(pk_name, *fields)
+        }
+        parent = self.PARENT_FIELDS.get(model)
+        created, updated = [], []
+        for row, values in batch:
+            old = stored.get(values[pk_name])
+            new = tuple(values[field] for field in fields)
+            if old == new:
+                continue
+            if parent is not None:
+                touched[model].add(values[parent])
+            if old is None:
+                created.append((row, model(**values)))
+                continue
+            if parent is not None:
+                touched[model].add(old[fields.index(parent)])
+            updated.append(model(**values))
+        if created:
+            self.insert_batch(model, created)
+        if updated:
+            model.objects.bulk_update(updated, fields)
+        return len(created), len(updated)
+
+    def upsert_file(self, model, file, batch_size, touched, check_row=None):
+        """
+        Загружает изменения из файла пачками и возвращает множество
+        первичных ключей, которые в нём есть.
+        """
+        counts = {'created': 0, 'updated': 0, 'unchanged': 0}
+        seen, batch = set(), []
+        for row in self.read_rows(model, file):
+            try:
+                if check_row is not None:
+                    check_row(row)
+                values = self.parse_row(model, row)
+            except Exception as error:
+                raise CommandError(
+                    self.ERROR_MESSAGE.format(error=error, row=row)
+                )
+            seen.add(values[model._meta.pk.attname])
+            batch.append((row, values))
+            if len(batch) >= batch_size:
+                self.count_upserted(
+                    counts, batch, self.upsert_batch(model, batch, touched)
+                )
+                batch = []
+        if batch:
+            self.count_upserted(
+                counts, batch, self.upsert_batch(model, batch, touched)
+            )
+        self.stdout.write(self.UPSERT_MESSAGE.format(file=file, **counts))
+        return seen
+
+    @staticmethod
+    def count_upserted(counts, batch, result):
+        created, updated = result
+        counts['created'] += created
+        counts['updated'] += updated
+        counts['unchanged'] += len(batch) - created - updated
+
+    def delete_stale(self, model, seen, batch_size):
+        """Удаляет строки, которых больше нет в файле."""
+        stale = [
+            pk for pk in model.objects.values_list(
+                'pk', flat=True
+            ).iterator(chunk_size=batch_size)
+            if pk not in seen
+        ]
+        for start in range(0, len(stale), batch_size):
+            model.objects.filter(
+                pk__in=stale[start:start + batch_size]
+            ).delete()
+        return len(stale)
+
+    def upsert(self, batch_size):
+        """
+        Загружает только изменения. Удаление выполняется после всех
+        вставок в обратном порядке файлов, чтобы каскад не задевал
+        строки, которые ещё есть в других файлах.
+        """
+        seen, touched = {}, defaultdict(set)
         for model, file in self.MODELS_FILES.items():
-            with open(
-                f'static/data/{file}', 'rt', encoding='utf-8'
-            ) as csv_file:
-                csv_reader = csv.DictReader(csv_file)
-                for row in csv_reader:
-                    if model in self.DIFFERENT_FIELDS:
-                        row = {
-                            field_csv.replace(
-                                self.DIFFERENT_FIELDS[model][0],
-                                self.DIFFERENT_FIELDS[model][1],
-                            ): field_table
-                            for field_csv, field_table in row.items()
-                        }
-                    try:
-                        model.objects.create(**row)
-                    except Exception as error:
-                        raise CommandError(
-                            self.ERROR_MESSAGE.format(error=error, row=row)
-                        )
-
-                self.stdout.write(
-                    self.DONE_MESSAGE.format(
+            started = time.perf_counter()
+            digest = self.file_hash(file)
+            if CsvFile.objects.filter(
+                name=file, sha256=digest, finished=True
+            ).exists():
+                self.stdout.write(self.SKIP_MESSAGE.format(file=file))
+                continue
+            check_row = (
+                self.link_checker(model) if model._meta.auto_created
+                else None
+            )
+            with self.file_dates(model, file):
+                seen[model] = self.upsert_file(
+                    model, file, batch_size, touched, check_row
+                )
+            CsvFile.objects.update_or_create(name=file, defaults={
+                'sha256': digest,
+                'offset': os.path.getsize(self.file_path(file)),
+                'rows': len(seen[model]),
+                'finished': True,
+            })
+            self.write_rate(len(seen[model]), started)
+        for model in reversed(list(seen)):
+            count = self.delete_stale(model, seen[model], batch_size)
+            if count:
+                self.stdout.write(self.DELETE_MESSAGE.format(
+                    model=model._meta.model_name, count=count
+                ))
+        titles = sorted(touched[Review])
+        for start in range(0, len(titles), batch_size):
+            recalculate_title_scores(Title.objects.filter(
+                pk__in=titles[start:start + batch_size]
+            ))
+        reviews = sorted(touched[Comment])
+        for start in range(0, len(reviews), batch_size):
+            recalculate_comment_counts(Review.objects.filter(
+                pk__in=reviews[start:start + batch_size]
+            ))
+
+    def stages(self):
+        """
+        Разбивает модели на этапы: модели одного этапа зависят
+        только от моделей предыдущих этапов.
+        """
+        loaded, stages = set(), []
+        pending = list(self.MODELS_FILES)
+        while pending:
+            stage = [
+                model for model in pending
+                if loaded.issuperset(self.DEPENDENCIES.get(model, ()))
+            ]
+            stages.append(stage)
+            loaded.update(stage)
+            pending = [model for model in pending if model not in loaded]
+        return stages
+
+    @staticmethod
+    def insert_sql(model):
+        quote_name = connection.ops.quote_name
+        return 'INSERT INTO {table} ({columns}) VALUES ({values})'.format(
+            table=quote_name(model._meta.db_table),
+            columns=', '.join(
+                quote_name(field.column)
+                for field in model._meta.concrete_fields
+            ),
+            values=', '.join(['%s'] * len(model._meta.concrete_fields))
+        )
+
+    def write_chunk(self, model, future, check_row):
+        """
+        Вставляет разобранную пачку одним executemany. Если пачка
+        не вставилась, повторяет вставку по одной строке, чтобы
+        назвать ошибочную.
+        """
+        attnames = [field.attname for field in model._meta.concrete_fields]
+        rows = future.result()
+        for values in rows:
+            try:
+                if check_row is not None:
+                    check_row(dict(zip(attnames, values)))
+            except Exception as error:
+                raise CommandError(self.ERROR_MESSAGE.format(
+                    error=error, row=dict(zip(attnames, values))
+                ))
+        sql = self.insert_sql(model)
+        try:
+            with transaction.atomic(), connection.cursor() as cursor:
+                cursor.executemany(sql, rows)
+            return len(rows)
+        except Exception as error:
+            batch_error = error
+        for values in rows:
+            try:
+                with transaction.atomic(), connection.cursor() as cursor:
+                    cursor.execute(sql, values)
+            except Exception as error:
+                raise CommandError(self.ERROR_MESSAGE.format(
+                    error=error, row=dict(zip(attnames, values))
+                ))
+        raise CommandError(self.ERROR_MESSAGE.format(
+            error=batch_error, row=dict(zip(attnames, rows[0]))
+        ))
+
+    def commit_chunk(self, model, future, check_row, checkpoint):
+        with transaction.atomic():
+            count = self.write_chunk(model, future, check_row)
+            self.save_checkpoint(self.MODELS_FILES[model], *checkpoint)
+        return count
+
+    def load_stage(self, pool, starts, workers, batch_size):
+        """
+        Файлы этапа разбираются пачками в пуле процессов, а текущий
+        процесс записывает готовые пачки в порядке отправки, каждую
+        в своей транзакции вместе с контрольной точкой. В работе
+        не больше двух пачек на процесс, поэтому память не зависит
+        от размера файлов.
+        """
+        counts, pending = defaultdict(int), deque()
+        for model, (offset, rows) in starts.items():
+            check_row = (
+                self.link_checker(model) if model._meta.auto_created
+                else None
+            )
+            for columns, chunk, offset, sha256 in self.read_chunks(
+                model, self.MODELS_FILES[model], batch_size, offset
+            ):
+                future = pool.submit(
+                    parse_chunk, model._meta.label, columns, chunk
+                )
+                rows += len(chunk)
+                pending.append(
+                    (model, future, check_row, (offset, rows, sha256))
+                )
+                while len(pending) > 2 * workers:
+                    written = pending.popleft()
+                    counts[written[0]] += self.commit_chunk(*written)
+        while pending:
+            written = pending.popleft()
+            counts[written[0]] += self.commit_chunk(*written)
+        return counts
+
+    def load_parallel(self, workers, batch_size, resume):
+        with worker_pool(workers) as pool:
+            for stage in self.stages():
+                started = time.perf_counter()
+                starts = {}
+                for model in stage:
+                    start = self.start_file(self.MODELS_FILES[model], resume)
+                    if start is not None:
+                        starts[model] = start
+                if not starts:
+                    continue
+                counts = self.load_stage(pool, starts, workers, batch_size)
+                for model, (_, rows) in starts.items():
+                    file = self.MODELS_FILES[model]
+                    self.finish_file(file, rows + counts[model])
+                    self.stdout.write(self.DONE_MESSAGE.format(
                         file=file, model=model._meta.model_name
+                    ))
+                self.write_rate(sum(counts.values()), started)
+
+    def write_rate(self, count, started):
+        seconds = time.perf_counter() - started
+        self.stdout.write(
+            self.RATE_MESSAGE.format(
+                count=count,
+                seconds=seconds,
+                rate=count / seconds if seconds else 0
+            )
+        )
+
+    def load_files(self, bulk, batch_size, resume):
+        for model, file in self.MODELS_FILES.items():
+            started = time.perf_counter()
+            start = self.start_file(file, resume)
+            if start is None:
+                continue
+            with self.file_dates(model, file):
+                if model._meta.auto_created:
+                    count = self.load_links(model, file, batch_size, start)
+                elif bulk:
+                    count = self.load_bulk(
+                        model, file, batch_size, start=start
                     )
+                else:
+                    count = self.load_rows(model, file, start)
+            self.finish_file(file, start[1] + count)
+            self.stdout.write(
+                self.DONE_MESSAGE.format(
+                    file=file, model=model._meta.model_name
                 )
+            )
+            self.write_rate(count, started)
+
+    def check_options(self, options):
+        if options['batch_size'] <= 0:
+            raise CommandError('--batch-size должен быть больше нуля.')
+        if options['workers'] < 0:
+            raise CommandError('--workers не может быть меньше нуля.')
+        if options['upsert'] and (options['workers'] or options['resume']):
+            raise CommandError('--workers и --resume несовместимы с --upsert.')
+
+    def handle(self, *args, **options):
+        self.check_options(options)
+        self.data_dir = options['data_dir']
+        if options['upsert']:
+            with transaction.atomic():
+                self.upsert(options['batch_size'])
+        elif options['workers']:
+            self.load_parallel(
+                options['workers'], options['batch_size'], options['resume']
+            )
+            recalculate_title_scores()
+            recalculate_comment_counts()
+        else:
+            bulk = options['bulk'] or options['resume']
+            self.load_files(bulk, options['batch_size'], options['resume'])
+            if bulk:
+                recalculate_title_scores()
+                recalculate_comment_counts()
+        bump_catalog_version()
@@ -0,0 +1,283 @@
+import random
+import time
+from datetime import datetime, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from api.cache import bump_catalog_version
+from reviews.constants import MAX_SCORE, MIN_SCORE
+from reviews.models import Category, Comment, Genre, Review, Title
+from reviews.signals import (
+    recalculate_comment_counts,
+    recalculate_title_scores
+)
+from users.models import User, UserRole
+
+
+class Command(BaseCommand):
+    DONE_MESSAGE = (
+        '{model}: {count} строк за {seconds:.2f} с ({rate:.0f} строк/с).'
+    )
+    CAPPED_MESSAGE = (
+        'Отзывов запрошено больше, чем пар автор-произведение: '
+        'будет создано {count}.'
+    )
+    BATCH_SIZE = 5000
+    # Даты и годы берутся из фиксированного интервала, а не от текущего
+    # времени, чтобы один seed давал одинаковые данные в любой день.
+    START_DATE = datetime(2015, 1, 1, tzinfo=timezone.utc)
+    END_DATE = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    ROLE_WEIGHTS = {
+        UserRole.USER: 97,
+        UserRole.MODERATOR: 2,
+        UserRole.ADMIN: 1,
+    }
+    SCORE_WEIGHTS = (2, 1, 2, 3, 5, 8, 12, 14, 10, 6)
+    GENRES_PER_TITLE = (1, 3)
+    TITLE_FIELDS = (
+        'id', 'name', 'year', 'description', 'category', 'score_sum',
+        'score_count', 'rating', 'reviews_changed'
+    )
+    TITLE_GENRE_FIELDS = ('title', 'genre')
+    REVIEW_FIELDS = (
+        'id', 'title', 'author', 'text', 'score', 'pub_date',
+        'comments_count', 'comments_changed'
+    )
+    COMMENT_FIELDS = ('id', 'review', 'author', 'text', 'pub_date')
+
+    help = (
+        'Заполнение БД детерминированными синтетическими данными '
+        'для нагрузочных тестов'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--users', type=int, default=1000)
+        parser.add_argument('--categories', type=int, default=10)
+        parser.add_argument('--genres', type=int, default=30)
+        parser.add_argument('--titles', type=int, default=10000)
+        parser.add_argument('--reviews', type=int, default=100000)
+        parser.add_argument('--comments', type=int, default=50000)
+        parser.add_argument(
+            '--zipf',
+            type=float,
+            default=1.1,
+            help='Показатель распределения Ципфа отзывов по произведениям.'
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=self.BATCH_SIZE
+        )
+
+    @staticmethod
+    def next_id(model):
+        return (model.objects.aggregate(last=Max('pk'))['last'] or 0) + 1
+
+    def random_date(self):
+        """Случайная дата публикации, подготовленная для записи в БД."""
+        return connection.ops.adapt_datetimefield_value(
+            self.START_DATE + timedelta(
+                seconds=self.randomizer.random() * self.date_span
+            )
+        )
+
+    def report(self, model, count, started):
+        seconds = time.perf_counter() - started
+        self.stdout.write(self.DONE_MESSAGE.format(
+            model=model._meta.model_name,
+            count=count,
+            seconds=seconds,
+            rate=count / seconds if seconds else 0
+        ))
+
+    def batches(self, items):
+        batch = []
+        for item in items:
+            batch.append(item)
+            if len(batch) >= self.batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    def insert_objects(self, model, objects):
+        """Вставляет объекты через bulk_create в одной транзакции."""
+        started, count = time.perf_counter(), 0
+        with transaction.atomic():
+            for batch in self.batches(objects):
+                model.objects.bulk_create(batch)
+                count += len(batch)
+        self.report(model, count, started)
+
+    def insert_rows(self, model, fields, rows):
+        """
+        Вставляет кортежи значений в колонки fields через executemany
+        в одной транзакции. Для больших таблиц это в разы быстрее,
+        чем создавать экземпляры моделей для bulk_create.
+        """
+        started, count = time.perf_counter(), 0
+        quote_name = connection.ops.quote_name
+        sql = 'INSERT INTO {table} ({columns}) VALUES ({values})'.format(
+            table=quote_name(model._meta.db_table),
+            columns=', '.join(
+                quote_name(model._meta.get_field(field).column)
+                for field in fields
+            ),
+            values=', '.join(['%s'] * len(fields))
+        )
+        with transaction.atomic(), connection.cursor() as cursor:
+            for batch in self.batches(rows):
+                cursor.executemany(sql, batch)
+                count += len(batch)
+        self.report(model, count, started)
+
+    def zipf_counts(self, total, size, cap, exponent):
+        """
+        Распределяет total отзывов по size произведениям по закону Ципфа,
+        не больше cap на произведение, и перемешивает ранги.
+        """
+        weights = [1 / rank ** exponent for rank in range(1, size + 1)]
+        scale = total / sum(weights)
+        counts = [min(cap, int(weight * scale)) for weight in weights]
+        missing = total - sum(counts)
+        while missing > 0:
+            spare = [idx for idx, count in enumerate(counts) if count < cap]
+            for idx in spare[:missing]:
+                counts[idx] += 1
+            missing -= min(missing, len(spare))
+        self.randomizer.shuffle(counts)
+        return counts
+
+    def generate_users(self, first_id, count):
+        roles = self.randomizer.choices(
+            list(self.ROLE_WEIGHTS), self.ROLE_WEIGHTS.values(), k=count
+        )
+        for offset, role in enumerate(roles):
+            pk = first_id + offset
+            yield User(
+                id=pk,
+                username=f'user{pk}',
+                email=f'user{pk}@yamdb.fake',
+                password='!',
+                role=role
+            )
+
+    def generate_titles(self, title_ids, category_ids):
+        for pk in title_ids:
+            yield (
+                pk,
+                f'Произведение {pk}',
+                self.randomizer.randint(1900, self.END_DATE.year),
+                f'Описание произведения {pk}',
+                self.randomizer.choice(category_ids),
+                0,
+                0,
+                None,
+                self.now
+            )
+
+    def generate_title_genres(self, title_ids, genre_ids):
+        low, high = self.GENRES_PER_TITLE
+        for title_id in title_ids:
+            count = min(len(genre_ids), self.randomizer.randint(low, high))
+            for genre_id in self.randomizer.sample(genre_ids, count):
+                yield title_id, genre_id
+
+    def generate_reviews(self, review_ids, title_ids, user_ids, counts):
+        pk = review_ids.start
+        scores = range(MIN_SCORE, MAX_SCORE + 1)
+        for title_id, count in zip(title_ids, counts):
+            authors = self.randomizer.sample(user_ids, count)
+            for author_id, score in zip(authors, self.randomizer.choices(
+                scores, self.SCORE_WEIGHTS, k=count
+            )):
+                yield (
+                    pk, title_id, author_id, f'Отзыв {pk}', score,
+                    self.random_date(), 0, self.now
+                )
+                pk += 1
+
+    def generate_comments(self, comment_ids, review_ids, user_ids):
+        for pk in comment_ids:
+            yield (
+                pk,
+                self.randomizer.choice(review_ids),
+                self.randomizer.choice(user_ids),
+                f'Комментарий {pk}',
+                self.random_date()
+            )
+
+    def handle(self, *args, **options):
+        for option in ('users', 'categories', 'genres', 'titles'):
+            if options[option] <= 0:
+                raise CommandError(f'--{option} должен быть больше нуля.')
+        if options['batch_size'] <= 0:
+            raise CommandError('--batch-size должен быть больше нуля.')
+        self.randomizer = random.Random(options['seed'])
+        self.batch_size = options['batch_size']
+        self.now = connection.ops.adapt_datetimefield_value(timezone.now())
+        self.date_span = (self.END_DATE - self.START_DATE).total_seconds()
+
+        first_ids = {
+            model: self.next_id(model)
+            for model in (User, Category, Genre, Title, Review, Comment)
+        }
+        user_ids = range(first_ids[User], first_ids[User] + options['users'])
+        category_ids = range(
+            first_ids[Category], first_ids[Category] + options['categories']
+        )
+        genre_ids = range(
+            first_ids[Genre], first_ids[Genre] + options['genres']
+        )
+        title_ids = range(
+            first_ids[Title], first_ids[Title] + options['titles']
+        )
+        reviews_total = min(
+            options['reviews'], options['titles'] * options['users']
+        )
+        if reviews_total < options['reviews']:
+            self.stdout.write(self.CAPPED_MESSAGE.format(count=reviews_total))
+        review_ids = range(
+            first_ids[Review], first_ids[Review] + reviews_total
+        )
+
+        self.insert_objects(
+            User, self.generate_users(user_ids.start, len(user_ids))
+        )
+        self.insert_objects(Category, (
+            Category(id=pk, name=f'Категория {pk}', slug=f'category-{pk}')
+            for pk in category_ids
+        ))
+        self.insert_objects(Genre, (
+            Genre(id=pk, name=f'Жанр {pk}', slug=f'genre-{pk}')
+            for pk in genre_ids
+        ))
+        self.insert_rows(Title, self.TITLE_FIELDS, self.generate_titles(
+            title_ids, category_ids
+        ))
+        self.insert_rows(
+            Title.genre.through,
+            self.TITLE_GENRE_FIELDS,
+            self.generate_title_genres(title_ids, genre_ids)
+        )
+        self.insert_rows(Review, self.REVIEW_FIELDS, self.generate_reviews(
+            review_ids, title_ids, user_ids, self.zipf_counts(
+                reviews_total, len(title_ids), len(user_ids), options['zipf']
+            )
+        ))
+        if review_ids:
+            self.insert_rows(
+                Comment, self.COMMENT_FIELDS, self.generate_comments(
+                    range(
+                        first_ids[Comment],
+                        first_ids[Comment] + options['comments']
+                    ),
+                    review_ids,
+                    user_ids
+                )
+            )
+        recalculate_title_scores()
+        recalculate_comment_counts()
+        bump_catalog_version()
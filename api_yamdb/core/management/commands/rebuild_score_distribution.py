@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+
+from reviews.models import Title
+from reviews.signals import recalculate_score_counts
+
+
+class Command(BaseCommand):
+    DONE_MESSAGE = 'Распределение оценок перестроено: {count} произведений.'
+
+    help = 'Перестроение распределения оценок произведений по отзывам'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'titles',
+            nargs='*',
+            type=int,
+            help='id произведений; без них перестраиваются все.'
+        )
+
+    def handle(self, *args, **options):
+        titles = Title.objects.all()
+        if options['titles']:
+            titles = titles.filter(pk__in=options['titles'])
+        recalculate_score_counts(titles)
+        self.stdout.write(self.DONE_MESSAGE.format(count=titles.count()))
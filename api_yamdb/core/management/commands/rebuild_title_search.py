@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from reviews.search import rebuild_search_index
+
+
+class Command(BaseCommand):
+    DONE_MESSAGE = 'Полнотекстовый индекс произведений перестроен.'
+
+    help = 'Перестроение полнотекстового индекса произведений'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--database',
+            default='default',
+            help='Псевдоним базы данных.'
+        )
+
+    def handle(self, *args, **options):
+        rebuild_search_index(options['database'])
+        self.stdout.write(self.DONE_MESSAGE)
@@ -0,0 +1,47 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from core.outbox import send_outbox
+
+
+class Command(BaseCommand):
+    DONE_MESSAGE = 'Писем отправлено: {sent}, отложено: {failed}.'
+
+    help = (
+        'Отправка очереди писем пачками через одно соединение '
+        'с почтовым бэкендом'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=settings.EMAIL_OUTBOX_BATCH_SIZE,
+            help='Сколько писем отправляется через одно соединение.'
+        )
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Не завершаться, а проверять очередь каждые --interval с.'
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=settings.EMAIL_OUTBOX_POLL_INTERVAL,
+            help='Пауза между проверками очереди с --loop, в секундах.'
+        )
+
+    def handle(self, *args, **options):
+        if options['batch_size'] <= 0:
+            raise CommandError('--batch-size должен быть больше нуля.')
+        while True:
+            sent, failed = send_outbox(options['batch_size'])
+            if sent or failed or not options['loop']:
+                self.stdout.write(
+                    self.DONE_MESSAGE.format(sent=sent, failed=failed)
+                )
+            if not options['loop']:
+                return
+            time.sleep(options['interval'])
@@ -0,0 +1,27 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+import django
+from django.conf import settings
+
+
+def setup_worker(databases):
+    """Настраивает Django в процессе пула на базы родительского процесса."""
+    settings.DATABASES = databases
+    django.setup()
+
+
+def worker_pool(workers):
+    """
+    Пул процессов для команд управления. Процессы запускаются через
+    spawn, а не fork: пул создаёт их при первой задаче, когда родитель
+    уже открыл соединение с БД, а соединение SQLite нельзя использовать
+    в дочернем процессе после fork. Настройки баз передаются из
+    родителя, чтобы процессы работали с той же БД.
+    """
+    return ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context('spawn'),
+        initializer=setup_worker,
+        initargs=(settings.DATABASES,)
+    )
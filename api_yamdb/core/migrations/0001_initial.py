@@ -0,0 +1,27 @@
+# Generated by Django 3.2 on 2026-10-18 03:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CsvFile',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255, unique=True, verbose_name='Файл')),
+                ('sha256', models.CharField(max_length=64, verbose_name='Хеш содержимого')),
+                ('loaded_at', models.DateTimeField(auto_now=True, verbose_name='Дата загрузки')),
+            ],
+            options={
+                'verbose_name': 'Загруженный csv-файл',
+                'verbose_name_plural': 'Загруженные csv-файлы',
+            },
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 3.2 on 2026-10-18 03:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='csvfile',
+            name='offset',
+            field=models.PositiveBigIntegerField(default=0, verbose_name='Смещение в байтах после записанных строк'),
+        ),
+        migrations.AddField(
+            model_name='csvfile',
+            name='rows',
+            field=models.PositiveBigIntegerField(default=0, verbose_name='Записано строк'),
+        ),
+        migrations.AddField(
+            model_name='csvfile',
+            name='finished',
+            field=models.BooleanField(default=True, verbose_name='Загружен полностью'),
+        ),
+        migrations.AlterField(
+            model_name='csvfile',
+            name='finished',
+            field=models.BooleanField(default=False, verbose_name='Загружен полностью'),
+        ),
+    ]
@@ -0,0 +1,136 @@
+from django.core.mail import EmailMessage
+from django.db import models
+from django.utils import timezone
+
+
+class CatalogVersion(models.Model):
+    """
+    Версия каталога произведений - время последнего изменения
+    в наносекундах. Хранится в БД, чтобы изменения из любого процесса,
+    в том числе из команд управления, видели все процессы сервера.
+    """
+
+    version = models.BigIntegerField(
+        verbose_name='Версия',
+        default=0
+    )
+
+    class Meta:
+        verbose_name = 'Версия каталога'
+        verbose_name_plural = 'Версии каталога'
+
+    def __str__(self):
+        return str(self.version)
+
+
+class CsvFile(models.Model):
+    """
+    Состояние загрузки csv-файла командой csv_upload: хеш содержимого
+    и контрольная точка последней записанной пачки.
+    """
+
+    name = models.CharField(
+        verbose_name='Файл',
+        max_length=255,
+        unique=True
+    )
+    sha256 = models.CharField(
+        verbose_name='Хеш содержимого',
+        max_length=64
+    )
+    offset = models.PositiveBigIntegerField(
+        verbose_name='Смещение в байтах после записанных строк',
+        default=0
+    )
+    rows = models.PositiveBigIntegerField(
+        verbose_name='Записано строк',
+        default=0
+    )
+    finished = models.BooleanField(
+        verbose_name='Загружен полностью',
+        default=False
+    )
+    loaded_at = models.DateTimeField(
+        verbose_name='Дата загрузки',
+        auto_now=True
+    )
+
+    class Meta:
+        verbose_name = 'Загруженный csv-файл'
+        verbose_name_plural = 'Загруженные csv-файлы'
+
+    def __str__(self):
+        return self.name
+
+
+class OutboxEmail(models.Model):
+    """
+    Письмо в очереди на отправку: запрос только записывает его,
+    а отправляют пачками core.outbox.send_outbox и команда send_outbox.
+    """
+
+    subject = models.CharField(
+        verbose_name='Тема',
+        max_length=255
+    )
+    body = models.TextField(
+        verbose_name='Текст'
+    )
+    from_email = models.CharField(
+        verbose_name='Отправитель',
+        max_length=254
+    )
+    to = models.EmailField(
+        verbose_name='Получатель',
+        max_length=254
+    )
+    created_at = models.DateTimeField(
+        verbose_name='Дата создания',
+        auto_now_add=True
+    )
+    next_attempt_at = models.DateTimeField(
+        verbose_name='Время следующей попытки',
+        default=timezone.now
+    )
+    attempts = models.PositiveSmallIntegerField(
+        verbose_name='Неудачных попыток',
+        default=0
+    )
+    last_error = models.TextField(
+        verbose_name='Последняя ошибка',
+        blank=True
+    )
+    claim = models.UUIDField(
+        verbose_name='Метка отправляющего обработчика',
+        null=True,
+        editable=False
+    )
+    sent_at = models.DateTimeField(
+        verbose_name='Дата отправки',
+        null=True,
+        blank=True
+    )
+
+    class Meta:
+        ordering = ('next_attempt_at', 'id')
+        indexes = (
+            models.Index(
+                fields=('sent_at', 'next_attempt_at'),
+                name='outbox_pending_idx'
+            ),
+            models.Index(fields=('claim',), name='outbox_claim_idx'),
+        )
+        verbose_name = 'Письмо в очереди'
+        verbose_name_plural = 'Письма в очереди'
+
+    def __str__(self):
+        return f'{self.to}: {self.subject}'
+
+    def message(self, connection=None):
+        return EmailMessage(
+            self.subject,
+            self.body,
+            self.from_email,
+            [self.to],
+            connection=connection
+        )
@@ -0,0 +1,182 @@
+"""
+Очередь исходящих писем. queue_mail записывает письма в OutboxEmail
+и возвращается сразу; send_outbox забирает их пачками и отправляет
+через одно соединение с почтовым бэкендом, откладывая неудачные
+попытки с экспоненциальной задержкой. У отправленных писем и писем,
+исчерпавших попытки, текст с кодом подтверждения стирается, а сами
+они удаляются через EMAIL_OUTBOX_KEEP_DONE секунд.
+
+Способ доставки задаётся EMAIL_OUTBOX_DELIVERY:
+    'thread'  - фоновый поток процесса, будится после фиксации записи;
+    'command' - отдельный процесс manage.py send_outbox --loop;
+    'inline'  - в том же запросе после фиксации транзакции (тесты).
+"""
+import logging
+import threading
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import get_connection
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+
+from .models import OutboxEmail
+
+logger = logging.getLogger(__name__)
+
+_worker = None
+_worker_lock = threading.Lock()
+
+
+def queue_mail(subject, message, from_email, recipient_list):
+    """Ставит письмо в очередь, по строке на каждого получателя."""
+    emails = OutboxEmail.objects.bulk_create(
+        OutboxEmail(
+            subject=subject, body=message, from_email=from_email, to=to
+        )
+        for to in recipient_list
+    )
+    delivery = settings.EMAIL_OUTBOX_DELIVERY
+    if delivery == 'thread':
+        transaction.on_commit(wake_worker)
+    elif delivery == 'inline':
+        transaction.on_commit(send_outbox)
+    return emails
+
+
+def claim_batch(batch_size):
+    """
+    Помечает одним UPDATE до batch_size писем, срок попытки которых
+    наступил, и возвращает их. Метка и сдвиг next_attempt_at на
+    EMAIL_OUTBOX_LEASE секунд не дают другим обработчикам взять
+    те же письма, пока эта попытка не завершится.
+    """
+    now = timezone.now()
+    claim = uuid.uuid4()
+    pending = OutboxEmail.objects.filter(
+        sent_at__isnull=True,
+        next_attempt_at__lte=now,
+        attempts__lt=settings.EMAIL_OUTBOX_MAX_ATTEMPTS
+    ).values('pk')[:batch_size]
+    OutboxEmail.objects.filter(pk__in=pending).update(
+        claim=claim,
+        next_attempt_at=now + timedelta(
+            seconds=settings.EMAIL_OUTBOX_LEASE
+        )
+    )
+    return list(OutboxEmail.objects.filter(claim=claim))
+
+
+def deliver(emails):
+    """
+    Отправляет письма через одно соединение и возвращает
+    отправленные и словарь неотправленных с текстом ошибки.
+    """
+    sent, failed = [], {}
+    connection = get_connection(fail_silently=False)
+    try:
+        connection.open()
+    except Exception as error:
+        return sent, {email: repr(error) for email in emails}
+    try:
+        for email in emails:
+            try:
+                connection.send_messages([email.message(connection)])
+            except Exception as error:
+                failed[email] = repr(error)
+            else:
+                sent.append(email)
+    finally:
+        connection.close()
+    return sent, failed
+
+
+def schedule_retries(failed):
+    now = timezone.now()
+    for email, error in failed.items():
+        email.attempts += 1
+        email.last_error = error
+        email.claim = None
+        email.next_attempt_at = now + timedelta(
+            seconds=settings.EMAIL_OUTBOX_RETRY_DELAY
+            * 2 ** (email.attempts - 1)
+        )
+        if email.attempts >= settings.EMAIL_OUTBOX_MAX_ATTEMPTS:
+            logger.error('Письмо %s не отправлено: %s', email.pk, error)
+            email.body = ''
+    OutboxEmail.objects.bulk_update(
+        failed,
+        ('attempts', 'last_error', 'claim', 'next_attempt_at', 'body')
+    )
+
+
+def prune_done():
+    """
+    Удаляет письма, отправленные больше EMAIL_OUTBOX_KEEP_DONE секунд
+    назад, и письма, последняя попытка которых исчерпала лимит
+    и была раньше этого срока.
+    """
+    cutoff = timezone.now() - timedelta(
+        seconds=settings.EMAIL_OUTBOX_KEEP_DONE
+    )
+    OutboxEmail.objects.filter(sent_at__lt=cutoff).delete()
+    OutboxEmail.objects.filter(
+        sent_at__isnull=True,
+        attempts__gte=settings.EMAIL_OUTBOX_MAX_ATTEMPTS,
+        next_attempt_at__lt=cutoff
+    ).delete()
+
+
+def send_outbox(batch_size=None):
+    """
+    Отправляет все письма, срок попытки которых наступил, пачками
+    по batch_size, и удаляет давно отправленные. Возвращает число
+    отправленных и неотправленных.
+    """
+    batch_size = batch_size or settings.EMAIL_OUTBOX_BATCH_SIZE
+    total_sent = total_failed = 0
+    while True:
+        emails = claim_batch(batch_size)
+        if not emails:
+            prune_done()
+            return total_sent, total_failed
+        sent, failed = deliver(emails)
+        OutboxEmail.objects.filter(pk__in=[
+            email.pk for email in sent
+        ]).update(sent_at=timezone.now(), claim=None, body='')
+        schedule_retries(failed)
+        total_sent += len(sent)
+        total_failed += len(failed)
+
+
+class OutboxWorker(threading.Thread):
+    """
+    Фоновый поток, который отправляет очередь, когда его будят,
+    и не реже раза в EMAIL_OUTBOX_POLL_INTERVAL секунд для повторов.
+    """
+
+    def __init__(self):
+        super().__init__(name='mail-outbox', daemon=True)
+        self.wakeup = threading.Event()
+
+    def run(self):
+        while True:
+            self.wakeup.wait(settings.EMAIL_OUTBOX_POLL_INTERVAL)
+            self.wakeup.clear()
+            try:
+                send_outbox()
+            except Exception:
+                logger.exception('Ошибка отправки очереди писем')
+            finally:
+                close_old_connections()
+
+
+def wake_worker():
+    """Запускает фоновый поток при первом вызове и будит его."""
+    global _worker
+    with _worker_lock:
+        if _worker is None or not _worker.is_alive():
+            _worker = OutboxWorker()
+            _worker.start()
+    _worker.wakeup.set()
@@ -5,7 +5,10 @@ from .models import Title, Genre, Category, Review, Comment
 
 @admin.register(Title)
 class TitleAdmin(admin.ModelAdmin):
-    list_display = ('pk', 'name', 'year', 'description', 'category')
+    list_display = (
+        'pk', 'name', 'year', 'description', 'category', 'rating'
+    )
+    readonly_fields = ('score_sum', 'score_count', 'rating')
     search_fields = ('name', 'year')
     list_filter = ('name',)
 
@@ -0,0 +1,44 @@
+# Generated by Django 3.2 on 2026-10-18 02:59
+
+from django.db import migrations, models
+from django.db.models import Avg, Count, Sum
+
+
+def fill_title_scores(apps, schema_editor):
+    Title = apps.get_model('reviews', 'Title')
+    for title in Title.objects.annotate(
+        reviews_sum=Sum('reviews__score'),
+        reviews_count=Count('reviews'),
+        reviews_avg=Avg('reviews__score')
+    ).filter(reviews_count__gt=0).iterator():
+        Title.objects.filter(pk=title.pk).update(
+            score_sum=title.reviews_sum,
+            score_count=title.reviews_count,
+            rating=int(title.reviews_avg)
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0002_alter_title_year'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='title',
+            name='rating',
+            field=models.PositiveSmallIntegerField(editable=False, null=True, verbose_name='Рейтинг'),
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='score_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Количество оценок'),
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='score_sum',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Сумма оценок'),
+        ),
+        migrations.RunPython(fill_title_scores, migrations.RunPython.noop),
+    ]
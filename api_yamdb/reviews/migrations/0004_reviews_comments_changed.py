@@ -0,0 +1,24 @@
+# Generated by Django 3.2 on 2026-10-18 03:04
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0003_title_rating'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='review',
+            name='comments_changed',
+            field=models.DateTimeField(default=django.utils.timezone.now, editable=False, verbose_name='Последнее изменение комментариев'),
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='reviews_changed',
+            field=models.DateTimeField(default=django.utils.timezone.now, editable=False, verbose_name='Последнее изменение отзывов'),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 3.2 on 2026-10-18 04:11
+
+from django.db import migrations, models
+
+# Фильтр по жанру читает связи по genre_id: с title_id в том же индексе
+# таблица связей не читается. У автоматической модели связи нет Meta.
+GENRE_TITLE_INDEX_SQL = (
+    'CREATE INDEX title_genre_genre_title_idx '
+    'ON reviews_title_genre (genre_id, title_id)'
+)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0008_pub_date_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='title',
+            index=models.Index(fields=['year'], name='title_year_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='title',
+            index=models.Index(fields=['category', '-rating', 'id'], name='title_category_rating_idx'),
+        ),
+        migrations.RunSQL(
+            GENRE_TITLE_INDEX_SQL,
+            'DROP INDEX title_genre_genre_title_idx'
+        ),
+    ]
@@ -1,5 +1,6 @@
-from django.db import models
+from django.db import models, transaction
 from django.core.validators import MaxValueValidator, MinValueValidator
+from django.utils import timezone
 
 from .constants import (
     MAX_LENGTH_NAME,
@@ -12,6 +13,28 @@ from users.models import User
 from .validators import validate_for_year
 
 
+class DenormalizedModel(models.Model):
+    """
+    Базовый класс для моделей со счётчиками, которые сигналы
+    обновляют отдельным UPDATE. При сохранении существующего объекта
+    эти поля не перезаписываются устаревшими значениями из памяти.
+    """
+
+    DENORMALIZED_FIELDS = ()
+
+    class Meta:
+        abstract = True
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding and kwargs.get('update_fields') is None:
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key
+                and field.name not in self.DENORMALIZED_FIELDS
+            ]
+        super().save(*args, **kwargs)
+
+
 class CategoryGenreModel(models.Model):
     """Базовый класс для моделей Categories и Genres."""
 
@@ -56,9 +79,13 @@ class Category(CategoryGenreModel):
         verbose_name_plural = 'Категории'
 
 
-class Title(models.Model):
+class Title(DenormalizedModel):
     """Модель произведений."""
 
+    DENORMALIZED_FIELDS = (
+        'score_sum', 'score_count', 'rating', 'reviews_changed'
+    )
+
     name = models.TextField(
         verbose_name='Название произведения',
         max_length=MAX_LENGTH_SLUG,
@@ -86,15 +113,76 @@ class Title(models.Model):
         blank=False,
         verbose_name='Жанр'
     )
+    score_sum = models.PositiveIntegerField(
+        verbose_name='Сумма оценок',
+        default=0,
+        editable=False
+    )
+    score_count = models.PositiveIntegerField(
+        verbose_name='Количество оценок',
+        default=0,
+        editable=False
+    )
+    rating = models.PositiveSmallIntegerField(
+        verbose_name='Рейтинг',
+        null=True,
+        editable=False
+    )
+    reviews_changed = models.DateTimeField(
+        verbose_name='Последнее изменение отзывов',
+        default=timezone.now,
+        editable=False
+    )
 
     class Meta:
         verbose_name = 'Произведение'
         verbose_name_plural = 'Произведения'
+        indexes = [
+            models.Index(fields=['year'], name='title_year_idx'),
+            models.Index(
+                fields=['category', '-rating', 'id'],
+                name='title_category_rating_idx'
+            )
+        ]
 
     def __str__(self):
         return f'Название - {self.name}'
 
 
+class ScoreCount(models.Model):
+    """
+    Количество отзывов с данной оценкой на произведение.
+    Строки поддерживаются сигналами (см. reviews.signals), поэтому
+    распределение оценок читается не больше чем из MAX_SCORE строк.
+    """
+
+    title = models.ForeignKey(
+        Title,
+        on_delete=models.CASCADE,
+        related_name='score_counts',
+        verbose_name='Произведение',
+    )
+    score = models.PositiveSmallIntegerField(
+        verbose_name='Оценка'
+    )
+    count = models.PositiveIntegerField(
+        verbose_name='Количество отзывов',
+        default=0
+    )
+
+    class Meta:
+        verbose_name = 'Количество оценок'
+        verbose_name_plural = 'Распределение оценок'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['title', 'score'], name='title_score_count'
+            )
+        ]
+
+    def __str__(self):
+        return f'{self.title_id}: {self.score} - {self.count}'
+
+
 class ReviewCommentModel(models.Model):
     """Базовый класс для моделей Review и Comment."""
 
@@ -115,13 +203,23 @@ class ReviewCommentModel(models.Model):
         abstract = True
         ordering = ['-pub_date']
 
+    def save(self, *args, **kwargs):
+        """
+        Сохраняет объект и обновляет счётчики родителя
+        в одной транзакции (см. reviews.signals).
+        """
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
 
-class Review(ReviewCommentModel):
+class Review(DenormalizedModel, ReviewCommentModel):
     """
     Модель отзывов.
     Отзыв привязан к определённому произведению.
     """
 
+    DENORMALIZED_FIELDS = ('comments_count', 'comments_changed')
+
     title = models.ForeignKey(
         Title,
         on_delete=models.CASCADE,
@@ -135,6 +233,16 @@ class Review(ReviewCommentModel):
             MaxValueValidator(MAX_SCORE)
         ]
     )
+    comments_count = models.PositiveIntegerField(
+        verbose_name='Количество комментариев',
+        default=0,
+        editable=False
+    )
+    comments_changed = models.DateTimeField(
+        verbose_name='Последнее изменение комментариев',
+        default=timezone.now,
+        editable=False
+    )
 
     class Meta(ReviewCommentModel.Meta):
         default_related_name = 'reviews'
@@ -145,10 +253,24 @@ class Review(ReviewCommentModel):
                 fields=['author', 'title'], name='author_title_connection'
             )
         ]
+        indexes = [
+            models.Index(
+                fields=['title', 'pub_date', 'id'],
+                name='review_title_pub_date_idx'
+            )
+        ]
 
     def __str__(self):
         return self.text[:MAX_LENGTH_TEXT]
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Запоминает загруженные из БД произведение и оценку."""
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_title_id = instance.__dict__.get('title_id')
+        instance._loaded_score = instance.__dict__.get('score')
+        return instance
+
 
 class Comment(ReviewCommentModel):
     """
@@ -166,6 +288,12 @@ class Comment(ReviewCommentModel):
     class Meta(ReviewCommentModel.Meta):
         verbose_name = 'Комментарий'
         verbose_name_plural = 'Комментарии'
+        indexes = [
+            models.Index(
+                fields=['review', 'pub_date', 'id'],
+                name='comment_review_pub_date_idx'
+            )
+        ]
 
     def __str__(self):
         self.text[:MAX_LENGTH_TEXT]
@@ -0,0 +1,63 @@
+import re
+
+from django.db import connections
+from django.db.models import Q
+
+SEARCH_TABLE = 'reviews_title_fts'
+NAME_WEIGHT = 10.0
+DESCRIPTION_WEIGHT = 1.0
+TOKEN_PATTERN = re.compile(r'\w+')
+
+
+def build_match_query(text):
+    """
+    Превращает пользовательский ввод в безопасный запрос FTS5:
+    каждое слово ищется по префиксу, все слова обязательны.
+    """
+    return ' '.join(
+        f'"{token}"*' for token in TOKEN_PATTERN.findall(text)
+    )
+
+
+def search_titles(queryset, text):
+    """
+    Отбирает произведения по полнотекстовому индексу названия и описания
+    и сортирует их по релевантности (bm25, название весомее описания).
+    Индекс присоединяется к таблице произведений, а не подзапросом
+    на каждую строку: подзапрос заново выполнял бы MATCH по префиксу
+    для каждого найденного произведения. Унарный плюс у rowid не даёт
+    SQLite сделать индекс внутренним циклом с тем же повторным MATCH.
+    Без SQLite поиск сводится к icontains по каждому слову.
+    """
+    match = build_match_query(text)
+    if not match:
+        return queryset.none()
+    if connections[queryset.db].vendor != 'sqlite':
+        for token in TOKEN_PATTERN.findall(text):
+            queryset = queryset.filter(
+                Q(name__icontains=token) | Q(description__icontains=token)
+            )
+        return queryset
+    table = queryset.model._meta.db_table
+    return queryset.extra(
+        select={'search_rank': (
+            f'bm25({SEARCH_TABLE}, {NAME_WEIGHT}, {DESCRIPTION_WEIGHT})'
+        )},
+        tables=[SEARCH_TABLE],
+        where=[
+            f'{table}.id = +{SEARCH_TABLE}.rowid',
+            f'{SEARCH_TABLE} MATCH %s',
+        ],
+        params=[match]
+    ).order_by('search_rank', 'id')
+
+
+def rebuild_search_index(using='default'):
+    """Перестраивает полнотекстовый индекс по таблице произведений."""
+    connection = connections[using]
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}) VALUES ('rebuild')"
+        )
@@ -0,0 +1,202 @@
+from django.db import connection, models, transaction
+from django.db.models import (
+    Case,
+    Count,
+    F,
+    OuterRef,
+    Subquery,
+    Sum,
+    Value,
+    When
+)
+from django.db.models.functions import Coalesce
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .models import Comment, Review, ScoreCount, Title
+
+
+def change_title_score(title_id, score_delta, count_delta):
+    """
+    Инкрементально меняет сумму и количество оценок произведения
+    и пересчитывает рейтинг одним UPDATE без агрегации по отзывам.
+    Заодно отмечает время последнего изменения отзывов.
+    """
+    new_sum = F('score_sum') + score_delta
+    new_count = F('score_count') + count_delta
+    Title.objects.filter(pk=title_id).update(
+        score_sum=new_sum,
+        score_count=new_count,
+        rating=Case(
+            When(score_count__lte=-count_delta, then=Value(None)),
+            default=new_sum / new_count,
+            output_field=models.PositiveSmallIntegerField()
+        ),
+        reviews_changed=timezone.now()
+    )
+
+
+def change_score_count(title_id, score, delta):
+    """
+    Меняет количество отзывов с оценкой score у произведения.
+    Прибавление выполняется одним INSERT ... ON CONFLICT, чтобы
+    не читать строку счётчика и не гоняться за её созданием.
+    """
+    if delta < 0:
+        ScoreCount.objects.filter(title_id=title_id, score=score).update(
+            count=F('count') + delta
+        )
+        return
+    quote_name = connection.ops.quote_name
+    meta = ScoreCount._meta
+    title, score_column, count = (
+        quote_name(meta.get_field(field).column)
+        for field in ('title', 'score', 'count')
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'INSERT INTO {quote_name(meta.db_table)} '
+            f'({title}, {score_column}, {count}) VALUES (%s, %s, %s) '
+            f'ON CONFLICT ({title}, {score_column}) '
+            f'DO UPDATE SET {count} = {count} + excluded.{count}',
+            [title_id, score, delta]
+        )
+
+
+def recalculate_score_counts(titles=None):
+    """
+    Перестраивает распределение оценок произведений
+    по таблице отзывов.
+    """
+    titles = Title.objects.all() if titles is None else titles
+    with transaction.atomic():
+        ScoreCount.objects.filter(title__in=titles).delete()
+        ScoreCount.objects.bulk_create(
+            ScoreCount(
+                title_id=row['title'], score=row['score'], count=row['count']
+            )
+            for row in Review.objects.filter(title__in=titles).order_by(
+            ).values('title', 'score').annotate(count=Count('pk')).iterator()
+        )
+
+
+def recalculate_title_scores(titles=None):
+    """
+    Полностью пересчитывает сумму, количество оценок и рейтинг
+    по таблице отзывов одним UPDATE, а также распределение оценок.
+    Нужен после массовой загрузки данных.
+    """
+    titles = Title.objects.all() if titles is None else titles
+    reviews = Review.objects.filter(
+        title=OuterRef('pk')
+    ).order_by().values('title')
+    score_sum = Subquery(
+        reviews.annotate(total=Sum('score')).values('total'),
+        output_field=models.IntegerField()
+    )
+    score_count = Subquery(
+        reviews.annotate(total=Count('pk')).values('total'),
+        output_field=models.IntegerField()
+    )
+    titles.update(
+        score_sum=Coalesce(score_sum, 0),
+        score_count=Coalesce(score_count, 0),
+        rating=score_sum / score_count,
+        reviews_changed=timezone.now()
+    )
+    recalculate_score_counts(titles)
+
+
+@receiver(post_save, sender=Review)
+def review_saved(sender, instance, created, raw, **kwargs):
+    """Учитывает оценку нового или изменённого отзыва в рейтинге."""
+    if raw:
+        return
+    if created:
+        change_title_score(instance.title_id, instance.score, 1)
+        change_score_count(instance.title_id, instance.score, 1)
+    elif getattr(instance, '_loaded_score', None) is None:
+        recalculate_title_scores(Title.objects.filter(pk=instance.title_id))
+    elif instance._loaded_title_id != instance.title_id:
+        change_title_score(
+            instance._loaded_title_id, -instance._loaded_score, -1
+        )
+        change_title_score(instance.title_id, instance.score, 1)
+        change_score_count(
+            instance._loaded_title_id, instance._loaded_score, -1
+        )
+        change_score_count(instance.title_id, instance.score, 1)
+    else:
+        change_title_score(
+            instance.title_id, instance.score - instance._loaded_score, 0
+        )
+        if instance._loaded_score != instance.score:
+            change_score_count(instance.title_id, instance._loaded_score, -1)
+            change_score_count(instance.title_id, instance.score, 1)
+    instance._loaded_title_id = instance.title_id
+    instance._loaded_score = instance.score
+
+
+@receiver(post_delete, sender=Review)
+def review_deleted(sender, instance, **kwargs):
+    """
+    Убирает оценку удалённого отзыва из рейтинга.
+    Срабатывает и при каскадном удалении автора или произведения.
+    """
+    change_title_score(instance.title_id, -instance.score, -1)
+    change_score_count(instance.title_id, instance.score, -1)
+
+
+def change_comments_count(review_id, delta):
+    """
+    Меняет количество комментариев к отзыву и отмечает время
+    последнего изменения комментариев одним UPDATE. Отзывы отдаются
+    вместе с comments_count, поэтому отмечается и изменение отзывов
+    произведения.
+    """
+    now = timezone.now()
+    Review.objects.filter(pk=review_id).update(
+        comments_count=F('comments_count') + delta,
+        comments_changed=now
+    )
+    Title.objects.filter(reviews=review_id).update(reviews_changed=now)
+
+
+def recalculate_comment_counts(reviews=None):
+    """
+    Полностью пересчитывает количество комментариев к отзывам
+    одним UPDATE. Нужен после массовой загрузки данных.
+    """
+    reviews = Review.objects.all() if reviews is None else reviews
+    comments_count = Subquery(
+        Comment.objects.filter(
+            review=OuterRef('pk')
+        ).order_by().values('review').annotate(
+            total=Count('pk')
+        ).values('total'),
+        output_field=models.IntegerField()
+    )
+    now = timezone.now()
+    reviews.update(
+        comments_count=Coalesce(comments_count, 0),
+        comments_changed=now
+    )
+    Title.objects.filter(reviews__in=reviews).update(reviews_changed=now)
+
+
+@receiver(post_save, sender=Comment)
+def comment_saved(sender, instance, created, raw, **kwargs):
+    """Учитывает новый или изменённый комментарий в счётчике отзыва."""
+    if raw:
+        return
+    change_comments_count(instance.review_id, 1 if created else 0)
+
+
+@receiver(post_delete, sender=Comment)
+def comment_deleted(sender, instance, **kwargs):
+    """
+    Убирает удалённый комментарий из счётчика отзыва.
+    Срабатывает и при каскадном удалении автора или отзыва.
+    """
+    change_comments_count(instance.review_id, -1)
@@ -0,0 +1,17 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .authentication import invalidate_user_cache
+from .models import User
+
+
+@receiver((post_save, post_delete), sender=User)
+def user_changed(instance, **kwargs):
+    """
+    Сбрасывает закэшированный снимок пользователя после фиксации
+    транзакции, чтобы смена роли или удаление действовали сразу.
+    id запоминается сразу: к фиксации у удалённого объекта pk уже None.
+    """
+    user_id = instance.pk
+    transaction.on_commit(lambda: invalidate_user_cache(user_id))
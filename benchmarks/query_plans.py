@@ -0,0 +1,172 @@
+"""
+Планы запросов (EXPLAIN QUERY PLAN) и время ответа эндпоинтов /api/v1/
+до и после миграций с составными индексами на заполненной БД.
+
+Запуск из корня репозитория:
+    python benchmarks/query_plans.py [--titles 20000] [--reviews 1000000]
+        [--db /tmp/yamdb.sqlite3]
+
+С --db заполненная база переиспользуется между запусками.
+"""
+import argparse
+
+from utils import measure, setup_django
+
+# Последняя миграция reviews без составных индексов.
+BEFORE_MIGRATION = '0007_review_comments_count'
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--titles', type=int, default=20000)
+    parser.add_argument('--reviews', type=int, default=1000000)
+    parser.add_argument('--comments', type=int, default=200000)
+    parser.add_argument('--users', type=int, default=5000)
+    parser.add_argument('--db', default=None)
+    parser.add_argument(
+        '--plans',
+        action='store_true',
+        help='Печатать планы всех запросов, а не только изменившиеся.'
+    )
+    return parser.parse_args()
+
+
+def seed(args):
+    from django.core.management import call_command
+
+    from reviews.models import Title
+
+    if Title.objects.exists():
+        return
+    call_command(
+        'generate_data',
+        users=args.users,
+        titles=args.titles,
+        reviews=args.reviews,
+        comments=args.comments
+    )
+
+
+def endpoints():
+    """Адреса эндпоинтов на самых нагруженных объектах выборки."""
+    from django.db.models import Count
+
+    from reviews.models import Category, Genre, Review, Title
+
+    title = Title.objects.order_by('-score_count').first()
+    review = Review.objects.order_by('-comments_count').first()
+    category = Category.objects.order_by('id').first()
+    genre = Genre.objects.order_by('id').first()
+    year = Title.objects.values('year').annotate(
+        total=Count('pk')
+    ).order_by('-total')[0]['year']
+    reviews = f'/api/v1/titles/{title.pk}/reviews/'
+    comments = (
+        f'/api/v1/titles/{review.title_id}/reviews/{review.pk}/comments/'
+    )
+    deep_offset = max(title.score_count - 10, 0)
+    return [
+        ('titles', '/api/v1/titles/'),
+        ('titles?category', f'/api/v1/titles/?category={category.slug}'),
+        ('titles?genre', f'/api/v1/titles/?genre={genre.slug}'),
+        ('titles?year', f'/api/v1/titles/?year={year}'),
+        ('titles?name', f'/api/v1/titles/?name={title.name}'),
+        ('titles?search', '/api/v1/titles/?search=произведение'),
+        ('titles?cursor', '/api/v1/titles/?cursor=&limit=10'),
+        ('title', f'/api/v1/titles/{title.pk}/'),
+        ('score-distribution',
+         f'/api/v1/titles/{title.pk}/score-distribution/'),
+        ('reviews', reviews),
+        ('reviews?offset', f'{reviews}?offset={deep_offset}'),
+        ('reviews?cursor', f'{reviews}?cursor=&limit=10'),
+        ('review', comments[:-len('comments/')]),
+        ('comments', comments),
+        ('comments?cursor', f'{comments}?cursor=&limit=10'),
+        ('categories', '/api/v1/categories/'),
+        ('genres', '/api/v1/genres/'),
+        ('users', '/api/v1/users/'),
+    ]
+
+
+def profile(client, url):
+    """
+    Возвращает планы запросов ответа на GET url, время ответа
+    и время выполнения одних этих запросов в БД.
+    """
+    from django.core.cache import cache
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    def get():
+        cache.clear()
+        response = client.get(url)
+        assert response.status_code == 200, (url, response.status_code)
+
+    with CaptureQueriesContext(connection) as queries:
+        get()
+    selects = [
+        query['sql'] for query in queries.captured_queries
+        if query['sql'].startswith('SELECT')
+    ]
+
+    def execute():
+        with connection.cursor() as cursor:
+            for sql in selects:
+                cursor.execute(sql)
+                cursor.fetchall()
+
+    plans = []
+    with connection.cursor() as cursor:
+        for sql in selects:
+            cursor.execute('EXPLAIN QUERY PLAN ' + sql)
+            plans.append(tuple(row[-1] for row in cursor.fetchall()))
+    return plans, measure(get), measure(execute)
+
+
+def run(client, urls, migration):
+    from django.core.management import call_command
+
+    call_command('migrate', 'reviews', migration, verbosity=0)
+    return {name: profile(client, url) for name, url in urls}
+
+
+def main():
+    args = parse_args()
+    setup_django(args.db)
+    seed(args)
+
+    from django.db.migrations.loader import MigrationLoader
+    from django.db import connection
+    from rest_framework.test import APIClient
+
+    from users.models import User, UserRole
+
+    client = APIClient()
+    client.force_authenticate(
+        User.objects.filter(role=UserRole.ADMIN).first()
+    )
+    latest = MigrationLoader(connection).graph.leaf_nodes('reviews')[0][1]
+    urls = endpoints()
+    before = run(client, urls, BEFORE_MIGRATION)
+    after = run(client, urls, latest)
+
+    print(f'{"endpoint":<20} {"request ms":>21} {"sql ms":>21}')
+    print(f'{"":<20} {"before":>10} {"after":>10} {"before":>10} '
+          f'{"after":>10}')
+    for name, _ in urls:
+        (old_plans, *old_times), (new_plans, *new_times) = (
+            before[name], after[name]
+        )
+        print(f'{name:<20} ' + ' '.join(
+            f'{old * 1000:>10.2f} {new * 1000:>10.2f}'
+            for old, new in zip(old_times, new_times)
+        ))
+        for old, new in zip(old_plans, new_plans):
+            if old == new and not args.plans:
+                continue
+            for label, plan in (('before', old), ('after', new)):
+                print(f'    {label}: ' + '; '.join(plan))
+
+
+if __name__ == '__main__':
+    main()
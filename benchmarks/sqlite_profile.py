@@ -0,0 +1,180 @@
+"""
+Нагрузочный тест SQLite: параллельные чтения и записи через API
+в профиле по умолчанию и в продакшен-профиле (SQLITE_PROFILE=production).
+
+Запуск из корня репозитория:
+    python benchmarks/sqlite_profile.py [--readers 8] [--writers 2]
+        [--seconds 10]
+
+Каждый профиль запускается в отдельном процессе на копии одной
+заполненной базы. Запросы проходят через WSGIHandler, поэтому
+соединения открываются и закрываются так же, как под WSGI-сервером.
+Читатели запрашивают отзывы и комментарии, писатели добавляют
+комментарии; печатаются запросы в секунду, p99 и число ошибок.
+"""
+import argparse
+import json
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from utils import setup_django
+
+PROFILES = ('default', 'production')
+SAMPLE_SIZE = 1000
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--readers', type=int, default=8)
+    parser.add_argument('--writers', type=int, default=2)
+    parser.add_argument('--seconds', type=float, default=10)
+    parser.add_argument('--titles', type=int, default=1000)
+    parser.add_argument('--reviews', type=int, default=50000)
+    parser.add_argument('--run', default=None, help=argparse.SUPPRESS)
+    return parser.parse_args()
+
+
+def seed(args, db_path):
+    setup_django(db_path)
+
+    from django.core.management import call_command
+    from django.db import connection
+
+    call_command(
+        'generate_data',
+        users=200,
+        titles=args.titles,
+        reviews=args.reviews,
+        comments=args.reviews // 5,
+        verbosity=0
+    )
+    connection.close()
+
+
+def percentile(values, share):
+    if not values:
+        return 0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * share))]
+
+
+def run_load(args):
+    """Выполняется в дочернем процессе с профилем из окружения."""
+    setup_django(args.run)
+
+    from django.core.handlers.wsgi import WSGIHandler
+    from django.db import connections
+    from django.test import RequestFactory
+    from rest_framework_simplejwt.tokens import AccessToken
+
+    from reviews.models import Review
+    from users.models import User
+
+    handler = WSGIHandler()
+    factory = RequestFactory()
+    reviews = list(Review.objects.order_by('?').values_list(
+        'title_id', 'pk'
+    )[:SAMPLE_SIZE])
+    tokens = [
+        str(AccessToken.for_user(user))
+        for user in User.objects.order_by('?')[:args.writers]
+    ]
+    connections.close_all()
+    deadline = time.perf_counter() + args.seconds
+
+    def call(request):
+        status = []
+        response = handler(
+            request.environ, lambda code, headers: status.append(code)
+        )
+        response.close()
+        return status[0].startswith('2')
+
+    def worker(make_request, seed):
+        rng = random.Random(seed)
+        latencies, errors = [], 0
+        while time.perf_counter() < deadline:
+            title_id, review_id = rng.choice(reviews)
+            url = (
+                f'/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+            )
+            started = time.perf_counter()
+            if call(make_request(rng, url)):
+                latencies.append(time.perf_counter() - started)
+            else:
+                errors += 1
+        connections.close_all()
+        return latencies, errors
+
+    def read(rng, url):
+        if rng.random() < 0.5:
+            url = url.rsplit('/', 3)[0] + '/'
+        return factory.get(url)
+
+    def write(token):
+        return lambda rng, url: factory.post(
+            url,
+            data=json.dumps({'text': 'Нагрузочный комментарий'}),
+            content_type='application/json',
+            HTTP_AUTHORIZATION=f'Bearer {token}'
+        )
+
+    with ThreadPoolExecutor(args.readers + args.writers) as pool:
+        readers = [
+            pool.submit(worker, read, idx) for idx in range(args.readers)
+        ]
+        writers = [
+            pool.submit(worker, write(token), idx)
+            for idx, token in enumerate(tokens)
+        ]
+    result = {}
+    for name, futures in (('read', readers), ('write', writers)):
+        latencies = sum((future.result()[0] for future in futures), [])
+        result[name] = {
+            'rps': len(latencies) / args.seconds,
+            'p99': percentile(latencies, 0.99) * 1000,
+            'errors': sum(future.result()[1] for future in futures),
+        }
+    print(json.dumps(result))
+
+
+def main():
+    args = parse_args()
+    if args.run:
+        run_load(args)
+        return
+    workdir = tempfile.mkdtemp()
+    template = os.path.join(workdir, 'template.sqlite3')
+    seed(args, template)
+    results = {}
+    for profile in PROFILES:
+        db_path = os.path.join(workdir, f'{profile}.sqlite3')
+        shutil.copy(template, db_path)
+        output = subprocess.run(
+            [sys.executable, __file__, '--run', db_path, *sys.argv[1:]],
+            env={**os.environ, 'SQLITE_PROFILE': profile},
+            check=True,
+            capture_output=True,
+            text=True
+        ).stdout
+        results[profile] = json.loads(output.strip().splitlines()[-1])
+    shutil.rmtree(workdir)
+
+    print(f'{args.readers} читателей, {args.writers} писателей, '
+          f'{args.seconds:g} с')
+    print(f'{"profile":<12} {"kind":<6} {"req/s":>8} {"p99 ms":>8} '
+          f'{"errors":>7}')
+    for profile, result in results.items():
+        for kind, stats in result.items():
+            print(f'{profile:<12} {kind:<6} {stats["rps"]:>8.1f} '
+                  f'{stats["p99"]:>8.1f} {stats["errors"]:>7}')
+
+
+if __name__ == '__main__':
+    main()
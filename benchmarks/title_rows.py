@@ -0,0 +1,57 @@
+"""
+Сравнение TitleReadSerializer и TitleRowsSerializer
+на страницах каталога произведений размером 10, 100 и 1000.
+
+Запуск из корня репозитория:
+    python benchmarks/title_rows.py [--titles 5000]
+"""
+import argparse
+
+from utils import measure, setup_django
+
+PAGE_SIZES = (10, 100, 1000)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--titles', type=int, default=5000)
+    args = parser.parse_args()
+
+    setup_django()
+
+    from django.core.management import call_command
+
+    call_command(
+        'generate_data',
+        titles=args.titles,
+        reviews=args.titles * 5,
+        comments=0,
+        verbosity=0
+    )
+
+    from api.serializers import TitleReadSerializer, TitleRowsSerializer
+    from api.views import TitlesViewSet
+
+    queryset = TitlesViewSet.queryset
+    rows_serializer = TitleRowsSerializer()
+
+    def read_serializer(size):
+        return TitleReadSerializer(queryset.all()[:size], many=True).data
+
+    def rows(size):
+        return rows_serializer.to_representation(
+            rows_serializer.get_queryset(queryset.all())[:size]
+        )
+
+    print(f'{"page":>6} {"serializer rows/s":>18} {"rows rows/s":>12} '
+          f'{"speedup":>8}')
+    for size in PAGE_SIZES:
+        assert rows(size) == read_serializer(size), 'JSON не совпадает'
+        slow = measure(lambda: read_serializer(size))
+        fast = measure(lambda: rows(size))
+        print(f'{size:>6} {size / slow:>18.0f} {size / fast:>12.0f} '
+              f'{slow / fast:>7.1f}x')
+
+
+if __name__ == '__main__':
+    main()
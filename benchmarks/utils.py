@@ -0,0 +1,43 @@
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+PROJECT_DIR = BASE_DIR / 'api_yamdb'
+
+
+def setup_django(db_path=None):
+    """
+    Настраивает Django на отдельную базу SQLite и применяет миграции.
+    Без db_path создаётся временный файл.
+    """
+    if db_path is None:
+        db_path = os.path.join(tempfile.mkdtemp(), 'benchmark.sqlite3')
+    os.environ['SQLITE_PATH'] = str(db_path)
+    os.environ.setdefault('SECRET_KEY', 'benchmark')
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'api_yamdb.settings')
+    sys.path.insert(0, str(PROJECT_DIR))
+    sys.path.insert(0, str(BASE_DIR))
+
+    import django
+    from django.core.management import call_command
+
+    django.setup()
+    call_command('migrate', verbosity=0)
+    return db_path
+
+
+def measure(func, min_time=0.5):
+    """
+    Вызывает func, пока суммарное время не превысит min_time,
+    и возвращает среднее время одного вызова в секундах.
+    """
+    calls, started = 0, time.perf_counter()
+    while True:
+        func()
+        calls += 1
+        elapsed = time.perf_counter() - started
+        if elapsed >= min_time:
+            return elapsed / calls
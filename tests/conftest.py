@@ -1,6 +1,7 @@
 import os
 import sys
 
+import pytest
 from django.utils.version import get_version
 
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -33,3 +34,30 @@ assert get_version() < '4.0.0', 'Пожалуйста, используйте в
 pytest_plugins = [
     'tests.fixtures.fixture_user',
 ]
+
+
+@pytest.fixture(autouse=True)
+def inline_mail_outbox(settings):
+    """Письма из очереди отправляются в том же запросе."""
+    settings.EMAIL_OUTBOX_DELIVERY = 'inline'
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """Кэш и корзины ограничений частоты не переходят между тестами."""
+    from django.core.cache import cache
+
+    cache.clear()
+
+
+@pytest.fixture(scope='session')
+def django_db_modify_db_settings(tmp_path_factory):
+    """
+    Тестовая БД в файле, а не в памяти: её видят потоки и процессы,
+    которые запускают тесты конкурентного доступа.
+    """
+    from django.conf import settings
+
+    settings.DATABASES['default']['TEST']['NAME'] = str(
+        tmp_path_factory.mktemp('db') / 'test.sqlite3'
+    )
@@ -0,0 +1,104 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+@pytest.mark.django_db(transaction=True)
+class Test09TitleCursorPagination:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    def create_catalog(self):
+        from reviews.models import Category, Title
+
+        films = Category.objects.create(name='Фильм', slug='films')
+        books = Category.objects.create(name='Книги', slug='books')
+        for idx, (category, rating) in enumerate((
+            (films, 5), (books, None), (None, 3), (films, 5), (books, 9),
+            (films, None), (None, None), (books, 9), (films, 1), (None, 7),
+            (books, 2)
+        )):
+            Title.objects.create(
+                name=f'title {idx}', year=2000, category=category
+            )
+            Title.objects.filter(name=f'title {idx}').update(rating=rating)
+
+    def collect(self, client, url, link):
+        ids = []
+        while url:
+            response = client.get(url)
+            assert response.status_code == HTTPStatus.OK, (
+                f'Проверьте, что GET-запрос к `{url}` возвращает ответ со '
+                'статусом 200.'
+            )
+            data = response.json()
+            assert 'count' not in data
+            ids.append([title['id'] for title in data['results']])
+            url = data[link]
+        return ids
+
+    def test_01_cursor_walks_whole_catalog(self, client):
+        from django.db.models import F
+
+        from reviews.models import Title
+
+        self.create_catalog()
+        expected = list(Title.objects.order_by(
+            'category_id', F('rating').desc(), 'id'
+        ).values_list('id', flat=True))
+
+        forward = self.collect(
+            client, f'{self.TITLES_URL}?cursor=&limit=3', 'next'
+        )
+        assert [len(page) for page in forward] == [3, 3, 3, 2]
+        assert sum(forward, []) == expected, (
+            'Проверьте, что курсорная пагинация `/api/v1/titles/` отдаёт '
+            'произведения по ключу (категория, рейтинг по убыванию, id) '
+            'без пропусков и повторов.'
+        )
+
+        last_page_url = f'{self.TITLES_URL}?cursor=&limit=3'
+        for _ in forward[1:]:
+            last_page_url = client.get(last_page_url).json()['next']
+        backward = self.collect(client, last_page_url, 'previous')
+        assert sum(reversed(backward), []) == expected
+
+    def test_02_cursor_respects_filters_and_errors(self, client):
+        self.create_catalog()
+        pages = self.collect(
+            client, f'{self.TITLES_URL}?cursor=&limit=2&category=books',
+            'next'
+        )
+        assert sum(len(page) for page in pages) == 4
+
+        response = client.get(self.TITLES_URL, {'cursor': 'broken'})
+        assert response.status_code == HTTPStatus.NOT_FOUND
+
+    def test_03_cursor_pages_read_index(self, client):
+        self.create_catalog()
+        url = client.get(
+            self.TITLES_URL, {'cursor': '', 'limit': 3}
+        ).json()['next']
+        while url:
+            with CaptureQueriesContext(connection) as queries:
+                url = client.get(url).json()['next']
+            selects = [
+                query['sql'] for query in queries.captured_queries
+                if query['sql'].startswith('SELECT')
+                and 'FROM "reviews_title"' in query['sql']
+            ]
+            assert selects
+            with connection.cursor() as cursor:
+                for sql in selects:
+                    cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+                    plan = ' '.join(row[-1] for row in cursor.fetchall())
+                    assert 'title_category_rating_idx' in plan and (
+                        'TEMP B-TREE' not in plan
+                    ), (
+                        'Проверьте, что страницы курсорной пагинации '
+                        '`/api/v1/titles/` читаются по индексу '
+                        'title_category_rating_idx без сортировки: '
+                        f'{plan}'
+                    )
@@ -0,0 +1,136 @@
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+
+import pytest
+from django.db import connection, transaction
+from rest_framework.test import APIClient
+
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.fixture(params=('locmem', 'filebased'))
+def catalog_cache(request, settings, tmp_path):
+    backends = {
+        'locmem': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        },
+        'filebased': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': str(tmp_path / 'cache'),
+        },
+    }
+    settings.CACHES = {'default': backends[request.param]}
+    return request.param
+
+
+@pytest.mark.django_db(transaction=True)
+class Test10CatalogCache:
+
+    TITLES_URL = '/api/v1/titles/'
+    TITLE_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+
+    def test_01_repeated_reads_skip_orm(self, catalog_cache, client,
+                                        admin_client,
+                                        django_assert_num_queries):
+        titles, _, genres = create_titles(admin_client)
+        detail_url = self.TITLE_DETAIL_URL_TEMPLATE.format(
+            title_id=titles[0]['id']
+        )
+        for url, params in (
+            (self.TITLES_URL, {'genre': genres[0]['slug'], 'limit': 1}),
+            (detail_url, {}),
+        ):
+            expected = client.get(url, params).json()
+            with django_assert_num_queries(0):
+                response = client.get(url, {**params, 'ignored': 'x'})
+            assert response.status_code == HTTPStatus.OK
+            assert response.json() == expected, (
+                f'Проверьте, что повторный GET-запрос к `{url}` '
+                f'отдаётся из кэша ({catalog_cache}) без запросов к БД.'
+            )
+
+    def test_02_writes_invalidate_cache(self, catalog_cache, client,
+                                        admin_client, user_client):
+        titles, _, _ = create_titles(admin_client)
+        detail_url = self.TITLE_DETAIL_URL_TEMPLATE.format(
+            title_id=titles[0]['id']
+        )
+        assert client.get(detail_url).json()['rating'] is None
+        create_single_review(user_client, titles[0]['id'], 'text', 8)
+        assert client.get(detail_url).json()['rating'] == 8, (
+            'Проверьте, что создание отзыва сбрасывает кэш произведений.'
+        )
+
+        response = admin_client.patch(detail_url, data={'name': 'renamed'})
+        assert response.status_code == HTTPStatus.OK
+        assert client.get(detail_url).json()['name'] == 'renamed'
+
+        admin_client.delete(f'/api/v1/genres/{titles[0]["genre"][0]}/')
+        assert len(client.get(detail_url).json()['genre']) == 1, (
+            'Проверьте, что удаление жанра сбрасывает кэш произведений.'
+        )
+
+    def test_03_reader_during_write_transaction(self, catalog_cache, client,
+                                                admin_client, user):
+        from reviews.models import Review
+
+        titles, _, _ = create_titles(admin_client)
+        detail_url = self.TITLE_DETAIL_URL_TEMPLATE.format(
+            title_id=titles[0]['id']
+        )
+
+        def read():
+            try:
+                response = APIClient().get(detail_url)
+                return response.json()['rating'], response['ETag']
+            finally:
+                connection.close()
+
+        with transaction.atomic():
+            Review.objects.create(
+                title_id=titles[0]['id'], author=user, text='text', score=9
+            )
+            with ThreadPoolExecutor(1) as pool:
+                rating, etag = pool.submit(read).result()
+        assert rating is None
+
+        response = client.get(detail_url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()['rating'] == 9, (
+            'Проверьте, что версия каталога меняется после фиксации '
+            'транзакции: ответ, прочитанный параллельным запросом до '
+            'фиксации, не должен остаться в кэше под новой версией.'
+        )
+
+    def test_04_version_is_shared_between_processes(self, catalog_cache,
+                                                    client, admin_client):
+        from django.core.cache import cache
+        from django.db.models import F
+
+        from api.cache import CATALOG_VERSION_KEY
+        from core.models import CatalogVersion
+        from reviews.models import Title
+
+        titles, _, _ = create_titles(admin_client)
+        detail_url = self.TITLE_DETAIL_URL_TEMPLATE.format(
+            title_id=titles[0]['id']
+        )
+        etag = client.get(detail_url)['ETag']
+        cache.delete(CATALOG_VERSION_KEY)
+        response = client.get(detail_url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+            'Проверьте, что версия каталога читается из БД и не меняется, '
+            'когда истекает её копия в кэше.'
+        )
+        # Другой процесс меняет строки и версию в БД, не трогая кэш
+        # этого процесса; закэшированная версия истекает по таймауту.
+        Title.objects.filter(pk=titles[0]['id']).update(name='renamed')
+        CatalogVersion.objects.update(version=F('version') + 1)
+        cache.delete(CATALOG_VERSION_KEY)
+
+        response = client.get(detail_url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()['name'] == 'renamed', (
+            'Проверьте, что версия каталога хранится в БД и изменения '
+            'из других процессов видны после CATALOG_VERSION_TIMEOUT.'
+        )
@@ -0,0 +1,129 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_comments
+
+
+@pytest.mark.django_db(transaction=True)
+class Test11ConditionalGet:
+
+    TITLES_URL = '/api/v1/titles/'
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+    COMMENTS_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+    )
+
+    def check_not_modified(self, client, url, expected_queries,
+                           django_assert_num_queries):
+        response = client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        etag = response['ETag']
+        assert response['Last-Modified'], (
+            f'Проверьте, что ответ на GET-запрос к `{url}` содержит '
+            'заголовок Last-Modified.'
+        )
+        with django_assert_num_queries(expected_queries):
+            response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+            f'Проверьте, что GET-запрос к `{url}` с актуальным ETag '
+            'возвращает ответ со статусом 304.'
+        )
+        return etag
+
+    def test_01_not_modified_until_write(self, client, admin_client, admin,
+                                         user_client, user,
+                                         django_assert_num_queries):
+        author_map = {admin: admin_client, user: user_client}
+        comments, reviews, titles = create_comments(admin_client, author_map)
+        title_id = titles[0]['id']
+        reviews_url = self.REVIEWS_URL_TEMPLATE.format(title_id=title_id)
+        comments_url = self.COMMENTS_URL_TEMPLATE.format(
+            title_id=title_id, review_id=reviews[0]['id']
+        )
+
+        titles_etag = self.check_not_modified(
+            client, self.TITLES_URL, 0, django_assert_num_queries
+        )
+        reviews_etag = self.check_not_modified(
+            client, reviews_url, 1, django_assert_num_queries
+        )
+        comments_etag = self.check_not_modified(
+            client, comments_url, 1, django_assert_num_queries
+        )
+        response = client.get(f'{reviews_url}?limit=1')
+        assert response['ETag'] != reviews_etag
+
+        response = user_client.patch(
+            f'{reviews_url}{reviews[1]["id"]}/', data={'text': 'edited'}
+        )
+        assert response.status_code == HTTPStatus.OK
+        for url, etag in (
+            (reviews_url, reviews_etag), (self.TITLES_URL, titles_etag)
+        ):
+            response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+            assert response.status_code == HTTPStatus.OK, (
+                f'Проверьте, что после изменения отзыва GET-запрос к `{url}` '
+                'со старым ETag возвращает ответ со статусом 200.'
+            )
+        response = client.get(comments_url, HTTP_IF_NONE_MATCH=comments_etag)
+        assert response.status_code == HTTPStatus.NOT_MODIFIED
+
+        response = admin_client.delete(f'{comments_url}{comments[0]["id"]}/')
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        response = client.get(comments_url, HTTP_IF_NONE_MATCH=comments_etag)
+        assert response.status_code == HTTPStatus.OK
+        assert len(response.json()['results']) == len(comments) - 1
+
+        response = client.get(
+            self.REVIEWS_URL_TEMPLATE.format(title_id=999999)
+        )
+        assert response.status_code == HTTPStatus.NOT_FOUND
+
+    def test_02_comment_changes_review_etags(self, client, admin_client,
+                                             admin, user_client, user,
+                                             django_assert_num_queries):
+        author_map = {admin: admin_client, user: user_client}
+        _, reviews, titles = create_comments(admin_client, author_map)
+        reviews_url = self.REVIEWS_URL_TEMPLATE.format(
+            title_id=titles[0]['id']
+        )
+        review_url = f'{reviews_url}{reviews[0]["id"]}/'
+        etags = {
+            url: self.check_not_modified(
+                client, url, 1, django_assert_num_queries
+            )
+            for url in (reviews_url, review_url)
+        }
+
+        response = user_client.post(
+            f'{review_url}comments/', data={'text': 'Новый комментарий'}
+        )
+        assert response.status_code == HTTPStatus.CREATED
+        for url, etag in etags.items():
+            response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+            assert response.status_code == HTTPStatus.OK, (
+                'Проверьте, что после нового комментария GET-запрос к '
+                f'`{url}` со старым ETag возвращает ответ со статусом 200: '
+                'в нём изменился comments_count.'
+            )
+
+    def test_03_titles_etag_follows_db_version(self, settings, client,
+                                               admin_client,
+                                               django_assert_num_queries):
+        from django.db.models import F
+
+        from core.models import CatalogVersion
+
+        create_comments(admin_client, {})
+        settings.CATALOG_VERSION_TIMEOUT = 0
+        etag = self.check_not_modified(
+            client, self.TITLES_URL, 1, django_assert_num_queries
+        )
+        CatalogVersion.objects.update(version=F('version') + 1)
+        response = client.get(self.TITLES_URL, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что ETag `{self.TITLES_URL}` строится по версии '
+            'каталога из БД и устаревает после её изменения в другом '
+            'процессе, а не остаётся верным до записи в этом процессе.'
+        )
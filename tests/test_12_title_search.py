@@ -0,0 +1,54 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+
+
+@pytest.mark.django_db(transaction=True)
+class Test12TitleSearch:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    def search(self, client, text):
+        response = client.get(self.TITLES_URL, {'search': text})
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что GET-запрос к `/api/v1/titles/?search=` '
+            'возвращает ответ со статусом 200.'
+        )
+        return [title['name'] for title in response.json()['results']]
+
+    def test_01_search_ranks_and_follows_writes(self, client):
+        from reviews.models import Title
+
+        Title.objects.create(
+            name='Крепкий орешек', year=1988,
+            description='Полицейский против террористов'
+        )
+        Title.objects.create(
+            name='Терминатор', year=1984, description='I`ll be back'
+        )
+        Title.objects.create(
+            name='Чужой', year=1979, description='Не терминатор, а ксеноморф'
+        )
+
+        assert self.search(client, 'ТЕРМИН') == ['Терминатор', 'Чужой'], (
+            'Проверьте, что поиск по `/api/v1/titles/?search=` находит '
+            'произведения по префиксу слова без учёта регистра и ставит '
+            'совпадения в названии выше совпадений в описании.'
+        )
+        assert self.search(client, 'крепкий полицейский') == [
+            'Крепкий орешек'
+        ]
+        assert self.search(client, '"*(') == []
+
+        Title.objects.filter(name='Чужой').update(description='ксеноморф')
+        assert self.search(client, 'терминатор') == ['Терминатор']
+        Title.objects.filter(name='Терминатор').delete()
+        assert self.search(client, 'терминатор') == []
+
+    def test_02_rebuild_command(self, client):
+        from reviews.models import Title
+
+        Title.objects.create(name='Матрица', year=1999)
+        call_command('rebuild_title_search')
+        assert self.search(client, 'матр') == ['Матрица']
@@ -0,0 +1,72 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_reviews
+
+
+@pytest.mark.django_db(transaction=True)
+class Test13SparseFieldsets:
+
+    TITLES_URL = '/api/v1/titles/'
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+
+    def get(self, client, url, params):
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url, params)
+        assert response.status_code == HTTPStatus.OK
+        return response.json(), [query['sql'] for query in context]
+
+    def test_01_titles_fields_and_omit(self, client, admin_client):
+        from api.cache import get_catalog_version
+
+        create_reviews(admin_client, {})
+        get_catalog_version()
+        full, full_queries = self.get(client, self.TITLES_URL, {})
+
+        data, queries = self.get(
+            client, self.TITLES_URL, {'fields': 'id,name,rating,unknown'}
+        )
+        assert [set(title) for title in data['results']] == [
+            {'id', 'name', 'rating'}
+        ] * len(full['results']), (
+            'Проверьте, что `?fields=` оставляет в ответе `/api/v1/titles/` '
+            'только перечисленные поля.'
+        )
+        assert len(queries) == len(full_queries) - 1, (
+            'Проверьте, что без поля `genre` жанры не подгружаются.'
+        )
+        assert not any('"description"' in sql for sql in queries)
+
+        data, _ = self.get(
+            client, self.TITLES_URL, {'omit': 'description,genre'}
+        )
+        assert data['results'][0] == {
+            key: value for key, value in full['results'][0].items()
+            if key not in {'description', 'genre'}
+        }
+
+    def test_02_reviews_fields(self, client, admin_client, user_client, user):
+        reviews, titles = create_reviews(admin_client, {user: user_client})
+        data, queries = self.get(
+            client,
+            self.REVIEWS_URL_TEMPLATE.format(title_id=titles[0]['id']),
+            {'fields': 'id,score'}
+        )
+        assert data['results'] == [
+            {'id': reviews[0]['id'], 'score': reviews[0]['score']}
+        ]
+        assert not any('"users_user"' in sql for sql in queries)
+
+        response = user_client.patch(
+            '{}{}/?fields=id'.format(
+                self.REVIEWS_URL_TEMPLATE.format(title_id=titles[0]['id']),
+                reviews[0]['id']
+            ),
+            data={'text': 'new text'}
+        )
+        assert response.json()['text'] == 'new text', (
+            'Проверьте, что `?fields=` не влияет на запросы на запись.'
+        )
@@ -0,0 +1,43 @@
+import pytest
+from django.core.cache import cache
+
+from tests.utils import create_reviews
+
+
+@pytest.mark.django_db(transaction=True)
+class Test14TitleRowsSerializer:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    def fetch(self, client, settings, fast, url, params):
+        settings.TITLES_FAST_READ = fast
+        cache.clear()
+        response = client.get(url, params)
+        return response.status_code, response.content
+
+    def test_01_parity_with_read_serializer(self, client, admin_client,
+                                            user_client, user, settings):
+        from reviews.models import Category, Title
+
+        _, titles = create_reviews(admin_client, {user: user_client})
+        Title.objects.create(name='Без категории', year=2000)
+        Category.objects.filter(slug='books').delete()
+
+        for url, params in (
+            (self.TITLES_URL, {}),
+            (self.TITLES_URL, {'limit': 2, 'offset': 1}),
+            (self.TITLES_URL, {'cursor': '', 'limit': 2}),
+            (self.TITLES_URL, {'fields': 'id,genre,rating'}),
+            (self.TITLES_URL, {'omit': 'id,genre'}),
+            (self.TITLES_URL, {'genre': 'comedy'}),
+            (f'{self.TITLES_URL}{titles[0]["id"]}/', {}),
+            (f'{self.TITLES_URL}{titles[1]["id"]}/', {'fields': 'category'}),
+            (f'{self.TITLES_URL}999999/', {}),
+        ):
+            expected = self.fetch(client, settings, False, url, params)
+            assert self.fetch(client, settings, True, url, params) == (
+                expected
+            ), (
+                f'Проверьте, что быстрый путь чтения `{url}` с параметрами '
+                f'{params} отдаёт тот же JSON, что и TitleReadSerializer.'
+            )
@@ -0,0 +1,266 @@
+import csv
+import os
+import shutil
+
+import pytest
+from django.core.management import CommandError, call_command
+
+from tests.conftest import MANAGE_PATH
+
+
+@pytest.fixture
+def in_project_dir(monkeypatch):
+    monkeypatch.chdir(MANAGE_PATH)
+
+
+@pytest.fixture
+def data_copy(monkeypatch, tmp_path):
+    data_dir = tmp_path / 'static' / 'data'
+    shutil.copytree(os.path.join(MANAGE_PATH, 'static', 'data'), data_dir)
+    monkeypatch.chdir(tmp_path)
+    return data_dir
+
+
+@pytest.fixture
+def dump_dir(tmp_path):
+    dump_dir = tmp_path / 'dump'
+    shutil.copytree(os.path.join(MANAGE_PATH, 'static', 'data'), dump_dir)
+    return dump_dir
+
+
+def rewrite_csv(path, change):
+    with open(path, encoding='utf-8') as csv_file:
+        rows = list(csv.reader(csv_file))
+    change(rows)
+    with open(path, 'w', encoding='utf-8', newline='') as csv_file:
+        csv.writer(csv_file).writerows(rows)
+
+
+def snapshot():
+    from reviews.models import Comment, Review, Title
+    from users.models import User
+
+    return {
+        'users': User.objects.count(),
+        'reviews': Review.objects.count(),
+        'comments': Comment.objects.count(),
+        'comments_count': list(Review.objects.order_by('id').values_list(
+            'id', 'comments_count'
+        )),
+        'titles': list(Title.objects.order_by('id').values_list(
+            'id', 'score_sum', 'score_count', 'rating'
+        )),
+        'genres': list(Title.genre.through.objects.order_by('id').values_list(
+            'title_id', 'genre_id'
+        )),
+        'dates': [
+            list(model.objects.order_by('id').values_list('id', 'pub_date'))
+            for model in (Review, Comment)
+        ],
+    }
+
+
+@pytest.mark.django_db(transaction=True)
+class Test15CsvUpload:
+
+    def test_01_bulk_matches_row_by_row(self, in_project_dir):
+        call_command('csv_upload')
+        expected = snapshot()
+        assert expected['reviews'] and expected['titles'][0][2], (
+            'Проверьте, что csv_upload загружает отзывы и пересчитывает '
+            'рейтинг произведений.'
+        )
+        assert len(expected['genres']) == 42, (
+            'Проверьте, что csv_upload загружает связи из genre_title.csv.'
+        )
+        assert expected['dates'][1][0][1].isoformat() == (
+            '2020-01-13T23:20:02.422000+00:00'
+        ), (
+            'Проверьте, что csv_upload сохраняет pub_date из csv-файла, '
+            'а не время загрузки.'
+        )
+        call_command('flush', interactive=False, verbosity=0)
+
+        call_command('csv_upload', '--bulk', '--batch-size', '7')
+        assert snapshot() == expected, (
+            'Проверьте, что `csv_upload --bulk` загружает те же данные, что '
+            'и построчная загрузка, и пересчитывает рейтинг произведений.'
+        )
+
+    def test_02_bulk_error_names_row(self, in_project_dir):
+        call_command('csv_upload', '--bulk')
+        with pytest.raises(CommandError, match='bingobongo'):
+            call_command('csv_upload', '--bulk', '--batch-size', '2')
+
+    def test_03_unknown_link_names_row(self, in_project_dir):
+        from core.management.commands.csv_upload import Command
+        from reviews.models import Genre, Title
+
+        call_command('csv_upload')
+        Title.genre.through.objects.all().delete()
+        Genre.objects.filter(pk=15).delete()
+        with pytest.raises(CommandError, match='genre с id=15'):
+            Command().load_links(Title.genre.through, 'genre_title.csv', 100)
+
+    def test_04_upsert_loads_only_changes(self, data_copy):
+        from reviews.models import Review, Title
+        from reviews.signals import recalculate_title_scores
+
+        call_command('csv_upload', '--bulk')
+        call_command('csv_upload', '--upsert')
+        expected = snapshot()
+
+        def change_reviews(rows):
+            rows[1][4] = '1'
+            del rows[2]
+            rows.append(
+                ['1000', '2', 'Отзыв', '100', '5', '2020-01-01T00:00:00Z']
+            )
+
+        rewrite_csv(data_copy / 'review.csv', change_reviews)
+        call_command('csv_upload', '--upsert')
+        assert Review.objects.get(pk=1).score == 1, (
+            'Проверьте, что `csv_upload --upsert` обновляет изменённые строки.'
+        )
+        assert not Review.objects.filter(pk=2).exists(), (
+            'Проверьте, что `csv_upload --upsert` удаляет строки, '
+            'которых нет в файле.'
+        )
+        assert Review.objects.filter(pk=1000).exists(), (
+            'Проверьте, что `csv_upload --upsert` добавляет новые строки.'
+        )
+        assert snapshot()['reviews'] == expected['reviews'], (
+            'Проверьте, что `csv_upload --upsert` не трогает '
+            'неизменившиеся строки.'
+        )
+        titles = list(Title.objects.order_by('id').values_list(
+            'score_sum', 'score_count', 'rating'
+        ))
+        recalculate_title_scores()
+        assert titles == list(Title.objects.order_by('id').values_list(
+            'score_sum', 'score_count', 'rating'
+        )), (
+            'Проверьте, что `csv_upload --upsert` пересчитывает рейтинг '
+            'затронутых произведений.'
+        )
+
+    def test_05_upsert_skips_unchanged_files(self, data_copy):
+        from core.models import CsvFile
+        from reviews.models import Review
+
+        call_command('csv_upload', '--bulk')
+        Review.objects.filter(pk=1).update(score=1)
+        call_command('csv_upload', '--upsert')
+        assert Review.objects.get(pk=1).score == 1, (
+            'Проверьте, что `csv_upload --upsert` пропускает файлы, '
+            'не изменившиеся с прошлой загрузки.'
+        )
+        CsvFile.objects.all().delete()
+        call_command('csv_upload', '--upsert')
+        assert Review.objects.get(pk=1).score == 10, (
+            'Проверьте, что `csv_upload --upsert` сверяет с БД файлы '
+            'без сохранённого хеша.'
+        )
+
+    def test_06_workers_match_row_by_row(self, in_project_dir):
+        call_command('csv_upload')
+        expected = snapshot()
+        call_command('flush', interactive=False, verbosity=0)
+
+        call_command('csv_upload', '--workers', '2', '--batch-size', '7')
+        assert snapshot() == expected, (
+            'Проверьте, что `csv_upload --workers` загружает те же данные, '
+            'что и построчная загрузка, и пересчитывает рейтинг произведений.'
+        )
+
+    def test_07_workers_error_names_row(self, data_copy):
+        call_command('csv_upload', '--workers', '2')
+        with pytest.raises(CommandError, match='bingobongo'):
+            call_command('csv_upload', '--workers', '2', '--batch-size', '2')
+
+        def break_year(rows):
+            rows[3][2] = 'давно'
+
+        rewrite_csv(data_copy / 'titles.csv', break_year)
+        call_command('flush', interactive=False, verbosity=0)
+        with pytest.raises(CommandError, match='давно'):
+            call_command('csv_upload', '--workers', '2')
+
+    def test_08_stages_follow_dependencies(self):
+        from core.management.commands.csv_upload import Command
+        from reviews.models import Category, Comment, Genre, Review, Title
+        from users.models import User
+
+        assert Command().stages() == [
+            [User, Category, Genre],
+            [Title],
+            [Title.genre.through, Review],
+            [Comment],
+        ], (
+            'Проверьте, что `csv_upload --workers` загружает файлы по '
+            'этапам в порядке зависимостей.'
+        )
+
+    @pytest.mark.parametrize('mode, committed', [
+        ([], 39), (['--bulk'], 35), (['--workers', '2'], 35)
+    ])
+    def test_09_resume_after_failure(self, dump_dir, mode, committed):
+        from core.models import CsvFile
+
+        call_command('csv_upload', *mode, '--data-dir', str(dump_dir))
+        expected = snapshot()
+        call_command('flush', interactive=False, verbosity=0)
+
+        original = {}
+
+        def duplicate_id(rows):
+            original['id'], rows[40][0] = rows[40][0], rows[1][0]
+
+        def restore_id(rows):
+            rows[40][0] = original['id']
+
+        rewrite_csv(dump_dir / 'review.csv', duplicate_id)
+        with pytest.raises(CommandError):
+            call_command(
+                'csv_upload', *mode, '--batch-size', '7',
+                '--data-dir', str(dump_dir)
+            )
+        state = CsvFile.objects.get(name='review.csv')
+        assert not state.finished and state.rows == committed, (
+            'Проверьте, что csv_upload сохраняет контрольную точку '
+            'после каждой записанной пачки или строки.'
+        )
+
+        rewrite_csv(dump_dir / 'review.csv', restore_id)
+        call_command(
+            'csv_upload', *mode, '--resume', '--batch-size', '7',
+            '--data-dir', str(dump_dir)
+        )
+        assert snapshot() == expected, (
+            'Проверьте, что `csv_upload --resume` продолжает загрузку '
+            'с последней контрольной точки.'
+        )
+        assert CsvFile.objects.filter(finished=False).count() == 0, (
+            'Проверьте, что после загрузки все файлы отмечены '
+            'загруженными полностью.'
+        )
+
+    def test_10_resume_rejects_changed_prefix(self, dump_dir):
+        def duplicate_id(rows):
+            rows[40][0] = rows[1][0]
+
+        def change_text(rows):
+            rows[1][2] = 'Другой текст'
+
+        rewrite_csv(dump_dir / 'review.csv', duplicate_id)
+        with pytest.raises(CommandError):
+            call_command(
+                'csv_upload', '--bulk', '--batch-size', '7',
+                '--data-dir', str(dump_dir)
+            )
+        rewrite_csv(dump_dir / 'review.csv', change_text)
+        with pytest.raises(CommandError, match='review.csv изменился'):
+            call_command(
+                'csv_upload', '--resume', '--batch-size', '7',
+                '--data-dir', str(dump_dir)
+            )
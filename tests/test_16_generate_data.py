@@ -0,0 +1,68 @@
+import pytest
+from django.core.management import call_command
+
+
+def generate(seed=0):
+    call_command(
+        'generate_data', '--seed', str(seed), '--users', '20', '--titles',
+        '30', '--reviews', '400', '--comments', '50', '--batch-size', '7'
+    )
+
+
+def snapshot():
+    from reviews.models import Comment, Review, Title
+
+    return {
+        'titles': list(Title.objects.order_by('id').values_list(
+            'id', 'category_id', 'year', 'score_count', 'rating'
+        )),
+        'reviews': list(Review.objects.order_by('id').values_list(
+            'title_id', 'author_id', 'score', 'pub_date'
+        )),
+        'comments': list(Comment.objects.order_by('id').values_list(
+            'review_id', 'author_id', 'pub_date'
+        )),
+    }
+
+
+@pytest.mark.django_db(transaction=True)
+class Test16GenerateData:
+
+    def test_01_counts_and_unique_reviews(self):
+        from django.db.models import Count
+        from reviews.models import Comment, Review, Title
+
+        generate()
+        assert Review.objects.count() == 400, (
+            'Проверьте, что generate_data создаёт запрошенное число отзывов.'
+        )
+        assert Comment.objects.count() == 50, (
+            'Проверьте, что generate_data создаёт запрошенное число '
+            'комментариев.'
+        )
+        assert not Review.objects.values('title', 'author').annotate(
+            total=Count('id')
+        ).filter(total__gt=1).exists(), (
+            'Проверьте, что generate_data не создаёт двух отзывов одного '
+            'автора на одно произведение.'
+        )
+        assert not Title.objects.filter(
+            reviews__isnull=False, rating__isnull=True
+        ).exists(), (
+            'Проверьте, что generate_data пересчитывает рейтинг произведений.'
+        )
+
+    def test_02_same_seed_same_data(self):
+        generate()
+        expected = snapshot()
+        call_command('flush', interactive=False, verbosity=0)
+        generate(seed=1)
+        assert snapshot() != expected, (
+            'Проверьте, что generate_data с другим seed создаёт другие данные.'
+        )
+        call_command('flush', interactive=False, verbosity=0)
+        generate()
+        assert snapshot() == expected, (
+            'Проверьте, что generate_data с одним seed создаёт одинаковые '
+            'данные.'
+        )
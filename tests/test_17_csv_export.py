@@ -0,0 +1,86 @@
+import pytest
+from django.core.management import CommandError, call_command
+
+from tests.conftest import MANAGE_PATH
+
+
+@pytest.fixture
+def in_project_dir(monkeypatch):
+    monkeypatch.chdir(MANAGE_PATH)
+
+
+def snapshot():
+    from reviews.models import Comment, Review, Title
+    from users.models import User
+
+    return {
+        'users': list(User.objects.order_by('id').values_list(
+            'id', 'username', 'email', 'role', 'bio', 'first_name',
+            'last_name'
+        )),
+        'titles': list(Title.objects.order_by('id').values_list(
+            'id', 'name', 'year', 'category_id', 'description', 'rating'
+        )),
+        'genres': list(Title.genre.through.objects.order_by('id').values_list(
+            'id', 'title_id', 'genre_id'
+        )),
+        'reviews': list(Review.objects.order_by('id').values_list(
+            'id', 'title_id', 'author_id', 'text', 'score', 'pub_date'
+        )),
+        'comments': list(Comment.objects.order_by('id').values_list(
+            'id', 'review_id', 'author_id', 'text', 'pub_date'
+        )),
+    }
+
+
+@pytest.mark.django_db(transaction=True)
+class Test17CsvExport:
+
+    def test_01_export_round_trips(self, in_project_dir, tmp_path):
+        call_command('csv_upload', '--bulk')
+        expected = snapshot()
+        call_command(
+            'csv_export', '--data-dir', str(tmp_path), '--chunk-size', '7'
+        )
+        call_command('flush', interactive=False, verbosity=0)
+
+        call_command('csv_upload', '--bulk', '--data-dir', str(tmp_path))
+        assert snapshot() == expected, (
+            'Проверьте, что файлы csv_export загружаются обратно '
+            'командой csv_upload без потерь.'
+        )
+
+    def test_02_export_endpoint(
+        self, in_project_dir, tmp_path, admin_client, user_client, client
+    ):
+        call_command('csv_upload', '--bulk')
+        call_command('csv_export', 'review.csv', '--data-dir', str(tmp_path))
+        url = '/api/v1/export/review/'
+
+        for forbidden_client in (client, user_client):
+            response = forbidden_client.get(url)
+            assert response.status_code in (401, 403), (
+                f'Проверьте, что GET-запрос к `{url}` доступен только '
+                'администратору.'
+            )
+        response = admin_client.get(url)
+        assert response.status_code == 200 and response.streaming, (
+            f'Проверьте, что GET-запрос администратора к `{url}` '
+            'отдаёт файл потоком.'
+        )
+        assert response['Content-Type'].startswith('text/csv'), (
+            f'Проверьте, что `{url}` отдаёт данные в формате csv.'
+        )
+        content = b''.join(response.streaming_content).decode('utf-8')
+        with open(tmp_path / 'review.csv', encoding='utf-8') as csv_file:
+            assert content == csv_file.read(), (
+                f'Проверьте, что `{url}` отдаёт тот же csv, что и '
+                'команда csv_export.'
+            )
+        assert admin_client.get('/api/v1/export/unknown/').status_code == (
+            404
+        ), 'Проверьте, что выгрузка неизвестной таблицы возвращает 404.'
+
+    def test_03_data_dir_is_required(self, in_project_dir):
+        with pytest.raises(CommandError, match='--data-dir'):
+            call_command('csv_export')
@@ -0,0 +1,130 @@
+from http import HTTPStatus
+
+import pytest
+from rest_framework.test import APIClient
+
+from tests.utils import create_categories, create_genre
+
+
+def make_titles(count, genres, categories):
+    return [
+        {
+            'name': f'Произведение {number}',
+            'year': 1900 + number,
+            'description': f'Описание {number}',
+            'genre': [genre['slug'] for genre in genres[:number % 3 + 1]],
+            'category': categories[number % 2]['slug'],
+        }
+        for number in range(count)
+    ]
+
+
+@pytest.mark.django_db(transaction=True)
+class Test18TitleBulk:
+
+    URL = '/api/v1/titles/bulk/'
+
+    def test_01_bulk_create(self, admin_client):
+        from reviews.models import Title
+
+        genres = create_genre(admin_client)
+        categories = create_categories(admin_client)
+        data = make_titles(5, genres, categories)
+        response = admin_client.post(self.URL, data=data, format='json')
+        assert response.status_code == HTTPStatus.CREATED, (
+            f'Если POST-запрос администратора к `{self.URL}` содержит '
+            'корректный список произведений - должен вернуться ответ '
+            'со статусом 201.'
+        )
+        created = response.json()
+        assert [title['name'] for title in created] == [
+            title['name'] for title in data
+        ], (
+            f'Проверьте, что POST-запрос к `{self.URL}` возвращает '
+            'созданные произведения в порядке запроса.'
+        )
+        for title, expected in zip(created, data):
+            assert sorted(
+                genre['slug'] for genre in title['genre']
+            ) == sorted(expected['genre']), (
+                f'Проверьте, что POST-запрос к `{self.URL}` связывает '
+                'произведения с переданными жанрами.'
+            )
+            assert title['category']['slug'] == expected['category'], (
+                f'Проверьте, что POST-запрос к `{self.URL}` задаёт '
+                'произведениям переданную категорию.'
+            )
+            assert Title.objects.get(pk=title['id']).name == title['name']
+
+        response = admin_client.get('/api/v1/titles/', {'limit': 10})
+        assert response.json()['count'] == 5, (
+            f'Проверьте, что после POST-запроса к `{self.URL}` список '
+            'произведений не отдаётся из устаревшего кэша.'
+        )
+
+    def test_02_queries_do_not_grow(self, admin_client,
+                                    django_assert_max_num_queries):
+        genres = create_genre(admin_client)
+        categories = create_categories(admin_client)
+        admin_client.post(
+            self.URL, data=make_titles(3, genres, categories), format='json'
+        )
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        with CaptureQueriesContext(connection) as small:
+            admin_client.post(
+                self.URL, data=make_titles(3, genres, categories),
+                format='json'
+            )
+        with django_assert_max_num_queries(len(small)):
+            response = admin_client.post(
+                self.URL, data=make_titles(60, genres, categories),
+                format='json'
+            )
+        assert response.status_code == HTTPStatus.CREATED
+
+    def test_03_per_item_errors(self, admin_client):
+        from reviews.models import Title
+
+        genres = create_genre(admin_client)
+        categories = create_categories(admin_client)
+        data = make_titles(4, genres, categories)
+        data[1]['category'] = 'unknown'
+        data[2]['genre'] = [genres[0]['slug'], 'unknown']
+        data[3]['year'] = 3000
+        response = admin_client.post(self.URL, data=data, format='json')
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            f'Если список в POST-запросе к `{self.URL}` содержит '
+            'некорректные элементы - должен вернуться ответ со статусом 400.'
+        )
+        errors = response.json()
+        assert isinstance(errors, list) and len(errors) == 4, (
+            f'Проверьте, что POST-запрос к `{self.URL}` возвращает ошибки '
+            'списком, по элементу на каждое произведение.'
+        )
+        assert [set(item) for item in errors] == [
+            set(), {'category'}, {'genre'}, {'year'}
+        ], (
+            f'Проверьте, что POST-запрос к `{self.URL}` возвращает ошибки '
+            'только для некорректных полей некорректных элементов.'
+        )
+        assert not Title.objects.exists(), (
+            f'Проверьте, что POST-запрос к `{self.URL}` с ошибками '
+            'не создаёт ни одного произведения.'
+        )
+
+    def test_04_only_admin(self, admin_client, user_client):
+        genres = create_genre(admin_client)
+        categories = create_categories(admin_client)
+        data = make_titles(2, genres, categories)
+        for forbidden_client in (APIClient(), user_client):
+            response = forbidden_client.post(
+                self.URL, data=data, format='json'
+            )
+            assert response.status_code in (
+                HTTPStatus.UNAUTHORIZED, HTTPStatus.FORBIDDEN
+            ), (
+                f'Проверьте, что POST-запрос к `{self.URL}` доступен '
+                'только администратору.'
+            )
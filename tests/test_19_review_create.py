@@ -0,0 +1,109 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test19ReviewCreate:
+
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+    COMMENTS_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+    )
+    # Родительский объект, BEGIN, INSERT, обновление счётчиков
+    # родителя сигналом и отметка об изменении отзывов произведения;
+    # пользователь по токену берётся из кэша.
+    COMMENT_CREATE_QUERIES = 5
+    # Плюс счётчик распределения оценок произведения и новая
+    # версия каталога после фиксации.
+    REVIEW_CREATE_QUERIES = 6
+    # Произведение, BEGIN и отклонённый INSERT.
+    DUPLICATE_QUERIES = 3
+
+    def test_01_review_create_queries(self, admin_client, user_client,
+                                      django_assert_num_queries):
+        from reviews.models import Review
+
+        titles, _, _ = create_titles(admin_client)
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=titles[0]['id'])
+        data = {'text': 'Отзыв', 'score': 7}
+        user_client.get(url)
+        with django_assert_num_queries(self.REVIEW_CREATE_QUERIES):
+            response = user_client.post(url, data=data)
+        assert response.status_code == HTTPStatus.CREATED, (
+            f'Если POST-запрос пользователя к `{url}` содержит корректные '
+            'данные - должен вернуться ответ со статусом 201.'
+        )
+        review = Review.objects.get(pk=response.json()['id'])
+        assert review.title.score_count == 1, (
+            'Проверьте, что после создания отзыва пересчитывается '
+            'рейтинг произведения.'
+        )
+
+        with django_assert_num_queries(self.DUPLICATE_QUERIES):
+            response = user_client.post(url, data=data)
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            f'Если пользователь повторно отправляет POST-запрос к `{url}` - '
+            'должен вернуться ответ со статусом 400.'
+        )
+        assert response.json() == {
+            'non_field_errors': [
+                'Вы уже оставили отзыв на данное произведение.'
+            ]
+        }, (
+            'Проверьте, что повторный отзыв на произведение отклоняется '
+            'с прежним сообщением об ошибке.'
+        )
+        assert Review.objects.count() == 1
+
+    def test_02_comment_create_queries(self, admin_client, user_client,
+                                       django_assert_num_queries):
+        titles, _, _ = create_titles(admin_client)
+        review = user_client.post(
+            self.REVIEWS_URL_TEMPLATE.format(title_id=titles[0]['id']),
+            data={'text': 'Отзыв', 'score': 7}
+        ).json()
+        url = self.COMMENTS_URL_TEMPLATE.format(
+            title_id=titles[0]['id'], review_id=review['id']
+        )
+        with django_assert_num_queries(self.COMMENT_CREATE_QUERIES):
+            response = user_client.post(url, data={'text': 'Комментарий'})
+        assert response.status_code == HTTPStatus.CREATED, (
+            f'Если POST-запрос пользователя к `{url}` содержит корректные '
+            'данные - должен вернуться ответ со статусом 201.'
+        )
+
+    def test_03_missing_parent(self, admin_client, user_client):
+        titles, _, _ = create_titles(admin_client)
+        for url in (
+            self.REVIEWS_URL_TEMPLATE.format(title_id=0),
+            self.COMMENTS_URL_TEMPLATE.format(
+                title_id=titles[0]['id'], review_id=0
+            ),
+        ):
+            response = user_client.post(
+                url, data={'text': 'Текст', 'score': 7}
+            )
+            assert response.status_code == HTTPStatus.NOT_FOUND, (
+                f'Если родительский объект в `{url}` не существует - '
+                'POST-запрос должен вернуть ответ со статусом 404.'
+            )
+
+    def test_04_other_integrity_errors_propagate(
+        self, admin_client, user_client, monkeypatch
+    ):
+        from django.db import IntegrityError
+        from rest_framework.serializers import ModelSerializer
+
+        def fail(serializer, validated_data):
+            raise IntegrityError(
+                'NOT NULL constraint failed: reviews_review.text'
+            )
+
+        titles, _, _ = create_titles(admin_client)
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=titles[0]['id'])
+        monkeypatch.setattr(ModelSerializer, 'create', fail)
+        with pytest.raises(IntegrityError, match='NOT NULL'):
+            user_client.post(url, data={'text': 'Отзыв', 'score': 7})
@@ -0,0 +1,106 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+
+from tests.utils import create_reviews
+
+
+@pytest.mark.django_db(transaction=True)
+class Test20ScoreDistribution:
+
+    URL_TEMPLATE = '/api/v1/titles/{title_id}/score-distribution/'
+    REVIEW_DETAIL_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/'
+    )
+
+    def get_distribution(self, client, title_id):
+        response = client.get(self.URL_TEMPLATE.format(title_id=title_id))
+        assert response.status_code == HTTPStatus.OK, (
+            f'GET-запрос к `{self.URL_TEMPLATE}` должен возвращать ответ '
+            'со статусом 200.'
+        )
+        data = response.json()
+        assert [item['score'] for item in data] == list(range(1, 11)), (
+            f'Проверьте, что `{self.URL_TEMPLATE}` возвращает количество '
+            'отзывов для каждой оценки от 1 до 10.'
+        )
+        return {item['score']: item['count'] for item in data if item['count']}
+
+    def test_01_distribution_follows_review_writes(self, client, admin_client,
+                                                   admin, user_client, user,
+                                                   moderator_client,
+                                                   moderator):
+        author_map = {
+            admin: admin_client,
+            user: user_client,
+            moderator: moderator_client
+        }
+        reviews, titles = create_reviews(admin_client, author_map)
+        title_id = titles[0]['id']
+        assert self.get_distribution(client, title_id) == {5: 3}, (
+            'Проверьте, что распределение оценок учитывает новые отзывы.'
+        )
+        assert self.get_distribution(client, titles[1]['id']) == {}
+
+        user_client.patch(
+            self.REVIEW_DETAIL_URL_TEMPLATE.format(
+                title_id=title_id, review_id=reviews[1]['id']
+            ),
+            data={'score': 10}
+        )
+        assert self.get_distribution(client, title_id) == {5: 2, 10: 1}, (
+            'Проверьте, что распределение оценок учитывает изменение '
+            'оценки отзыва.'
+        )
+
+        moderator_client.delete(
+            self.REVIEW_DETAIL_URL_TEMPLATE.format(
+                title_id=title_id, review_id=reviews[0]['id']
+            )
+        )
+        assert self.get_distribution(client, title_id) == {5: 1, 10: 1}, (
+            'Проверьте, что распределение оценок учитывает удаление отзыва.'
+        )
+
+        response = client.get(self.URL_TEMPLATE.format(title_id=0))
+        assert response.status_code == HTTPStatus.NOT_FOUND
+
+    def test_02_constant_queries(self, client, admin_client, admin,
+                                 user_client, user,
+                                 django_assert_num_queries):
+        _, titles = create_reviews(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        url = self.URL_TEMPLATE.format(title_id=titles[0]['id'])
+        with django_assert_num_queries(2):
+            response = client.get(url)
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что `{url}` читает произведение и его счётчики '
+            'оценок двумя запросами.'
+        )
+
+    def test_03_rebuild_command(self, client, admin_client, admin, user_client,
+                                user):
+        from reviews.models import ScoreCount
+
+        reviews, titles = create_reviews(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        title_id = titles[0]['id']
+        expected = self.get_distribution(client, title_id)
+        ScoreCount.objects.all().delete()
+        ScoreCount.objects.create(title_id=titles[1]['id'], score=1, count=3)
+
+        call_command('rebuild_score_distribution', str(title_id))
+        assert self.get_distribution(client, title_id) == expected, (
+            'Проверьте, что rebuild_score_distribution восстанавливает '
+            'распределение оценок переданных произведений.'
+        )
+        assert self.get_distribution(client, titles[1]['id']) == {1: 3}
+
+        call_command('rebuild_score_distribution')
+        assert self.get_distribution(client, titles[1]['id']) == {}, (
+            'Проверьте, что rebuild_score_distribution без аргументов '
+            'перестраивает распределение всех произведений.'
+        )
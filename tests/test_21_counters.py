@@ -0,0 +1,122 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+
+from tests.utils import create_comments
+
+
+@pytest.mark.django_db(transaction=True)
+class Test21Counters:
+
+    TITLE_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+    REVIEW_DETAIL_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/'
+    )
+    COMMENT_DETAIL_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/'
+        'comments/{comment_id}/'
+    )
+
+    def get_review(self, client, title_id, review_id):
+        response = client.get(self.REVIEW_DETAIL_URL_TEMPLATE.format(
+            title_id=title_id, review_id=review_id
+        ))
+        assert response.status_code == HTTPStatus.OK
+        return response.json()
+
+    def test_01_counts_follow_writes(self, client, admin_client, admin,
+                                     user_client, user, moderator_client,
+                                     moderator):
+        author_map = {
+            admin: admin_client,
+            user: user_client,
+            moderator: moderator_client
+        }
+        comments, reviews, titles = create_comments(admin_client, author_map)
+        title_id = titles[0]['id']
+        review_id = reviews[0]['id']
+        response = client.get(
+            self.TITLE_DETAIL_URL_TEMPLATE.format(title_id=title_id)
+        )
+        assert response.json()['reviews_count'] == len(reviews), (
+            'Проверьте, что ответ на GET-запрос к произведению содержит '
+            'поле `reviews_count` с количеством отзывов.'
+        )
+        review = self.get_review(client, title_id, review_id)
+        assert review['comments_count'] == len(comments), (
+            'Проверьте, что ответ на GET-запрос к отзыву содержит '
+            'поле `comments_count` с количеством комментариев.'
+        )
+
+        response = admin_client.delete(
+            self.COMMENT_DETAIL_URL_TEMPLATE.format(
+                title_id=title_id,
+                review_id=review_id,
+                comment_id=comments[0]['id']
+            )
+        )
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        review = self.get_review(client, title_id, review_id)
+        assert review['comments_count'] == len(comments) - 1, (
+            'Проверьте, что удаление комментария уменьшает '
+            '`comments_count` отзыва.'
+        )
+
+        response = client.get(
+            self.REVIEWS_URL_TEMPLATE.format(title_id=title_id)
+        )
+        assert {
+            item['id']: item['comments_count']
+            for item in response.json()['results']
+        } == {
+            item['id']: len(comments) - 1 if item['id'] == review_id else 0
+            for item in reviews
+        }, (
+            'Проверьте, что список отзывов содержит `comments_count` '
+            'для каждого отзыва.'
+        )
+
+    @pytest.mark.parametrize('workers', [(), ('--workers', '2')])
+    def test_02_check_counters_repairs_drift(self, client, admin_client,
+                                             admin, user_client, user,
+                                             workers):
+        from reviews.models import Review, ScoreCount, Title
+
+        _, reviews, titles = create_comments(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+
+        def counters():
+            return (
+                list(Title.objects.order_by('id').values_list(
+                    'score_sum', 'score_count', 'rating'
+                )),
+                list(Review.objects.order_by('id').values_list(
+                    'comments_count', flat=True
+                )),
+                list(ScoreCount.objects.filter(count__gt=0).order_by(
+                    'title', 'score'
+                ).values_list('title', 'score', 'count')),
+            )
+
+        expected = counters()
+        Title.objects.filter(pk=titles[0]['id']).update(
+            score_count=7, rating=1
+        )
+        Review.objects.filter(pk=reviews[0]['id']).update(comments_count=0)
+        ScoreCount.objects.all().delete()
+
+        call_command(
+            'check_counters', '--check', '--chunk-size', '1', *workers
+        )
+        assert counters() != expected, (
+            'Проверьте, что `check_counters --check` не исправляет '
+            'расхождения.'
+        )
+        call_command('check_counters', '--chunk-size', '1', *workers)
+        assert counters() == expected, (
+            'Проверьте, что check_counters пересчитывает счётчики '
+            'с расхождениями.'
+        )
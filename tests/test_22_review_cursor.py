@@ -0,0 +1,131 @@
+from datetime import datetime, timedelta, timezone
+from http import HTTPStatus
+
+import pytest
+
+START = datetime(2020, 1, 1, tzinfo=timezone.utc)
+# Одинаковые даты и даты в пределах одной миллисекунды.
+OFFSETS = (0, 5, 5, 5, 1, 2, 3, 3, 0, 4, 6)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test22ReviewCursorPagination:
+
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+    COMMENTS_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+    )
+
+    def create_reviews(self, django_user_model):
+        from reviews.models import Comment, Review, Title
+
+        title = Title.objects.create(name='Произведение', year=2000)
+        users = [
+            django_user_model.objects.create(
+                username=f'user{idx}', email=f'user{idx}@yamdb.fake'
+            )
+            for idx in range(len(OFFSETS))
+        ]
+        for user, offset in zip(users, OFFSETS):
+            review = Review.objects.create(
+                title=title, author=user, text='Отзыв', score=5
+            )
+            Review.objects.filter(pk=review.pk).update(
+                pub_date=START + timedelta(microseconds=offset)
+            )
+        review = Review.objects.order_by('id').first()
+        for user, offset in zip(users, OFFSETS):
+            comment = Comment.objects.create(
+                review=review, author=user, text='Комментарий'
+            )
+            Comment.objects.filter(pk=comment.pk).update(
+                pub_date=START + timedelta(microseconds=offset)
+            )
+        return title, review
+
+    def collect(self, client, url, link):
+        ids = []
+        while url:
+            assert len(ids) <= len(OFFSETS), (
+                f'Проверьте, что курсор `{url}` продвигается по страницам.'
+            )
+            response = client.get(url)
+            assert response.status_code == HTTPStatus.OK, (
+                f'Проверьте, что GET-запрос к `{url}` возвращает ответ со '
+                'статусом 200.'
+            )
+            data = response.json()
+            assert 'count' not in data
+            ids.append([item['id'] for item in data['results']])
+            url = data[link]
+        return ids
+
+    def check_walk(self, client, url):
+        expected = [
+            item['id']
+            for item in client.get(url, {'limit': 100}).json()['results']
+        ]
+        forward = self.collect(client, f'{url}?cursor=&limit=3', 'next')
+        assert [len(page) for page in forward] == [3, 3, 3, 2]
+        assert sum(forward, []) == expected, (
+            f'Проверьте, что курсорная пагинация `{url}` отдаёт записи '
+            'в порядке (pub_date, id) без пропусков и повторов, '
+            'в том числе при совпадающих датах.'
+        )
+        last_page_url = f'{url}?cursor=&limit=3'
+        for _ in forward[1:]:
+            last_page_url = client.get(last_page_url).json()['next']
+        backward = self.collect(client, last_page_url, 'previous')
+        assert sum(reversed(backward), []) == expected
+
+    def test_01_cursor_walks_reviews_and_comments(self, client,
+                                                  django_user_model):
+        from reviews.models import Review
+
+        title, review = self.create_reviews(django_user_model)
+        expected = list(Review.objects.filter(title=title).order_by(
+            'pub_date', 'id'
+        ).values_list('id', flat=True))
+        response = client.get(
+            self.REVIEWS_URL_TEMPLATE.format(title_id=title.pk),
+            {'limit': 100}
+        )
+        assert [
+            item['id'] for item in response.json()['results']
+        ] == expected, (
+            'Проверьте, что отзывы упорядочены по дате публикации и id.'
+        )
+        self.check_walk(
+            client, self.REVIEWS_URL_TEMPLATE.format(title_id=title.pk)
+        )
+        self.check_walk(client, self.COMMENTS_URL_TEMPLATE.format(
+            title_id=title.pk, review_id=review.pk
+        ))
+
+    def test_02_new_reviews_do_not_shift_pages(self, client,
+                                               django_user_model):
+        from reviews.models import Review
+
+        title, _ = self.create_reviews(django_user_model)
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=title.pk)
+        first = client.get(url, {'cursor': '', 'limit': 3}).json()
+        author = django_user_model.objects.create(
+            username='late', email='late@yamdb.fake'
+        )
+        Review.objects.create(
+            title=title, author=author, text='Новый отзыв', score=5
+        )
+        seen = [item['id'] for item in first['results']]
+        seen += sum(self.collect(client, first['next'], 'next'), [])
+        assert len(seen) == len(set(seen)) == len(OFFSETS) + 1, (
+            'Проверьте, что новые отзывы не сдвигают страницы '
+            'курсорной пагинации.'
+        )
+
+    def test_03_broken_cursor(self, client, django_user_model):
+        title, _ = self.create_reviews(django_user_model)
+        response = client.get(
+            self.REVIEWS_URL_TEMPLATE.format(title_id=title.pk),
+            {'cursor': 'broken'}
+        )
+        assert response.status_code == HTTPStatus.NOT_FOUND
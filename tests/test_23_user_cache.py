@@ -0,0 +1,87 @@
+from http import HTTPStatus
+
+import pytest
+
+
+@pytest.mark.django_db(transaction=True)
+class Test23UserCache:
+
+    CATEGORIES_URL = '/api/v1/categories/'
+    USERS_URL = '/api/v1/users/'
+    USER_DETAIL_URL_TEMPLATE = '/api/v1/users/{username}/'
+    ME_URL = '/api/v1/users/me/'
+
+    def post_category(self, client):
+        return client.post(
+            self.CATEGORIES_URL, data={'name': 'Фильмы', 'slug': 'films'}
+        )
+
+    def test_01_user_is_read_once(self, user_client,
+                                  django_assert_num_queries):
+        with django_assert_num_queries(1):
+            response = self.post_category(user_client)
+        assert response.status_code == HTTPStatus.FORBIDDEN
+        with django_assert_num_queries(0):
+            response = self.post_category(user_client)
+        assert response.status_code == HTTPStatus.FORBIDDEN, (
+            'Проверьте, что пользователь по JWT-токену берётся из кэша '
+            'и повторный запрос не читает таблицу пользователей.'
+        )
+
+    def test_02_role_change_applies_at_once(self, admin_client, user,
+                                            user_client):
+        response = self.post_category(user_client)
+        assert response.status_code == HTTPStatus.FORBIDDEN
+        response = admin_client.patch(
+            self.USER_DETAIL_URL_TEMPLATE.format(username=user.username),
+            data={'role': 'admin'}
+        )
+        assert response.status_code == HTTPStatus.OK
+        response = self.post_category(user_client)
+        assert response.status_code == HTTPStatus.CREATED, (
+            'Проверьте, что смена роли через `/api/v1/users/{username}/` '
+            'сбрасывает закэшированного пользователя.'
+        )
+
+    def test_03_deleted_user_is_rejected(self, admin_client, user,
+                                         user_client):
+        response = user_client.get(self.ME_URL)
+        assert response.status_code == HTTPStatus.OK
+        response = admin_client.delete(
+            self.USER_DETAIL_URL_TEMPLATE.format(username=user.username)
+        )
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        response = user_client.get(self.ME_URL)
+        assert response.status_code == HTTPStatus.UNAUTHORIZED, (
+            'Проверьте, что токен удалённого пользователя перестаёт '
+            'действовать сразу после удаления.'
+        )
+
+    def test_04_deleted_in_transaction_is_rejected(self, user,
+                                                   user_client):
+        from django.db import transaction
+
+        response = user_client.get(self.ME_URL)
+        assert response.status_code == HTTPStatus.OK
+        with transaction.atomic():
+            user.delete()
+        response = user_client.get(self.ME_URL)
+        assert response.status_code == HTTPStatus.UNAUTHORIZED, (
+            'Проверьте, что удаление пользователя внутри транзакции '
+            'сбрасывает его закэшированный снимок.'
+        )
+
+    def test_05_me_keeps_profile(self, user, user_client):
+        user_client.get(self.ME_URL)
+        response = user_client.patch(
+            self.ME_URL, data={'first_name': 'Имя', 'role': 'admin'}
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()['bio'] == user.bio
+        user.refresh_from_db()
+        assert (user.first_name, user.role, user.bio) == (
+            'Имя', 'user', 'user bio'
+        ), (
+            'Проверьте, что PATCH-запрос к `/api/v1/users/me/` меняет '
+            'только переданные поля и не меняет роль.'
+        )
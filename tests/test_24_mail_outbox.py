@@ -0,0 +1,179 @@
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.core import mail
+from django.core.mail.backends.locmem import EmailBackend
+from django.core.management import call_command
+from django.utils import timezone
+
+
+class FlakyEmailBackend(EmailBackend):
+    """Считает соединения и не отправляет письма на FAILING адреса."""
+
+    opened = 0
+    refuse = False
+    failing = set()
+
+    def open(self):
+        if FlakyEmailBackend.refuse:
+            raise ConnectionRefusedError('SMTP недоступен')
+        FlakyEmailBackend.opened += 1
+        return True
+
+    def send_messages(self, messages):
+        for message in messages:
+            if self.failing.intersection(message.to):
+                raise ConnectionResetError(f'Отказ для {message.to}')
+        return super().send_messages(messages)
+
+
+@pytest.fixture
+def flaky_backend(settings):
+    settings.EMAIL_OUTBOX_DELIVERY = 'command'
+    settings.EMAIL_BACKEND = 'tests.test_24_mail_outbox.FlakyEmailBackend'
+    FlakyEmailBackend.opened = 0
+    FlakyEmailBackend.refuse = False
+    FlakyEmailBackend.failing = set()
+    return FlakyEmailBackend
+
+
+@pytest.mark.django_db(transaction=True)
+class Test24MailOutbox:
+
+    URL_SIGNUP = '/api/v1/auth/signup/'
+
+    def queue(self, count):
+        from core.outbox import queue_mail
+
+        recipients = [f'user{idx}@yamdb.fake' for idx in range(count)]
+        queue_mail('Тема', 'Текст', 'admin@yamdb.ru', recipients)
+        return recipients
+
+    def test_01_signup_only_queues_mail(self, client, flaky_backend):
+        from core.models import OutboxEmail
+
+        outbox_before_count = len(mail.outbox)
+        data = {'email': 'valid@yamdb.fake', 'username': 'valid_username'}
+        response = client.post(self.URL_SIGNUP, data=data)
+        assert response.status_code == HTTPStatus.OK
+        assert len(mail.outbox) == outbox_before_count, (
+            'Проверьте, что signup не отправляет письмо в запросе, '
+            'а ставит его в очередь.'
+        )
+        assert list(OutboxEmail.objects.filter(
+            sent_at__isnull=True
+        ).values_list('to', flat=True)) == [data['email']]
+
+        call_command('send_outbox')
+        assert len(mail.outbox) == outbox_before_count + 1, (
+            'Проверьте, что команда send_outbox отправляет письма '
+            'из очереди.'
+        )
+        assert mail.outbox[-1].to == [data['email']]
+        assert 'Code: ' in mail.outbox[-1].body
+        assert not OutboxEmail.objects.filter(sent_at__isnull=True).exists()
+        call_command('send_outbox')
+        assert len(mail.outbox) == outbox_before_count + 1, (
+            'Проверьте, что отправленные письма не отправляются повторно.'
+        )
+
+    def test_02_batches_share_connection(self, flaky_backend):
+        from core.outbox import send_outbox
+
+        outbox_before_count = len(mail.outbox)
+        recipients = self.queue(5)
+        assert send_outbox(batch_size=2) == (5, 0)
+        assert flaky_backend.opened == 3, (
+            'Проверьте, что пачка писем отправляется через одно '
+            'соединение с почтовым бэкендом.'
+        )
+        assert sorted(
+            message.to[0] for message in mail.outbox[outbox_before_count:]
+        ) == recipients
+
+    def test_03_failed_mail_is_retried(self, settings, flaky_backend):
+        from core.models import OutboxEmail
+        from core.outbox import send_outbox
+
+        outbox_before_count = len(mail.outbox)
+        recipients = self.queue(3)
+        flaky_backend.failing = {recipients[1]}
+        assert send_outbox() == (2, 1)
+        failed = OutboxEmail.objects.get(to=recipients[1])
+        assert failed.sent_at is None
+        assert failed.attempts == 1
+        assert failed.next_attempt_at > timezone.now(), (
+            'Проверьте, что неотправленное письмо откладывается '
+            'до следующей попытки.'
+        )
+        assert 'Отказ' in failed.last_error
+        assert send_outbox() == (0, 0)
+
+        flaky_backend.failing = set()
+        flaky_backend.refuse = True
+        OutboxEmail.objects.update(next_attempt_at=timezone.now())
+        assert send_outbox() == (0, 1)
+        failed.refresh_from_db()
+        assert failed.attempts == 2
+
+        flaky_backend.refuse = False
+        OutboxEmail.objects.update(next_attempt_at=timezone.now())
+        assert send_outbox() == (1, 0)
+        assert len(mail.outbox) == outbox_before_count + 3
+
+    def test_04_attempts_are_limited(self, settings, flaky_backend):
+        from core.models import OutboxEmail
+        from core.outbox import send_outbox
+
+        settings.EMAIL_OUTBOX_MAX_ATTEMPTS = 2
+        flaky_backend.failing = set(self.queue(1))
+        for _ in range(settings.EMAIL_OUTBOX_MAX_ATTEMPTS):
+            OutboxEmail.objects.update(
+                next_attempt_at=timezone.now() - timedelta(seconds=1)
+            )
+            assert send_outbox() == (0, 1)
+        OutboxEmail.objects.update(next_attempt_at=timezone.now())
+        assert send_outbox() == (0, 0), (
+            'Проверьте, что после EMAIL_OUTBOX_MAX_ATTEMPTS неудачных '
+            'попыток письмо больше не отправляется.'
+        )
+        assert OutboxEmail.objects.get().body == '', (
+            'Проверьте, что у письма, исчерпавшего попытки, стирается '
+            'текст с кодом подтверждения.'
+        )
+        OutboxEmail.objects.update(next_attempt_at=timezone.now() - timedelta(
+            seconds=settings.EMAIL_OUTBOX_KEEP_DONE + 1
+        ))
+        send_outbox()
+        assert not OutboxEmail.objects.exists(), (
+            'Проверьте, что send_outbox удаляет письма, исчерпавшие '
+            'попытки больше EMAIL_OUTBOX_KEEP_DONE секунд назад.'
+        )
+
+    def test_05_sent_mail_is_scrubbed_and_pruned(self, settings,
+                                                 flaky_backend):
+        from core.models import OutboxEmail
+        from core.outbox import send_outbox
+
+        recipients = self.queue(2)
+        assert send_outbox() == (2, 0)
+        assert list(OutboxEmail.objects.values_list('body', flat=True)) == [
+            '', ''
+        ], (
+            'Проверьте, что у отправленных писем стирается текст '
+            'с кодом подтверждения.'
+        )
+
+        OutboxEmail.objects.filter(to=recipients[0]).update(
+            sent_at=timezone.now() - timedelta(
+                seconds=settings.EMAIL_OUTBOX_KEEP_DONE + 1
+            )
+        )
+        send_outbox()
+        assert list(OutboxEmail.objects.values_list('to', flat=True)) == [
+            recipients[1]
+        ], (
+            'Проверьте, что send_outbox удаляет письма, отправленные '
+            'больше EMAIL_OUTBOX_KEEP_DONE секунд назад.'
+        )
@@ -0,0 +1,167 @@
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from http import HTTPStatus
+
+import pytest
+
+PARALLEL_REQUESTS = 16
+
+
+class Clock:
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    from api.throttling import TokenBucketThrottle
+
+    clock = Clock()
+    monkeypatch.setattr(TokenBucketThrottle, 'timer', clock)
+    return clock
+
+
+@pytest.fixture
+def rates(monkeypatch):
+    from rest_framework.throttling import SimpleRateThrottle
+
+    rates = {
+        'signup_ip': '3/min',
+        'signup_identity': '100/min',
+        'token_ip': '100/min',
+        'token_identity': '2/min',
+    }
+    monkeypatch.setattr(SimpleRateThrottle, 'THROTTLE_RATES', rates)
+    return rates
+
+
+@pytest.mark.django_db(transaction=True)
+class Test25AuthThrottling:
+
+    URL_SIGNUP = '/api/v1/auth/signup/'
+    URL_TOKEN = '/api/v1/auth/token/'
+
+    def signup(self, client, idx, ip='10.0.0.1', **data):
+        return client.post(
+            self.URL_SIGNUP,
+            data={
+                'username': f'user{idx}',
+                'email': f'user{idx}@yamdb.fake',
+                **data
+            },
+            REMOTE_ADDR=ip
+        )
+
+    def test_01_ip_bucket_refills(self, client, clock, rates):
+        for idx in range(3):
+            assert self.signup(client, idx).status_code == HTTPStatus.OK
+        response = self.signup(client, 3)
+        assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS, (
+            f'Проверьте, что POST-запросы к `{self.URL_SIGNUP}` с одного '
+            'IP сверх ёмкости корзины отклоняются со статусом 429.'
+        )
+        assert response['Retry-After'] == '20'
+        assert self.signup(
+            client, 3, ip='10.0.0.2'
+        ).status_code == HTTPStatus.OK
+
+        clock.now += 19
+        assert self.signup(client, 3).status_code == (
+            HTTPStatus.TOO_MANY_REQUESTS
+        )
+        clock.now += 1
+        assert self.signup(client, 3).status_code == HTTPStatus.OK, (
+            'Проверьте, что корзина пополняется на один запрос '
+            'за период, делённый на ёмкость.'
+        )
+        assert self.signup(client, 4).status_code == (
+            HTTPStatus.TOO_MANY_REQUESTS
+        )
+
+    def test_02_identity_bucket(self, client, clock, rates):
+        rates.update(signup_ip='100/min', signup_identity='2/min')
+        assert self.signup(client, 0, ip='10.0.0.1').status_code == (
+            HTTPStatus.OK
+        )
+        assert self.signup(client, 0, ip='10.0.0.2').status_code == (
+            HTTPStatus.OK
+        )
+        response = self.signup(
+            client, 1, ip='10.0.0.3', email='USER0@yamdb.fake'
+        )
+        assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS, (
+            'Проверьте, что запросы с одним email с разных IP '
+            'упираются в общий лимит.'
+        )
+        assert self.signup(client, 1, ip='10.0.0.3').status_code == (
+            HTTPStatus.OK
+        )
+
+    def test_03_token_throttled_before_db(self, client, clock, rates,
+                                          django_assert_num_queries):
+        data = {'username': 'ghost', 'confirmation_code': 'wrong'}
+        for _ in range(2):
+            response = client.post(self.URL_TOKEN, data=data)
+            assert response.status_code == HTTPStatus.NOT_FOUND
+        with django_assert_num_queries(0):
+            response = client.post(self.URL_TOKEN, data=data)
+        assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS, (
+            f'Проверьте, что перебор кодов через `{self.URL_TOKEN}` '
+            'отклоняется до обращения к БД.'
+        )
+
+    def test_04_file_cache_buckets_are_shared(self, settings, tmp_path,
+                                              monkeypatch, clock, rates):
+        from rest_framework.test import APIRequestFactory
+
+        from api.throttling import SignUpIPThrottle, TokenBucketThrottle
+
+        settings.CACHES = {'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': str(tmp_path / 'cache'),
+        }}
+        # Потоки изображают процессы: у каждого процесса своя
+        # блокировка, общая у них только блокировка файлового кэша.
+        monkeypatch.setattr(TokenBucketThrottle, 'lock', nullcontext())
+        request = APIRequestFactory().post(
+            self.URL_SIGNUP, REMOTE_ADDR='10.0.0.1'
+        )
+        barrier = threading.Barrier(PARALLEL_REQUESTS)
+
+        def attempt(_):
+            throttle = SignUpIPThrottle()
+            barrier.wait()
+            return throttle.allow_request(request, None)
+
+        with ThreadPoolExecutor(PARALLEL_REQUESTS) as pool:
+            allowed = sum(pool.map(attempt, range(PARALLEL_REQUESTS)))
+        assert allowed == 3, (
+            'Проверьте, что с файловым кэшем корзина меняется атомарно '
+            'и для всех процессов: одновременные запросы не должны '
+            'тратить один и тот же жетон.'
+        )
+
+    def test_05_file_cache_without_fcntl(self, client, settings, tmp_path,
+                                         monkeypatch, clock, rates):
+        settings.CACHES = {'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': str(tmp_path / 'cache'),
+        }}
+        # Так import fcntl ведёт себя на Windows.
+        monkeypatch.setitem(sys.modules, 'fcntl', None)
+        for number in range(3):
+            response = self.signup(client, number)
+            assert response.status_code == HTTPStatus.OK, (
+                'Проверьте, что без модуля `fcntl` ограничение частоты '
+                'с файловым кэшем работает под блокировкой процесса.'
+            )
+        assert self.signup(client, 3).status_code == (
+            HTTPStatus.TOO_MANY_REQUESTS
+        )
+        assert not (tmp_path / 'cache' / 'throttle.lock').exists()
@@ -0,0 +1,112 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+PARALLEL_SIGNUPS = 8
+
+
+@pytest.fixture
+def no_throttling(monkeypatch):
+    from rest_framework.throttling import SimpleRateThrottle
+
+    monkeypatch.setattr(SimpleRateThrottle, 'THROTTLE_RATES', {
+        scope: None for scope in (
+            'signup_ip', 'signup_identity', 'token_ip', 'token_identity'
+        )
+    })
+
+
+def user_reads(queries):
+    return [
+        query['sql'] for query in queries.captured_queries
+        if query['sql'].startswith('SELECT')
+        and 'FROM "users_user"' in query['sql']
+    ]
+
+
+@pytest.mark.django_db(transaction=True)
+class Test26AuthQueries:
+
+    URL_SIGNUP = '/api/v1/auth/signup/'
+    URL_TOKEN = '/api/v1/auth/token/'
+
+    def parallel_signups(self, payloads):
+        barrier = threading.Barrier(len(payloads))
+
+        def post(data):
+            client = APIClient()
+            try:
+                barrier.wait()
+                response = client.post(self.URL_SIGNUP, data=data)
+                return response.status_code, response.json()
+            finally:
+                connection.close()
+
+        with ThreadPoolExecutor(len(payloads)) as pool:
+            return list(pool.map(post, payloads))
+
+    def test_01_one_user_read_per_request(self, client):
+        from django.contrib.auth.tokens import default_token_generator
+
+        from users.models import User
+
+        data = {'email': 'valid@yamdb.fake', 'username': 'valid_username'}
+        for _ in range(2):
+            with CaptureQueriesContext(connection) as queries:
+                response = client.post(self.URL_SIGNUP, data=data)
+            assert response.status_code == HTTPStatus.OK
+            assert len(user_reads(queries)) == 1, (
+                f'Проверьте, что POST-запрос к `{self.URL_SIGNUP}` '
+                'читает пользователя из БД не больше одного раза.'
+            )
+
+        user = User.objects.get(username=data['username'])
+        with CaptureQueriesContext(connection) as queries:
+            response = client.post(self.URL_TOKEN, data={
+                'username': user.username,
+                'confirmation_code': default_token_generator.make_token(user)
+            })
+        assert response.status_code == HTTPStatus.OK
+        assert 'token' in response.json()
+        assert len(user_reads(queries)) == 1, (
+            f'Проверьте, что POST-запрос к `{self.URL_TOKEN}` '
+            'читает пользователя из БД не больше одного раза.'
+        )
+
+    def test_02_parallel_identical_signups(self, no_throttling):
+        from core.models import OutboxEmail
+        from users.models import User
+
+        data = {'email': 'valid@yamdb.fake', 'username': 'valid_username'}
+        results = self.parallel_signups([data] * PARALLEL_SIGNUPS)
+        assert results == [(HTTPStatus.OK, data)] * PARALLEL_SIGNUPS, (
+            'Проверьте, что одинаковые параллельные POST-запросы к '
+            f'`{self.URL_SIGNUP}` завершаются со статусом 200.'
+        )
+        assert User.objects.filter(username=data['username']).count() == 1
+        assert OutboxEmail.objects.filter(
+            to=data['email']
+        ).count() == PARALLEL_SIGNUPS
+
+    def test_03_parallel_conflicting_signups(self, no_throttling):
+        from users.models import User
+
+        payloads = [
+            {'email': 'valid@yamdb.fake', 'username': f'user{idx}'}
+            for idx in range(PARALLEL_SIGNUPS)
+        ]
+        statuses = sorted(
+            status for status, _ in self.parallel_signups(payloads)
+        )
+        assert statuses == (
+            [HTTPStatus.OK] + [HTTPStatus.BAD_REQUEST] * (PARALLEL_SIGNUPS - 1)
+        ), (
+            'Проверьте, что из параллельных регистраций с одним email '
+            'успешна ровно одна, а остальные получают ответ 400.'
+        )
+        assert User.objects.filter(email='valid@yamdb.fake').count() == 1
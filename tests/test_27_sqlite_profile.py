@@ -0,0 +1,60 @@
+import pytest
+from django.db.utils import ConnectionHandler
+
+PRAGMAS = {
+    'journal_mode': 'wal',
+    'synchronous': 1,
+    'mmap_size': 256 * 1024 * 1024,
+    'cache_size': -64 * 1024,
+    'busy_timeout': 20 * 1000,
+}
+
+
+@pytest.fixture
+def production_db(settings, tmp_path, django_db_blocker):
+    handler = ConnectionHandler({
+        'default': {
+            **settings.SQLITE_PRODUCTION_PROFILE,
+            'NAME': str(tmp_path / 'production.sqlite3')
+        }
+    })
+    db = handler['default']
+    with django_db_blocker.unblock():
+        yield db
+        db.close()
+
+
+class Test27SqliteProfile:
+
+    def test_01_pragmas_on_connect(self, production_db):
+        with production_db.cursor() as cursor:
+            for name, expected in PRAGMAS.items():
+                cursor.execute(f'PRAGMA {name}')
+                assert cursor.fetchone()[0] == expected, (
+                    f'Проверьте, что продакшен-профиль SQLite выполняет '
+                    f'PRAGMA {name} при подключении.'
+                )
+
+    def test_02_connection_is_reused(self, production_db):
+        production_db.ensure_connection()
+        connection = production_db.connection
+        production_db.close_if_unusable_or_obsolete()
+        with production_db.cursor() as cursor:
+            cursor.execute('SELECT 1')
+        assert production_db.connection is connection, (
+            'Проверьте, что с CONN_MAX_AGE соединение переживает '
+            'конец запроса и используется повторно.'
+        )
+
+    def test_03_health_check_reconnects(self, production_db):
+        production_db.ensure_connection()
+        broken = production_db.connection
+        broken.close()
+        production_db.close_if_unusable_or_obsolete()
+        with production_db.cursor() as cursor:
+            cursor.execute('SELECT 1')
+            assert cursor.fetchone() == (1,)
+        assert production_db.connection is not broken, (
+            'Проверьте, что неработающее постоянное соединение '
+            'заменяется новым перед первым запросом к БД.'
+        )